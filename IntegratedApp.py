@@ -1,20 +1,49 @@
 import dash
-from dash import dcc, html, Input, Output, State, ctx
+from dash import dcc, html, Input, Output, State, ctx, Patch
 import pandas as pd
 import numpy as np
 import plotly.graph_objs as go
-import yfinance as yf
+from flask import jsonify
 from flask_caching import Cache
 import datetime
+import os
+import threading
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from app_cache import cache_stats, HistoryRangeCache
+from app_prefetch import load_watchlist, PrefetchScheduler
+from data_providers import get_provider, InvalidTickerError
+from single_flight import SingleFlight
+from stock_downloader import NoDataError
+from ticker_metadata import TickerMetadataStore
+from figure_helpers import highlight_colors, top_n, up_down_colors
+from chart_downsample import bucket_starts, detail_span, downsample_line, downsample_ohlc, needs_rebucket, MAX_POINTS
+from volume_profile import bin_labels, mid_points, price_edges, profile_series, volume_profile
 
 # --- Dash Setup ---
 app = dash.Dash(__name__, suppress_callback_exceptions=True) # suppress_callback_exceptions is crucial for multi-page apps
 server = app.server
 
 # --- Cache Configuration ---
-CACHE_CONFIG = {'CACHE_TYPE': 'simple', 'CACHE_DEFAULT_TIMEOUT': 300}
+# Shared on-disk LRU cache by default, so all gunicorn workers reuse each
+# other's results (see app_cache.py for the backends). Override with
+# APP_CACHE_TYPE, e.g. 'app_cache.SimpleLRUCache' or 'RedisCache'.
+CACHE_CONFIG = {
+    'CACHE_TYPE': os.environ.get('APP_CACHE_TYPE', 'app_cache.SQLiteLRUCache'),
+    'CACHE_DEFAULT_TIMEOUT': 300,
+    'CACHE_DIR': os.environ.get('APP_CACHE_DIR', '.app_cache'),
+    'CACHE_MAX_BYTES': int(os.environ.get('APP_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+    'CACHE_REDIS_URL': os.environ.get('APP_CACHE_REDIS_URL', 'redis://localhost:6379/0'),
+}
 cache = Cache(app.server, config=CACHE_CONFIG)
 
+# Frames handed out by the cache are shared, see ProcessedData. pandas 3
+# always copies on write; older versions need the option.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+
 # --- Constants ---
 periods = [28, 55, 84]
 DATA_POINTS_ZOOM = 50
@@ -23,53 +52,121 @@ DEFAULT_TICKER = 'AAPL'
 # --- Data Fetching and Processing Functions ---
 # (Keeping these outside callbacks for memoization)
 
+# Long names come from the metadata store, so a chart costs one price
+# request instead of an extra Ticker.info round trip.
+metadata_store = TickerMetadataStore(os.environ.get('APP_METADATA_PATH', 'ticker_metadata.json'))
+
+# Prices come through the provider interface (data_providers.py), which
+# imports yfinance only on the first cache miss. APP_DATA_PROVIDER=replay
+# serves recorded fixtures instead, e.g. for load tests without network.
+price_provider = get_provider(os.environ.get('APP_DATA_PROVIDER', 'yfinance'))
+
 def fetch_yahoo_finance_data(ticker, start_date, end_date):
+    # The display name is looked up when a chart is drawn (metadata_store)
     try:
-        ticker_obj = yf.Ticker(ticker)
-        info = ticker_obj.info
-        long_name = info.get("longName", ticker)
-
-        df = ticker_obj.history(start=start_date, end=end_date)
+        df = price_provider.get_history(ticker, start_date, end_date, extra=False)
 
         if df.empty:
-            return pd.DataFrame(), long_name, "no_data"
+            return pd.DataFrame(), ticker, "no_data"
 
         df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
         df.columns = [col.lower() for col in df.columns]
-        df.index.name = 'Date'
-        return df, long_name, None
-    except yf.TickerError:
+        return df, ticker, None
+    except InvalidTickerError:
         return pd.DataFrame(), ticker, "invalid_ticker"
     except Exception as e:
         return pd.DataFrame(), ticker, f"error: {str(e)}"
 
+# One full history per ticker; date-range requests are slices of it and
+# only the missing edges are fetched.
+# Watchlist tickers are kept warm by the prefetch scheduler (see the bottom
+# of this file), so their requests are served from the cache as they are.
+watchlist = load_watchlist(os.environ.get('APP_WATCHLIST', ''))
+watched = {ticker.upper() for ticker in watchlist}
+# Callbacks of one click asking for the same data concurrently share one
+# download and one processing run (counted at /cache-stats).
+fetch_flight = SingleFlight('fetch')
+processing_flight = SingleFlight('processing')
+
+history_cache = HistoryRangeCache(cache.cache, fetch_flight.wrap(fetch_yahoo_finance_data),
+                                  serve_stale=lambda ticker: ticker.upper() in watched)
+
+# Everything the charts need, computed once per (ticker, start, end). The
+# bundle is shared by all callbacks (and by callers coalesced in
+# processing_flight), so nothing reading it may modify it: with copy on
+# write, a callback that assigns to df only changes its own copy.
+# The long name is not part of it: until the metadata store has the real
+# name it falls back to the ticker, which must not be memoized with the
+# prices, so charts read it from metadata_store when they are drawn.
+class ProcessedData(NamedTuple):
+    df: pd.DataFrame                  # OHLCV, pivot_point, sma_pp_*, daily_return
+    bin_mid_points: tuple
+    bin_ranges: tuple
+    normalized_volume: np.ndarray     # read-only
+    volume_profile_data: pd.Series
+    status: Optional[str]
+
+def read_only(values):
+    values.flags.writeable = False
+    return values
+
 @cache.memoize(timeout=CACHE_CONFIG['CACHE_DEFAULT_TIMEOUT'])
+@processing_flight.wrap
 def get_processed_data(ticker, start_date, end_date):
-    df, long_name, status = fetch_yahoo_finance_data(ticker, start_date, end_date)
+    df, _, status = history_cache.get(ticker, start_date, end_date)
     if status is not None:
-        return pd.DataFrame(), [], [], [], pd.Series(), long_name, status
+        return ProcessedData(pd.DataFrame(), (), (), read_only(np.empty(0)), pd.Series(dtype=float), status)
 
-    df['pivot_point'] = (df['high'] + df['low'] + df['close']) / 3
-    for period in periods:
-        df[f'sma_pp_{period}'] = df['pivot_point'].rolling(window=period).mean()
+    pivot_point = (df['high'] + df['low'] + df['close']) / 3
+    df = df.assign(pivot_point=pivot_point,
+                   **{f'sma_pp_{period}': pivot_point.rolling(window=period).mean() for period in periods})
 
     df = df.dropna(subset=['close', 'high', 'low', 'open', 'volume'] + [f'sma_pp_{p}' for p in periods])
+    df = df.assign(daily_return=df['close'].pct_change() * 100) # Percentage change
 
-    volume_profile_data = pd.Series()
-    bin_mid_points, bin_ranges, normalized_volume = [], [], []
+    volume_profile_data = pd.Series(dtype=float)
+    bin_mid_points, bin_ranges, normalized_volume = (), (), np.empty(0)
 
     if not df.empty and df['volume'].sum() > 0:
-        price_bins = np.linspace(df['low'].min() * 0.98, df['high'].max() * 1.02, 50)
-        df['price_bin'] = pd.cut(df['close'], bins=price_bins, include_lowest=True)
-        volume_profile_data = df.groupby('price_bin', observed=False)['volume'].sum()
+        edges = price_edges(df['low'], df['high'], bins=50)
+        totals = volume_profile(df['close'], df['volume'], edges)
+        volume_profile_data = profile_series(totals, edges)
+
+        bin_mid_points = tuple(mid_points(edges).tolist())
+        max_volume = totals.max()
+        normalized_volume = totals / max_volume if max_volume > 0 else np.zeros_like(totals)
+        bin_ranges = tuple(bin_labels(edges))
+
+    return ProcessedData(df, bin_mid_points, bin_ranges, read_only(normalized_volume),
+                         volume_profile_data, None)
+
+@server.route('/cache-stats')
+def cache_stats_route():
+    return jsonify(dict(cache_stats(cache), history_ranges=history_cache.metrics.snapshot(),
+                        single_flight={flight.name: flight.stats() for flight in (fetch_flight, processing_flight)}))
+
+def default_view():
+    # The date range of a fresh page load, as the callbacks receive it
+    today = datetime.datetime.today().date()
+    return pd.to_datetime((today - datetime.timedelta(days=730)).isoformat()), pd.to_datetime(today.isoformat())
+
+def warm_ticker(ticker):
+    # Refresh the newest bars, then recompute the default view on top of them
+    start_date, end_date = default_view()
+    _, _, status = history_cache.get(ticker, start_date, end_date, refresh=True)
+    if status == 'no_data':
+        raise NoDataError(ticker)
+    if status is not None:
+        raise RuntimeError(status)
+    cache.delete_memoized(get_processed_data, ticker, start_date, end_date)
+    get_processed_data(ticker, start_date, end_date)
 
-        if not volume_profile_data.empty:
-            bin_mid_points = [interval.mid for interval in volume_profile_data.index]
-            max_volume = volume_profile_data.values.max()
-            normalized_volume = volume_profile_data.values / max_volume if max_volume > 0 else np.zeros_like(volume_profile_data.values)
-            bin_ranges = [f"{interval.left:.2f} - {interval.right:.2f}" for interval in volume_profile_data.index]
+prefetcher = PrefetchScheduler(warm_ticker, watchlist,
+                               interval=int(os.environ.get('APP_PREFETCH_INTERVAL', 300)))
 
-    return df, bin_mid_points, bin_ranges, normalized_volume, volume_profile_data, long_name, None
+@server.route('/prefetch-status')
+def prefetch_status_route():
+    return jsonify(prefetcher.status())
 
 # --- Shared Header and Controls Layout ---
 header_and_controls = html.Div([
@@ -142,6 +239,114 @@ def update_global_params(n_clicks, ticker, start_date_str, end_date_str):
         'end_date': end_date_str
     }
 
+# --- Zoom Index ---
+# The bars and SMA series of recently drawn charts, kept in the process so
+# a zoom step only slices arrays: no cache round trip and no figure
+# rebuild. A worker that has not drawn the chart rebuilds the entry from
+# get_processed_data.
+ZOOM_INDEX_SIZE = 32
+zoom_index = OrderedDict()
+zoom_index_lock = threading.Lock()
+
+def initial_zoom(total):
+    start, end = max(0, total - 252), total # Default to last year
+    # 'detail' are the rows the chart draws bar for bar (see price_traces)
+    return {"start": start, "end": end, "detail": list(detail_span(total, start, end))}
+
+def get_zoom_index(global_params, processed=None):
+    key = (global_params.get('ticker'), global_params.get('start_date'), global_params.get('end_date'))
+    with zoom_index_lock:
+        if processed is None and key in zoom_index:
+            zoom_index.move_to_end(key)
+            return zoom_index[key]
+
+    if processed is None:
+        processed = get_processed_data(key[0], pd.to_datetime(key[1]), pd.to_datetime(key[2]))
+
+    df = processed.df
+    entry = {'frame': df[['open', 'high', 'low', 'close', 'volume'] + [f'sma_pp_{p}' for p in periods]],
+             'dates': df.index.to_numpy(), 'low': df['low'].to_numpy(),
+             'high': df['high'].to_numpy(), 'volume': df['volume'].to_numpy(),
+             'profile': has_profile(processed.bin_mid_points, processed.normalized_volume)}
+    with zoom_index_lock:
+        zoom_index[key] = entry
+        while len(zoom_index) > ZOOM_INDEX_SIZE:
+            zoom_index.popitem(last=False)
+    return entry
+
+def zoom_axis_ranges(entry, start, end):
+    # x, price and volume axis ranges for the bars [start, end)
+    end = min(end, len(entry['dates']))
+    if end <= start:
+        return None
+    low, high = entry['low'][start:end].min(), entry['high'][start:end].max()
+    pad = (high - low) * 0.05
+    xaxis_range = [pd.Timestamp(entry['dates'][start]), pd.Timestamp(entry['dates'][end - 1]) + pd.Timedelta(days=20)]
+    return xaxis_range, [low - pad, high + pad], [0, entry['volume'][start:end].max() * 1.05]
+
+def has_profile(bin_mid_points, normalized_volume):
+    return bool(bin_mid_points) and normalized_volume.size > 0
+
+def price_traces(df, detail):
+    # Candles, SMA lines and volume bars. Rows detail = (first, last) are
+    # drawn bar for bar and the rest of the history is merged into coarser
+    # bars, so no trace gets more than MAX_POINTS points.
+    starts = bucket_starts(len(df), MAX_POINTS, *detail)
+    bars = downsample_ohlc(df, starts)
+
+    # Candlestick chart (main plot)
+    candles = go.Candlestick(
+        x=bars.index,
+        open=bars['open'], high=bars['high'],
+        low=bars['low'], close=bars['close'],
+        increasing_line_color='green', decreasing_line_color='red',
+        showlegend=False,
+        name='Candlestick'
+    )
+
+    # SMA overlays
+    smas = []
+    for period in periods:
+        sma_x, sma_y = downsample_line(df.index, df[f'sma_pp_{period}'], starts)
+        smas.append(go.Scatter(
+            x=sma_x,
+            y=sma_y,
+            mode='lines',
+            name=f'SMA PP {period}',
+            line=dict(width=1.5)
+        ))
+
+    # Volume Indicator at the bottom
+    colors_volume = up_down_colors(bars['open'], bars['close'])
+    volume = go.Bar(
+        x=bars.index,
+        y=bars['volume'],
+        marker_color=colors_volume,
+        name='Volume',
+        yaxis='y3', # Corrected: 'y3'
+        showlegend=False
+    )
+    return candles, smas, volume
+
+def candlestick_traces(df, bin_mid_points, normalized_volume, volume_profile_data, detail):
+    candles, smas, volume = price_traces(df, detail)
+    traces = [candles]
+
+    # Volume Bars Left Overlay (Volume Profile)
+    if has_profile(bin_mid_points, normalized_volume):
+        colors = highlight_colors(len(volume_profile_data), top_n(volume_profile_data.values, 2),
+                                  'rgba(150,150,150,0.2)', 'orange')
+
+        traces.append(go.Bar(
+            y=bin_mid_points,
+            x=normalized_volume,
+            orientation='h',
+            marker=dict(color=colors, opacity=0.33),
+            showlegend=False,
+            xaxis='x2', yaxis='y'
+        ))
+    return traces + smas + [volume]
+
 # --- Page 1: Candlestick Chart (Reusing your logic) ---
 def create_candlestick_layout():
     return html.Div([
@@ -180,18 +385,16 @@ def initialize_candlestick_zoom(global_params):
     if df.empty:
         return {'start': 0, 'end': 0}, 0
     total = len(df)
-    initial_start = max(0, total - 252) # Default to last year
-    return {"start": initial_start, "end": total}, total
+    return initial_zoom(total), total
 
 
 @app.callback(
     Output('candlestick-graph-container', 'children'),
     # Output('status-message', 'children', allow_duplicate=True), # Status message will be updated by the main router
     Input('global-params', 'data'), # Trigger update on global param changes
-    Input('zoom-range', 'data'),    # Trigger update on zoom changes
     prevent_initial_call=False
 )
-def update_candlestick_chart(global_params, zoom_range):
+def update_candlestick_chart(global_params):
     if not global_params:
         return dcc.Graph(figure=go.Figure())
 
@@ -202,9 +405,8 @@ def update_candlestick_chart(global_params, zoom_range):
     if not ticker:
         return dcc.Graph(figure=go.Figure())
 
-    df, bin_mid_points, bin_ranges, normalized_volume, volume_profile_data, long_name, status = get_processed_data(
-        ticker, pd.to_datetime(start_date_str), pd.to_datetime(end_date_str)
-    )
+    processed = get_processed_data(ticker, pd.to_datetime(start_date_str), pd.to_datetime(end_date_str))
+    df, bin_mid_points, bin_ranges, normalized_volume, volume_profile_data, status = processed
 
     if status == "invalid_ticker":
         return dcc.Graph(figure=go.Figure()) # Let the main status message handle this
@@ -215,44 +417,19 @@ def update_candlestick_chart(global_params, zoom_range):
     elif df.empty:
         return dcc.Graph(figure=go.Figure())
 
-    display_df = df.copy()
-    if zoom_range and zoom_range['end'] > zoom_range['start']:
-        display_df = df.iloc[zoom_range["start"]:zoom_range["end"]]
-
-    if display_df.empty:
-        return dcc.Graph(figure=go.Figure())
-
-    last_date = display_df.index.max()
-    xaxis_range = [display_df.index.min(), last_date + pd.Timedelta(days=20)]
-
-    fig = go.Figure()
+    # The whole history is drawn once and the visible window is just the
+    # axis ranges, so zooming only patches the ranges (update_candlestick_zoom).
+    # Long histories are downsampled outside the window, see price_traces.
+    zoom = initial_zoom(len(df))
+    xaxis_range, yaxis_range, volume_range = zoom_axis_ranges(
+        get_zoom_index(global_params, processed), zoom['start'], zoom['end'])
 
-    # Candlestick chart (main plot)
-    fig.add_trace(go.Candlestick(
-        x=display_df.index,
-        open=display_df['open'], high=display_df['high'],
-        low=display_df['low'], close=display_df['close'],
-        increasing_line_color='green', decreasing_line_color='red',
-        showlegend=False,
-        name='Candlestick'
-    ))
-
-    # Volume Bars Left Overlay (Volume Profile)
-    if bin_mid_points and normalized_volume.size > 0:
-        top_indices = np.argsort(volume_profile_data.values)[-2:]
-        colors = ['rgba(150,150,150,0.2)'] * len(volume_profile_data)
-        for i in top_indices:
-            colors[i] = 'orange'
-
-        fig.add_trace(go.Bar(
-            y=bin_mid_points,
-            x=normalized_volume,
-            orientation='h',
-            marker=dict(color=colors, opacity=0.33),
-            showlegend=False,
-            xaxis='x2', yaxis='y'
-        ))
+    fig = go.Figure(data=candlestick_traces(df, bin_mid_points, normalized_volume, volume_profile_data,
+                                            zoom['detail']))
 
+    # Volume Profile annotations at the two busiest price levels
+    if has_profile(bin_mid_points, normalized_volume):
+        top_indices = top_n(volume_profile_data.values, 2)
         annotations = []
         for idx in top_indices:
             annotations.append(dict(
@@ -266,28 +443,9 @@ def update_candlestick_chart(global_params, zoom_range):
             ))
         fig.update_layout(annotations=annotations)
 
-    # SMA overlays
-    for period in periods:
-        fig.add_trace(go.Scatter(
-            x=display_df.index,
-            y=display_df[f'sma_pp_{period}'],
-            mode='lines',
-            name=f'SMA PP {period}',
-            line=dict(width=1.5)
-        ))
-
-    # Volume Indicator at the bottom
-    colors_volume = ['green' if display_df['close'].iloc[i] > display_df['open'].iloc[i] else 'red' for i in range(len(display_df))]
-    fig.add_trace(go.Bar(
-        x=display_df.index,
-        y=display_df['volume'],
-        marker_color=colors_volume,
-        name='Volume',
-        yaxis='y3', # Corrected: 'y3'
-        showlegend=False
-    ))
-
-    # Layout & Styling
+    # Layout & Styling. The name is read now, not memoized, so it shows
+    # up as soon as the metadata store has it
+    long_name = metadata_store.long_name(ticker)
     fig.update_layout(
         height=700,
         autosize=True,
@@ -300,6 +458,7 @@ def update_candlestick_chart(global_params, zoom_range):
         yaxis=dict(
             title=dict(text=f"{long_name} Price", font=dict(size=16)),
             domain=[0.3, 1],
+            range=yaxis_range,
             showgrid=True,
             gridcolor='lightgray',
             tickfont=dict(size=14)
@@ -307,6 +466,7 @@ def update_candlestick_chart(global_params, zoom_range):
         yaxis3=dict( # Corrected: yaxis3 for the third y-axis definition
             title=dict(text='Volume', font=dict(size=12)),
             domain=[0, 0.25],
+            range=volume_range,
             showgrid=True,
             gridcolor='lightgray',
             tickfont=dict(size=10)
@@ -326,21 +486,23 @@ def update_candlestick_chart(global_params, zoom_range):
         )
     )
 
-    return dcc.Graph(figure=fig, style={'width': '100%', 'height': '700px'})
+    return dcc.Graph(id='candlestick-graph', figure=fig, style={'width': '100%', 'height': '700px'})
 
 
 @app.callback(
     Output("zoom-range", "data", allow_duplicate=True),
+    Output("candlestick-graph", "figure", allow_duplicate=True),
     Input("zoom-in", "n_clicks"),
     Input("zoom-out", "n_clicks"),
     Input("zoom-reset", "n_clicks"),
     State("zoom-range", "data"),
     State("full-data-length", "data"),
+    State("global-params", "data"),
     prevent_initial_call=True
 )
-def update_candlestick_zoom(zin, zout, reset, current_zoom, full_data_length):
+def update_candlestick_zoom(zin, zout, reset, current_zoom, full_data_length, global_params):
     if not current_zoom:
-        return {'start': 0, 'end': 0}
+        return {'start': 0, 'end': 0}, dash.no_update
 
     triggered = ctx.triggered_id
     start, end = current_zoom['start'], current_zoom['end']
@@ -351,14 +513,41 @@ def update_candlestick_zoom(zin, zout, reset, current_zoom, full_data_length):
     if triggered == "zoom-in" and span > DATA_POINTS_ZOOM * 2:
         new_start = min(end - DATA_POINTS_ZOOM * 2, start + DATA_POINTS_ZOOM)
         new_end = max(start + DATA_POINTS_ZOOM * 2, end - DATA_POINTS_ZOOM)
-        return {"start": new_start, "end": new_end}
+        new_zoom = {"start": new_start, "end": new_end}
     elif triggered == "zoom-out":
         new_start = max(0, start - DATA_POINTS_ZOOM)
         new_end = min(total_data_points, end + DATA_POINTS_ZOOM)
-        return {"start": new_start, "end": new_end}
+        new_zoom = {"start": new_start, "end": new_end}
     elif triggered == "zoom-reset":
-        return {"start": 0, "end": total_data_points}
-    return current_zoom
+        new_zoom = {"start": 0, "end": total_data_points}
+    else:
+        return current_zoom, dash.no_update
+
+    # Usually only the axis ranges travel to the browser; the traces stay as they are.
+    entry = get_zoom_index(global_params or {})
+    ranges = zoom_axis_ranges(entry, new_zoom['start'], new_zoom['end'])
+    if ranges is None:
+        return new_zoom, dash.no_update
+
+    xaxis_range, yaxis_range, volume_range = ranges
+    patch = Patch()
+    detail = current_zoom.get('detail')
+    if needs_rebucket(len(entry['dates']), detail, new_zoom['start'], new_zoom['end']):
+        # Downsampled chart and the window left the bar for bar rows:
+        # re-bucket around it and patch the price traces only (the volume
+        # profile does not depend on the window)
+        detail = detail_span(len(entry['dates']), new_zoom['start'], new_zoom['end'])
+        candles, smas, volume = price_traces(entry['frame'], detail)
+        patch['data'][0] = candles
+        first = 2 if entry['profile'] else 1
+        for i, trace in enumerate(smas):
+            patch['data'][first + i] = trace
+        patch['data'][first + len(smas)] = volume
+    new_zoom['detail'] = list(detail) if detail else None
+    patch['layout']['xaxis']['range'] = xaxis_range
+    patch['layout']['yaxis']['range'] = yaxis_range
+    patch['layout']['yaxis3']['range'] = volume_range
+    return new_zoom, patch
 
 
 # --- Page 2: Simple Daily Returns Chart ---
@@ -387,7 +576,7 @@ def update_daily_returns_chart(global_params):
     if not ticker:
         return dcc.Graph(figure=go.Figure())
 
-    df, _, _, _, _, long_name, status = get_processed_data(
+    df, _, _, _, _, status = get_processed_data(
         ticker, pd.to_datetime(start_date_str), pd.to_datetime(end_date_str)
     )
 
@@ -400,18 +589,19 @@ def update_daily_returns_chart(global_params):
     elif df.empty:
         return dcc.Graph(figure=go.Figure())
 
-    df['daily_return'] = df['close'].pct_change() * 100 # Percentage change
+    # At most MAX_POINTS points, picked with LTTB to keep the spikes
+    return_x, return_y = downsample_line(df.index, df['daily_return'], bucket_starts(len(df), MAX_POINTS))
 
     fig = go.Figure(data=[go.Scatter(
-        x=df.index,
-        y=df['daily_return'],
+        x=return_x,
+        y=return_y,
         mode='lines',
         name='Daily Return',
         line=dict(color='blue')
     )])
 
     fig.update_layout(
-        title=f'{long_name} Daily Percentage Returns',
+        title=f'{metadata_store.long_name(ticker)} Daily Percentage Returns',
         xaxis_title='Date',
         yaxis_title='Daily Return (%)',
         height=600,
@@ -436,7 +626,7 @@ def display_page(pathname, global_params):
         ticker = global_params.get('ticker')
         start_date = pd.to_datetime(global_params.get('start_date'))
         end_date = pd.to_datetime(global_params.get('end_date'))
-        _, _, _, _, _, _, status = get_processed_data(ticker, start_date, end_date)
+        _, _, _, _, _, status = get_processed_data(ticker, start_date, end_date)
         if status == "invalid_ticker":
             status_msg = f"Invalid ticker symbol: {ticker}. Please check and try again."
         elif status == "no_data":
@@ -453,5 +643,15 @@ def display_page(pathname, global_params):
         # Default to candlestick chart if no path is specified
         return create_candlestick_layout(), status_msg
 
+if os.environ.get('APP_PRELOAD_NSE_METADATA'):
+    threading.Thread(target=metadata_store.preload_nse_constituents, daemon=True).start()
+
+# Keep the APP_WATCHLIST tickers warm, e.g. APP_WATCHLIST=nifty50. Started
+# by the first request a process serves, not at import: importers (tests,
+# the debug reloader's watcher, gunicorn before the fork) never start it.
+@server.before_request
+def start_prefetcher():
+    prefetcher.start()
+
 if __name__ == '__main__':
     app.run(debug=True)
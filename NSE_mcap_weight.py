@@ -5,16 +5,10 @@ Plots: Weightages, Returns (1yr, 6m, 3m, 1m) and Free Float Market Capitalizatio
 """
 
 import datetime
-from datetime import date, timedelta
 import matplotlib.pyplot as plt
-import mplfinance as mpf
-from mplfinance.original_flavor import candlestick_ohlc
-import matplotlib.dates as mdates
-import nsepy
-from nsepy import get_history
-import numpy as np
 import pandas as pd
-from sklearn import preprocessing
+
+from figure_helpers import sign_colors
 
 
 #Top Level Settings:
@@ -132,7 +126,7 @@ ax10 = plt.subplot2grid((5, 4), (4, 2), rowspan = 1, colspan = 2)
 #================================================================================
 
 #Plotting Monthly Index Returns 
-colored = ['tab:green' if x else 'tab:red' for x in (df_monthly_index_returns['1 year'] >= 0)]
+colored = sign_colors(df_monthly_index_returns['1 year'])
 ax1.barh(df_monthly_index_returns['indices'], df_monthly_index_returns['1 year'], color = colored)
 plt.xticks(rotation=90)
 
@@ -148,27 +142,27 @@ ax2.annotate('TotalWeight={}'.format(k_temp), (5, 9))
 
 #Plotting Monthly Index Returns - 1 year, 6 months, 3 months, 1 month
 #
-colored_ax3 = ['tab:green' if x else 'tab:red' for x in (df_monthly_index_returns['1 year'] >= 0)]
+colored_ax3 = sign_colors(df_monthly_index_returns['1 year'])
 ax3.barh(df_monthly_index_returns['indices'], df_monthly_index_returns['1 year'], color = colored_ax3)
 ax3.axes.get_yaxis().set_visible(True)
 ax3.set_title('1-year', loc='center', color = 'tab:gray')
 ax3.grid(which='minor', axis='both', color = 'tab:gray', linestyle='--', linewidth=1 )
 
 
-colored_ax4 = ['tab:green' if x else 'tab:red' for x in (df_monthly_index_returns['6 month'] >= 0)]
+colored_ax4 = sign_colors(df_monthly_index_returns['6 month'])
 ax4.barh(df_monthly_index_returns['indices'], df_monthly_index_returns['6 month'], color = colored_ax4)
 ax4.axes.get_yaxis().set_visible(False)
 ax4.set_title('6-month', loc='center', color = 'tab:gray')
 ax4.grid(which='minor', axis='both', color = 'tab:gray', linestyle='--', linewidth=1 )
 
 
-colored_ax5 = ['tab:green' if x else 'tab:red' for x in (df_monthly_index_returns['3 month'] >= 0)]
+colored_ax5 = sign_colors(df_monthly_index_returns['3 month'])
 ax5.barh(df_monthly_index_returns['indices'], df_monthly_index_returns['3 month'], color = colored_ax5)
 ax5.axes.get_yaxis().set_visible(False)
 ax5.set_title('3-month', loc='center', color = 'tab:gray')
 ax5.grid(which='minor', axis='both', color = 'tab:gray', linestyle='--', linewidth=1 )
 
-colored_ax6 = ['tab:green' if x else 'tab:red' for x in (df_monthly_index_returns['1 month'] >= 0)]
+colored_ax6 = sign_colors(df_monthly_index_returns['1 month'])
 ax6.barh(df_monthly_index_returns['indices'], df_monthly_index_returns['1 month'], color = colored_ax6)
 ax6.axes.get_yaxis().set_visible(False)
 ax6.set_title('1-month', loc='center', color = 'tab:gray')
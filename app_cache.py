@@ -0,0 +1,353 @@
+"""
+Cache backends for IntegratedApp.py (Flask-Caching).
+
+SQLiteLRUCache is a single on-disk file shared by every gunicorn worker
+on the host, so a result computed by one worker is a hit for all of them.
+SimpleLRUCache is the in-process stand-in for tests and single-process
+runs. Both evict least-recently-used entries once the stored size goes
+over CACHE_MAX_BYTES and count hits, misses and evictions.
+
+Pick the backend with CACHE_TYPE, e.g.
+
+    'app_cache.SQLiteLRUCache'   shared on-disk tier (default)
+    'app_cache.SimpleLRUCache'   local, per process
+    'RedisCache'                 local redis server (bound its memory with
+                                 maxmemory / allkeys-lru on the server)
+
+HistoryRangeCache sits on top of any of them and keeps one price history
+per ticker, so date-range requests are served by slicing it.
+"""
+
+
+#Importing Modules
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+from flask_caching.backends.base import BaseCache
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+#===================================================================
+#   Metrics
+#===================================================================
+
+class CacheMetrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+
+    def count(self, name, n=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+                    'sets': self.sets,
+                    'evictions': self.evictions}
+
+
+#===================================================================
+#   Shared on-disk tier
+#===================================================================
+
+class SQLiteLRUCache(BaseCache):
+    """
+    Pickled entries in one SQLite file, shared across processes.
+
+    Every read stamps the entry's access time; after a write the least
+    recently used entries are dropped until the total size is back under
+    max_bytes. Metrics are counted per process.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES, default_timeout=300, **kwargs):
+        super().__init__(default_timeout=default_timeout)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.metrics = CacheMetrics()
+        self._local = threading.local()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS entries ('
+                         'key TEXT PRIMARY KEY, value BLOB, size INTEGER, '
+                         'expires REAL, accessed REAL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        path = os.path.join(config.get('CACHE_DIR') or '.app_cache', 'cache.sqlite')
+        kwargs['max_bytes'] = config.get('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        return cls(path, *args, **kwargs)
+
+    def _connection(self):
+        #sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _expires(self, timeout):
+        timeout = self._normalize_timeout(timeout)
+        return time.time() + timeout if timeout else 0
+
+    def get(self, key):
+        conn = self._connection()
+        row = conn.execute('SELECT value, expires FROM entries WHERE key = ?', (key,)).fetchone()
+
+        if row is None or (row[1] and row[1] < time.time()):
+            if row is not None:
+                conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self.metrics.count('misses')
+            return None
+
+        conn.execute('UPDATE entries SET accessed = ? WHERE key = ?', (time.time(), key))
+        self.metrics.count('hits')
+        return pickle.loads(row[0])
+
+    def set(self, key, value, timeout=None):
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)',
+                     (key, blob, len(blob), self._expires(timeout), time.time()))
+        self.metrics.count('sets')
+        self._evict(conn)
+        return True
+
+    def add(self, key, value, timeout=None):
+        if self.has(key):
+            return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM entries WHERE key = ?', (key,))
+        return True
+
+    def has(self, key):
+        row = self._connection().execute('SELECT expires FROM entries WHERE key = ?', (key,)).fetchone()
+        return row is not None and not (row[0] and row[0] < time.time())
+
+    def clear(self):
+        self._connection().execute('DELETE FROM entries')
+        return True
+
+    def _evict(self, conn):
+        conn.execute('DELETE FROM entries WHERE expires > 0 AND expires < ?', (time.time(),))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        self.metrics.count('evictions', evicted)
+
+    def stats(self):
+        entries, size = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        return dict(self.metrics.snapshot(), backend='sqlite', entries=entries,
+                    bytes=size, max_bytes=self.max_bytes)
+
+
+#===================================================================
+#   In-process stand-in
+#===================================================================
+
+class SimpleLRUCache(BaseCache):
+    """Size-bounded LRU dict of pickled entries, for one process."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, default_timeout=300, **kwargs):
+        super().__init__(default_timeout=default_timeout)
+        self.max_bytes = max_bytes
+        self.metrics = CacheMetrics()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs['max_bytes'] = config.get('CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        return cls(*args, **kwargs)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] and entry[1] < time.time():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.metrics.count('misses')
+                return None
+
+            self._entries.move_to_end(key)
+        self.metrics.count('hits')
+        return pickle.loads(entry[0])
+
+    def set(self, key, value, timeout=None):
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(blob) > self.max_bytes:
+            return False
+
+        timeout = self._normalize_timeout(timeout)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (blob, time.time() + timeout if timeout else 0)
+            self._size += len(blob)
+
+            evicted = 0
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+        self.metrics.count('sets')
+        self.metrics.count('evictions', evicted)
+        return True
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= len(entry[0])
+
+    def add(self, key, value, timeout=None):
+        if self.has(key):
+            return False
+        return self.set(key, value, timeout)
+
+    def delete(self, key):
+        with self._lock:
+            self._remove(key)
+        return True
+
+    def has(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not (entry[1] and entry[1] < time.time())
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+        return True
+
+    def stats(self):
+        with self._lock:
+            entries, size = len(self._entries), self._size
+        return dict(self.metrics.snapshot(), backend='simple-lru', entries=entries,
+                    bytes=size, max_bytes=self.max_bytes)
+
+
+def cache_stats(cache):
+    """Metrics of the backend behind a flask_caching.Cache, if it has any."""
+    backend = cache.cache
+    if hasattr(backend, 'stats'):
+        return backend.stats()
+    return {'backend': type(backend).__name__}
+
+
+#===================================================================
+#   Range-aware price history
+#===================================================================
+
+class HistoryRangeCache:
+    """
+    One cached price history per ticker, served for any date range.
+
+    A request inside the cached range is a slice of it. A request that
+    reaches past either end fetches only the missing edge and merges it
+    in. Ranges are half-open, [start, end), like yfinance's history().
+
+    fetch(ticker, start, end) must return (df, long_name, status) as
+    IntegratedApp.fetch_yahoo_finance_data does, with a tz-naive Date
+    index. The right edge is refetched once the entry is older than
+    recent_ttl, since the latest bar changes during the session.
+
+    Tickers for which serve_stale(ticker) is true are refreshed by someone
+    else (app_prefetch.py): their cached bars are served as they are, and
+    only get(..., refresh=True) refetches the right edge.
+    """
+
+    def __init__(self, cache, fetch, timeout=24 * 60 * 60, recent_ttl=300, serve_stale=None):
+        self.cache = cache
+        self.fetch = fetch
+        self.timeout = timeout
+        self.recent_ttl = recent_ttl
+        self.serve_stale = serve_stale
+        self.metrics = CacheMetrics()
+
+    def key(self, ticker):
+        return 'history:{}'.format(ticker.upper())
+
+    def get(self, ticker, start, end, refresh=False):
+        start, end = pd.Timestamp(start), pd.Timestamp(end)
+        entry = self.cache.get(self.key(ticker))
+
+        if entry is None:
+            df, long_name, status = self.fetch(ticker, start, end)
+            self.metrics.count('misses')
+            if status is not None:
+                return df, long_name, status
+            entry = {'df': df, 'start': start, 'end': end, 'long_name': long_name,
+                     'fetched_at': time.time()}
+            self.cache.set(self.key(ticker), entry, timeout=self.timeout)
+            return df, long_name, None
+
+        df, covered_start, covered_end = entry['df'], entry['start'], entry['end']
+
+        #The newest bar may still be moving: treat it as not covered yet
+        stale = refresh or time.time() - entry['fetched_at'] > self.recent_ttl
+        if stale and not refresh and self.serve_stale is not None and self.serve_stale(ticker):
+            stale = False
+        if stale and not df.empty:
+            covered_end = min(covered_end, df.index.max())
+
+        edges = []
+        if start < covered_start:
+            edges.append((start, covered_start))
+        if end > covered_end:
+            edges.append((covered_end, end))
+
+        if edges:
+            frames = [df]
+            for edge_start, edge_end in edges:
+                edge_df, _, status = self.fetch(ticker, edge_start, edge_end)
+                if status not in (None, 'no_data'):
+                    return pd.DataFrame(), entry['long_name'], status
+                frames.append(edge_df)
+
+            df = pd.concat(frames)
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+            entry = {'df': df, 'start': min(start, covered_start), 'end': max(end, entry['end']),
+                     'long_name': entry['long_name'], 'fetched_at': time.time()}
+            self.cache.set(self.key(ticker), entry, timeout=self.timeout)
+            self.metrics.count('misses')
+        else:
+            self.metrics.count('hits')
+
+        window = df[(df.index >= start) & (df.index < end)]
+        if window.empty:
+            return window, entry['long_name'], 'no_data'
+        return window, entry['long_name'], None
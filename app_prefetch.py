@@ -0,0 +1,181 @@
+"""
+Background cache warming for IntegratedApp.py.
+
+A PrefetchScheduler keeps a watchlist of tickers warm: every interval it
+refreshes their price histories and the processed default view (last two
+years) through the worker pool of stock_downloader.py, so the first user
+to open one of them gets a cache hit. Between refreshes the app serves
+the watched tickers from the cache without going to the network.
+
+Watchlists:
+
+    'nifty50'              nse_list from ticker_list.ipynb
+    'sp500'                the S&P 500 list of ticker_universe.py
+    'AAPL,MSFT,...'        an explicit list
+
+With several gunicorn workers only the one holding the lock file runs the
+refreshes; the shared cache makes the results visible to all of them.
+"""
+
+
+#Importing Modules
+import ast
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from stock_downloader import download_tickers
+
+
+NOTEBOOK_PATH = 'ticker_list.ipynb'
+DEFAULT_INTERVAL = 300
+
+
+#===================================================================
+#   Watchlists
+#===================================================================
+
+def notebook_list(path=NOTEBOOK_PATH, name='nse_list'):
+    """The list assigned to name in a code cell of a notebook."""
+    with open(path) as f:
+        notebook = json.load(f)
+
+    for cell in notebook['cells']:
+        if cell['cell_type'] != 'code':
+            continue
+        source = ''.join(cell['source'])
+        try:
+            tree = ast.parse(source)
+        except SyntaxError:
+            continue
+        for node in tree.body:
+            if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == name for t in node.targets):
+                return list(ast.literal_eval(node.value))
+    raise KeyError('{} not found in {}'.format(name, path))
+
+
+def sp500_list():
+    from ticker_universe import get_tickers
+    return [ticker.strip().replace('.', '-') for ticker in get_tickers('sp500')]
+
+
+def load_watchlist(spec):
+    if not spec:
+        return []
+    if spec.lower() in ('nifty50', 'nifty'):
+        return notebook_list()
+    if spec.lower() == 'sp500':
+        return sp500_list()
+    return [ticker.strip().upper() for ticker in spec.split(',') if ticker.strip()]
+
+
+#===================================================================
+#   Scheduler
+#===================================================================
+
+class PrefetchScheduler:
+    """
+    Refresh a watchlist every interval seconds in a daemon thread.
+
+    warm(ticker) does the work for one ticker and raises on failure (see
+    stock_downloader.fetch_with_retry for the retries). status() reports
+    the last cycle and the last refresh of every ticker.
+    """
+
+    def __init__(self, warm, tickers, interval=DEFAULT_INTERVAL, max_workers=4,
+                 lock_path=os.path.join('.app_cache', 'prefetch.lock')):
+        self.warm = warm
+        self.tickers = list(dict.fromkeys(tickers))
+        self.watched = set(self.tickers)
+        self.interval = interval
+        self.max_workers = max_workers
+        self.lock_path = lock_path
+
+        self.tickers_status = {}
+        self.cycles = 0
+        self.last_cycle = None
+        self.leader = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock_file = None
+
+    def is_watched(self, ticker):
+        return ticker.upper() in self.watched
+
+    def _take_lock(self):
+        if fcntl is None:
+            return True
+        os.makedirs(os.path.dirname(self.lock_path) or '.', exist_ok=True)
+        self._lock_file = open(self.lock_path, 'a')
+        try:
+            fcntl.flock(self._lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            self._lock_file.close()
+            self._lock_file = None
+            return False
+
+    def start(self):
+        """Start the refresh thread; later calls do nothing."""
+        with self._lock:
+            if self._thread is None and self.tickers:
+                self._thread = threading.Thread(target=self._run, name='prefetch', daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self.leader:
+                self.leader = self._take_lock()
+            if self.leader:
+                self.refresh()
+            self._stop.wait(self.interval)
+
+    def _record(self, ticker, **fields):
+        with self._lock:
+            self.tickers_status[ticker] = dict(self.tickers_status.get(ticker, {}), **fields)
+
+    def _warm(self, ticker):
+        self.warm(ticker)
+        self._record(ticker, refreshed=time.time(), error=None)
+
+    def refresh(self):
+        """One refresh cycle over the whole watchlist (blocking)."""
+        started = time.time()
+        summary = download_tickers(self.tickers, self._warm, source='yahoo',
+                                   max_workers=self.max_workers)
+        for ticker, reason in summary.failed.items():
+            self._record(ticker, error=reason)
+
+        with self._lock:
+            self.cycles += 1
+            self.last_cycle = {'started': started, 'elapsed': round(summary.elapsed, 2),
+                               'succeeded': len(summary.succeeded), 'failed': len(summary.failed)}
+        return summary
+
+    def status(self):
+        with self._lock:
+            tickers = {ticker: dict(record) for ticker, record in self.tickers_status.items()}
+            last_cycle = dict(self.last_cycle) if self.last_cycle else None
+        now = time.time()
+        for record in tickers.values():
+            if record.get('refreshed'):
+                record['age'] = round(now - record['refreshed'], 1)
+
+        return {'watchlist': len(self.tickers),
+                'interval': self.interval,
+                'leader': self.leader,
+                'cycles': self.cycles,
+                'last_cycle': last_cycle,
+                'warm': sum(1 for record in tickers.values() if record.get('refreshed')),
+                'tickers': tickers}
@@ -0,0 +1,181 @@
+"""
+Downsampling of long histories before they are sent to Plotly.
+
+A multi-decade daily history is thousands of candles per trace, which
+makes a large JSON payload and a slow chart. Every series is cut to at
+most max_points buckets:
+
+    starts = bucket_starts(len(df), max_points, start, end)
+    bars = downsample_ohlc(df, starts)                       #candles, volume
+    x, y = downsample_line(df.index, df['sma_pp_20'], starts) #lines (LTTB)
+
+The rows [start, end) - the visible window - keep one bucket per row as
+long as they fit in the budget; the history outside it is merged into
+coarser buckets. detail_span(n, start, end) widens a window by a margin
+on both sides, so the next few zoom steps stay inside the rows that are
+already drawn bar for bar (see needs_rebucket). Candles of a bucket are aggregated as an OHLC bar and
+line series keep one point per bucket, picked with Largest-Triangle-
+Three-Buckets so peaks and troughs survive.
+"""
+
+
+#Importing Modules
+import numpy as np
+import pandas as pd
+
+
+MAX_POINTS = 2000
+
+#Share of the budget kept for the history outside the visible window
+OUTSIDE_SHARE = 0.25
+
+
+#===================================================================
+#   Buckets
+#===================================================================
+
+def even_starts(first, last, buckets):
+    """Start rows of up to buckets equal buckets over the rows [first, last)."""
+    rows = last - first
+    if rows <= 0 or buckets <= 0:
+        return np.empty(0, dtype=np.intp)
+    if rows <= buckets:
+        return np.arange(first, last)
+    return first + (np.arange(buckets) * rows // buckets)
+
+
+def bucket_starts(n, max_points=MAX_POINTS, start=0, end=None):
+    """
+    Start row of every bucket for n rows, at most max_points buckets.
+
+    Rows [start, end) are kept one per bucket when they fit, otherwise
+    they get most of the budget; the rest goes to the rows before and
+    after them in proportion to their length.
+    """
+    if n <= max_points:
+        return np.arange(n)
+
+    end = n if end is None else min(max(end, 0), n)
+    start = min(max(start, 0), end)
+    inside, before, after = end - start, start, n - end
+
+    reserve = min(before + after, int(max_points * OUTSIDE_SHARE))
+    window_buckets = min(inside, max_points - reserve)
+    outside_buckets = max_points - window_buckets
+    if not before or not after:
+        before_buckets = outside_buckets if before else 0
+    else:
+        before_buckets = int(round(outside_buckets * before / (before + after)))
+        before_buckets = min(max(before_buckets, 1), outside_buckets - 1)
+    after_buckets = outside_buckets - before_buckets
+
+    return np.concatenate([even_starts(0, start, before_buckets),
+                           even_starts(start, end, window_buckets),
+                           even_starts(end, n, after_buckets)])
+
+
+def detail_span(n, start, end, max_points=MAX_POINTS):
+    """
+    Rows [first, last) to draw bar for bar around the window [start, end).
+
+    The window plus an equal margin on both sides, as wide as the budget
+    inside the window allows. A window wider than that is returned as is.
+    """
+    if n <= max_points:
+        return 0, n
+    budget = window_budget(max_points)
+    if end - start >= budget:
+        return start, end
+    first = max(0, start - (budget - (end - start)) // 2)
+    last = min(n, first + budget)
+    return max(0, last - budget), last
+
+
+def window_budget(max_points=MAX_POINTS):
+    """Rows that always fit bar for bar, whatever the history around them."""
+    return max_points - int(max_points * OUTSIDE_SHARE)
+
+
+def needs_rebucket(n, detail, start, end, max_points=MAX_POINTS):
+    """
+    True if the buckets drawn for detail = (first, last) do not show the
+    rows [start, end) as well as fresh ones would.
+    """
+    if n <= max_points:
+        return False
+    if not detail:
+        return True
+    first, last = detail
+    if (first, last) == (start, end):
+        return False
+    return not (first <= start and end <= last and last - first <= window_budget(max_points))
+
+
+#===================================================================
+#   Candles
+#===================================================================
+
+def downsample_ohlc(df, starts, columns=('open', 'high', 'low', 'close', 'volume')):
+    """One OHLC bar (and summed volume) per bucket, dated by its first row."""
+    if len(starts) == len(df):
+        return df
+    open_, high, low, close, volume = columns
+    last = np.append(starts[1:], len(df)) - 1
+
+    return pd.DataFrame({
+            open_ : df[open_].to_numpy()[starts],
+            high : np.fmax.reduceat(df[high].to_numpy(dtype=float), starts),
+            low : np.fmin.reduceat(df[low].to_numpy(dtype=float), starts),
+            close : df[close].to_numpy()[last],
+            volume : np.add.reduceat(np.nan_to_num(df[volume].to_numpy(dtype=float)), starts),
+            }, index=df.index[starts])
+
+
+#===================================================================
+#   Lines (LTTB)
+#===================================================================
+
+def bucket_means(values, starts):
+    valid = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(valid, values, 0), starts)
+    counts = np.add.reduceat(valid, starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+def lttb_indices(x, y, starts):
+    """
+    Largest-Triangle-Three-Buckets: one row per bucket.
+
+    The first and last rows are always kept. In every other bucket the
+    row forming the largest triangle with the previously kept row and
+    the mean of the next bucket is picked.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if len(starts) >= n:
+        return np.arange(n)
+
+    ends = np.append(starts[1:], n)
+    mean_x, mean_y = bucket_means(x, starts), bucket_means(y, starts)
+
+    picked = np.empty(len(starts), dtype=np.intp)
+    picked[0], picked[-1] = starts[0], n - 1
+    for i in range(1, len(starts) - 1):
+        a = picked[i - 1]
+        bx, by = x[starts[i]:ends[i]], y[starts[i]:ends[i]]
+        area = np.abs((x[a] - mean_x[i + 1]) * (by - y[a]) - (x[a] - bx) * (mean_y[i + 1] - y[a]))
+        area = np.where(np.isnan(area), -1, area)
+        picked[i] = starts[i] + int(np.argmax(area))
+    return picked
+
+
+def downsample_line(index, values, starts):
+    """(index, values) cut to one LTTB point per bucket."""
+    values = np.asarray(values, dtype=float)
+    if len(starts) >= len(values):
+        return index, values
+    x = pd.DatetimeIndex(index).asi8 if isinstance(index, pd.DatetimeIndex) else index
+    picked = lttb_indices(x, values, starts)
+    return index[picked], values[picked]
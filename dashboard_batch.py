@@ -0,0 +1,158 @@
+"""
+Batch rendering of the stock_dashboards.py figures on a process pool.
+
+    python dashboard_batch.py --market nifty                  #every Nifty 50 stock, PNG
+    python dashboard_batch.py --tickers SBIN,INFY --workers 4 --format pdf
+    python dashboard_batch.py --workers 0                     #in this process, for comparison
+
+The tickers are fanned out over worker processes, since matplotlib
+rendering is CPU bound and pyplot cannot be shared between threads.
+Every worker switches to the Agg backend (no display) and builds the
+three 15x12 dashboard layouts once; for each ticker the axes are only
+cleared and drawn over (stock_dashboards.FigureTemplate).
+
+The frames come from the pipeline cache (pipeline.py) when it is up to
+date with the store, otherwise they are transformed in the worker. The
+run ends with the number of figures written per second.
+"""
+
+
+#Importing Modules
+#matplotlib and the dashboards are imported in the worker processes
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import stock_store
+from pipeline import CACHE_ROOT, cache_dir, load_frames, read_key, store_fingerprint, universe_symbols
+
+
+#===================================================================
+#   Worker side
+#===================================================================
+
+def init_worker():
+    """Agg backend and the figure templates, once per worker process."""
+    import matplotlib
+    matplotlib.use('Agg')
+
+    import stock_dashboards
+    for template in stock_dashboards.dashboard_templates().values():
+        template.get()
+
+
+def ticker_frames(market, ticker, cache_root=CACHE_ROOT):
+    directory = cache_dir(market, ticker, cache_root)
+    if read_key(directory, 'transform.json') == store_fingerprint(market, ticker):
+        return load_frames(directory)
+
+    from stock_data_transformations import transform
+    return transform(stock_store.read_ticker(market, ticker))
+
+
+def render_ticker(market, ticker, directory, fmt='png', dpi=100, cache_root=CACHE_ROOT):
+    """Paths written for one ticker and the seconds it took."""
+    from stock_dashboards import render_dashboards
+
+    started = time.perf_counter()
+    paths = render_dashboards(ticker_frames(market, ticker, cache_root), ticker, directory, fmt, dpi)
+    return paths, time.perf_counter() - started
+
+
+#===================================================================
+#   Batch summary
+#===================================================================
+
+class BatchReport:
+
+    def __init__(self, workers):
+        self.workers = workers
+        self.rendered = {}
+        self.seconds = {}
+        self.failed = {}
+        self.elapsed = 0.0
+
+    def __repr__(self):
+        return '<BatchReport {} tickers, {} figures, {:.2f}s>'.format(
+            len(self.rendered), self.figures, self.elapsed)
+
+    @property
+    def figures(self):
+        return sum(len(paths) for paths in self.rendered.values())
+
+    def report(self):
+        rate = self.figures / self.elapsed if self.elapsed else 0.0
+        render_time = sum(self.seconds.values())
+
+        lines = ['Workers: {}'.format(self.workers or 'in process'),
+                 'Tickers: {} ({} rendered, {} failed)'.format(
+                     len(self.rendered) + len(self.failed), len(self.rendered), len(self.failed)),
+                 'Figures: {}'.format(self.figures),
+                 'Wall time: {:.2f}s ({:.2f} figures/s)'.format(self.elapsed, rate)]
+        if self.seconds:
+            lines.append('Render time: {:.2f}s ({:.2f}s per ticker)'.format(
+                render_time, render_time / len(self.seconds)))
+
+        for ticker, error in sorted(self.failed.items()):
+            lines.append('  FAILED {}: {}'.format(ticker, error))
+        return '\n'.join(lines)
+
+
+#===================================================================
+#   The batch
+#===================================================================
+
+def render_batch(tickers, market='nifty', directory='charts', fmt='png', dpi=100,
+                 max_workers=None, cache_root=CACHE_ROOT):
+    """
+    Render every ticker's dashboards into directory.
+
+    max_workers=None uses one process per CPU; 0 renders in this process.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+
+    summary = BatchReport(max_workers)
+    started = time.perf_counter()
+
+    def collect(ticker, result):
+        summary.rendered[ticker], summary.seconds[ticker] = result
+
+    if max_workers == 0:
+        init_worker()
+        for ticker in tickers:
+            try:
+                collect(ticker, render_ticker(market, ticker, directory, fmt, dpi, cache_root))
+            except Exception as e:
+                summary.failed[ticker] = str(e) or type(e).__name__
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=init_worker) as pool:
+            futures = {pool.submit(render_ticker, market, ticker, directory, fmt, dpi, cache_root): ticker
+                       for ticker in tickers}
+            for future in as_completed(futures):
+                ticker = futures[future]
+                try:
+                    collect(ticker, future.result())
+                except Exception as e:
+                    summary.failed[ticker] = str(e) or type(e).__name__
+
+    summary.elapsed = time.perf_counter() - started
+    return summary
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Render the dashboards of many tickers.')
+    parser.add_argument('--market', choices=['nifty', 'sp500'], default='nifty')
+    parser.add_argument('--tickers', default='', help='comma separated (default: the whole universe)')
+    parser.add_argument('--output', default='charts')
+    parser.add_argument('--format', default='png', help='png, svg, ... or pdf (one file per ticker)')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: one per CPU)')
+    args = parser.parse_args()
+
+    tickers = [ticker.strip() for ticker in args.tickers.split(',') if ticker.strip()]
+    summary = render_batch(universe_symbols(args.market, tickers), args.market, args.output,
+                           args.format, args.dpi, args.workers)
+    print (summary.report())
@@ -0,0 +1,350 @@
+"""
+Data providers behind one interface and one column schema.
+
+Every source the scripts use is wrapped as a provider whose
+get_history(ticker, start, end) returns the same layout: a tz-naive
+'Date' index and the SCHEMA columns (missing ones as NaN), followed by
+any extra columns of the source:
+
+    Open High Low Close Adj Close Volume VWAP Trades Deliverable Volume %Deliverble
+
+    NsepyProvider        nsepy.get_history            (stock_get_data.py, Nifty)
+    DataReaderProvider   pandas_datareader 'yahoo'    (stock_get_data.py, S&P 500, NSE scripts)
+    YFinanceProvider     yfinance Ticker.history      (IntegratedApp.py, adjusted OHLC;
+                                                       auto_adjust=False for the store)
+    ReplayProvider       recorded fixtures, no network
+
+Record fixtures once from a real source, then replay them at any latency
+to benchmark the fetch path or compare backends offline:
+
+    record(YFinanceProvider(), ['AAPL', 'MSFT'], 'fixtures', start, end)
+    python data_providers.py --replay fixtures --latency 0.2 --workers 16
+"""
+
+
+#Importing Modules
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from stock_downloader import download_tickers, FakeProvider, set_source_limit
+
+
+SCHEMA = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume',
+          'VWAP', 'Trades', 'Deliverable Volume', '%Deliverble']
+
+#Legacy and source specific names -> schema name (matched case-insensitively)
+LEGACY_COLUMNS = {
+        'open' : 'Open',
+        'high' : 'High',
+        'low' : 'Low',
+        'close' : 'Close',
+        'adj close' : 'Adj Close',
+        'adj_close' : 'Adj Close',
+        'adjclose' : 'Adj Close',
+        'volume' : 'Volume',
+        'vwap' : 'VWAP',
+        'trades' : 'Trades',
+        'no. of trades' : 'Trades',
+        'deliverable volume' : 'Deliverable Volume',
+        'deliverable qty' : 'Deliverable Volume',
+        '%deliverble' : '%Deliverble',
+        '%deliverable' : '%Deliverble',
+        '% dly qt to traded qty' : '%Deliverble',
+}
+
+
+class ProviderError(Exception):
+    pass
+
+
+class InvalidTickerError(ProviderError):
+    pass
+
+
+#===================================================================
+#   Schema
+#===================================================================
+
+def normalize_frame(df, extra=True):
+    """Source frame -> schema layout (Date index, SCHEMA columns first)."""
+    if df is None or len(df) == 0:
+        return pd.DataFrame(columns=SCHEMA, index=pd.DatetimeIndex([], name='Date'))
+
+    df = df.rename(columns=lambda col: LEGACY_COLUMNS.get(str(col).strip().lower(), col))
+    if df.index.name != 'Date':
+        date_col = next((col for col in df.columns if str(col).lower() in ('date', 'datetime')), None)
+        if date_col is not None:
+            df = df.set_index(date_col)
+
+    index = pd.DatetimeIndex(pd.to_datetime(df.index))
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    df = df.set_axis(index.rename('Date'), axis=0)
+
+    columns = SCHEMA + ([col for col in df.columns if col not in SCHEMA] if extra else [])
+    df = df.reindex(columns=columns)
+    for col in SCHEMA:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype(float)
+    return df.sort_index()
+
+
+#===================================================================
+#   Providers
+#===================================================================
+
+class DataProvider:
+    """
+    Base class: subclasses implement fetch(ticker, start, end).
+
+    source names the concurrency limit in stock_downloader.SOURCE_LIMITS.
+    """
+
+    name = 'base'
+    source = 'yahoo'
+
+    def fetch(self, ticker, start, end):
+        raise NotImplementedError
+
+    def get_history(self, ticker, start, end, extra=True):
+        return normalize_frame(self.fetch(ticker, start, end), extra)
+
+    def get_histories(self, tickers, start, end, extra=True):
+        """{ticker: frame} for several tickers; one request per ticker here."""
+        return {ticker: self.get_history(ticker, start, end, extra) for ticker in tickers}
+
+
+class NsepyProvider(DataProvider):
+
+    name = 'nsepy'
+    source = 'nsepy'
+
+    def fetch(self, ticker, start, end):
+        from nsepy import get_history
+        return get_history(ticker, pd.Timestamp(start).date(), pd.Timestamp(end).date())
+
+
+class DataReaderProvider(DataProvider):
+
+    name = 'datareader'
+    source = 'yahoo'
+
+    def __init__(self, data_source='yahoo'):
+        self.data_source = data_source
+
+    def fetch(self, ticker, start, end):
+        import pandas_datareader.data as pdr
+        return pdr.DataReader(ticker, self.data_source, start, end)
+
+
+class YFinanceProvider(DataProvider):
+    """
+    Split and dividend adjusted OHLC by default, as the app's charts use.
+
+    auto_adjust=False gives unadjusted OHLC plus Adj Close, as the other
+    Yahoo sources do; the store writers ask for that.
+    """
+
+    name = 'yfinance'
+    source = 'yahoo'
+
+    def __init__(self, auto_adjust=True):
+        self.auto_adjust = auto_adjust
+
+    def fetch(self, ticker, start, end):
+        import yfinance as yf
+
+        try:
+            return yf.Ticker(ticker).history(start=start, end=end, auto_adjust=self.auto_adjust)
+        except getattr(yf, 'TickerError', ()) as e:
+            raise InvalidTickerError(str(e))
+
+    def get_histories(self, tickers, start, end, extra=True):
+        """One yf.download request for all tickers, split per ticker in memory."""
+        import yfinance as yf
+
+        combined = yf.download(list(tickers), start=start, end=end, group_by='ticker',
+                               auto_adjust=self.auto_adjust, threads=False, progress=False)
+        return split_combined(combined, tickers, extra)
+
+
+class SyntheticProvider(DataProvider):
+    """stock_downloader.FakeProvider behind the provider interface."""
+
+    name = 'fake'
+    source = 'fake'
+
+    def __init__(self, latency=0.0, failure_rate=0.0, seed=0):
+        self.latency = latency
+        self.fake = FakeProvider(latency=latency, failure_rate=failure_rate, seed=seed)
+        self.bulk_fake = FakeProvider(latency=0, failure_rate=failure_rate, seed=seed)
+
+    def fetch(self, ticker, start, end):
+        return self.fake.get_history(ticker, start, end)
+
+    def get_histories(self, tickers, start, end, extra=True):
+        #One simulated round trip for the whole batch, like a bulk request
+        time.sleep(self.latency)
+        return {ticker: normalize_frame(self.bulk_fake.get_history(ticker, start, end), extra)
+                for ticker in tickers}
+
+
+class ReplayProvider(DataProvider):
+    """
+    Serves recorded fixtures (<directory>/<ticker>.parquet) offline.
+
+    Every call sleeps latency seconds (plus up to jitter), then returns
+    the recorded rows between start and end. An unknown ticker raises
+    InvalidTickerError, like a real source.
+    """
+
+    name = 'replay'
+    source = 'replay'
+
+    def __init__(self, directory='fixtures', latency=0.0, jitter=0.0, seed=0):
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.calls = 0
+        self._frames = {}
+        self._random = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def _frame(self, ticker):
+        with self._lock:
+            self.calls += 1
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0)
+            if ticker not in self._frames:
+                path = os.path.join(self.directory, '{}.parquet'.format(ticker))
+                if not os.path.exists(path):
+                    raise InvalidTickerError('{}: no fixture in {}'.format(ticker, self.directory))
+                self._frames[ticker] = pd.read_parquet(path)
+        return self._frames[ticker], delay
+
+    def tickers(self):
+        return sorted(name[:-len('.parquet')] for name in os.listdir(self.directory)
+                      if name.endswith('.parquet'))
+
+    def fetch(self, ticker, start, end, wait=True):
+        df, delay = self._frame(ticker)
+        if wait:
+            time.sleep(delay)
+        return df.loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+    def get_histories(self, tickers, start, end, extra=True):
+        #One latency for the whole batch, like a bulk request; unknown
+        #tickers are left out, as a bulk download leaves them empty
+        time.sleep(self.latency)
+        frames = {}
+        for ticker in tickers:
+            try:
+                frames[ticker] = normalize_frame(self.fetch(ticker, start, end, wait=False), extra)
+            except InvalidTickerError:
+                pass
+        return frames
+
+
+def split_combined(combined, tickers, extra=True):
+    """
+    Per-ticker frames from a multi-ticker download.
+
+    The columns are (ticker, field) pairs, as yf.download(group_by='ticker')
+    returns them; a single-ticker download may have plain field columns.
+    Rows where a ticker has no data are dropped; tickers without any data
+    are left out.
+    """
+    frames = {}
+    if combined is None or combined.empty:
+        return frames
+
+    if not isinstance(combined.columns, pd.MultiIndex):
+        combined = pd.concat({tickers[0]: combined}, axis=1)
+
+    available = set(combined.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        df = combined[ticker].dropna(how='all')
+        if not df.empty:
+            frames[ticker] = normalize_frame(df, extra)
+    return frames
+
+
+PROVIDERS = {
+        'nsepy' : NsepyProvider,
+        'datareader' : DataReaderProvider,
+        'yfinance' : YFinanceProvider,
+        'replay' : ReplayProvider,
+        'fake' : SyntheticProvider,
+}
+
+
+def get_provider(name, **kwargs):
+    return PROVIDERS[name](**kwargs)
+
+
+class HistoryAdapter(DataProvider):
+    """Any object with get_history(ticker, start, end), e.g. stock_downloader.FakeProvider."""
+
+    def __init__(self, history_source):
+        self.history_source = history_source
+        self.name = getattr(history_source, 'name', type(history_source).__name__)
+        self.source = getattr(history_source, 'source', self.name)
+
+    def fetch(self, ticker, start, end):
+        return self.history_source.get_history(ticker, start, end)
+
+
+def as_provider(provider):
+    """provider itself if it is a DataProvider, otherwise wrapped in a HistoryAdapter."""
+    if isinstance(provider, DataProvider):
+        return provider
+    if not callable(getattr(provider, 'get_history', None)):
+        raise TypeError('{!r} is not a data provider (no get_history method)'.format(provider))
+    return HistoryAdapter(provider)
+
+
+#===================================================================
+#   Recording and benchmarking
+#===================================================================
+
+def record(provider, tickers, directory, start, end, max_workers=8):
+    """Save provider's normalized history of every ticker as a fixture."""
+    os.makedirs(directory, exist_ok=True)
+
+    def save(ticker, df):
+        df.to_parquet(os.path.join(directory, '{}.parquet'.format(ticker)))
+
+    return download_tickers(tickers, lambda t: provider.get_history(t, start, end),
+                            source=provider.source, max_workers=max_workers, on_result=save)
+
+
+def compare(providers, tickers, start, end, max_workers=8):
+    """Fetch the same tickers from every provider; a summary per provider."""
+    summaries = {}
+    for provider in providers:
+        set_source_limit(provider.source, max_workers)
+        summaries[provider.name] = download_tickers(
+            tickers, lambda t, p=provider: p.get_history(t, start, end),
+            source=provider.source, max_workers=max_workers, backoff=0.05)
+    return summaries
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the fetch path on recorded fixtures.')
+    parser.add_argument('--replay', default='fixtures', help='fixture directory')
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--start', default='2000-01-01')
+    parser.add_argument('--end', default=pd.Timestamp.today().strftime('%Y-%m-%d'))
+    args = parser.parse_args()
+
+    replay = ReplayProvider(args.replay, latency=args.latency, jitter=args.jitter)
+    summaries = compare([replay], replay.tickers(), args.start, args.end, args.workers)
+    for summary in summaries.values():
+        print (summary.report())
@@ -0,0 +1,45 @@
+"""
+Per-point styling for the Plotly (IntegratedApp.py) and matplotlib
+(stock_dashboards.py, NSE_mcap_weight.py) charts.
+
+Every colour array is derived from a NumPy boolean mask in one np.where,
+instead of a Python loop over the rows:
+
+    colors = up_down_colors(df['open'], df['close'])        #volume bars
+    colored = sign_colors(df['1 year'])                     #returns bars
+    colors = highlight_colors(len(profile), top_n(profile, 2),
+                              'rgba(150,150,150,0.2)', 'orange')
+
+The arrays can be passed straight to marker_color / color=.
+"""
+
+
+#Importing Modules
+import numpy as np
+
+
+def mask_colors(mask, true_color, false_color):
+    """true_color where mask is set, false_color elsewhere."""
+    return np.where(np.asarray(mask, dtype=bool), true_color, false_color)
+
+
+def sign_colors(values, positive='tab:green', negative='tab:red'):
+    """positive for values >= 0, negative otherwise (NaN included)."""
+    return mask_colors(np.asarray(values, dtype=float) >= 0, positive, negative)
+
+
+def up_down_colors(open_, close, up='green', down='red'):
+    """up for bars closing above their open, down otherwise."""
+    return mask_colors(np.asarray(close, dtype=float) > np.asarray(open_, dtype=float), up, down)
+
+
+def top_n(values, n):
+    """Positions of the n largest values."""
+    return np.argsort(np.asarray(values))[-n:]
+
+
+def highlight_colors(size, positions, base, highlight):
+    """base everywhere except highlight at positions."""
+    mask = np.zeros(size, dtype=bool)
+    mask[positions] = True
+    return mask_colors(mask, highlight, base)
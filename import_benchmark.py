@@ -0,0 +1,191 @@
+"""
+Import-time benchmark for the entry scripts and shared modules.
+
+Every target is imported in a fresh interpreter, several times, and the
+median time is reported. For the scripts only their top-level import
+statements are run (read with ast), since running a script does the
+work too; that is exactly the startup cost of a cron step.
+
+    python import_benchmark.py                  #report
+    python import_benchmark.py --save           #store the baseline
+    python import_benchmark.py --check          #fail on a regression
+
+Times are reported relative to the start of a bare interpreter
+(python -c pass) on the same machine, so a baseline measured on a fast
+laptop does not fail on a slow CI runner. The baseline is local to the
+machine (import_times.json is not committed): --check saves one when it
+is missing. A target regresses when its cost is above tolerance x
+baseline + slack. --check also fails when a target has no baseline entry
+and when importing a target raises; a target needing an optional package
+that is not installed (e.g. matplotlib) is reported as skipped.
+"""
+
+
+#Importing Modules
+import argparse
+import ast
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+BASELINE_PATH = 'import_times.json'
+
+SCRIPTS = ['stock_get_data.py', 'stock_data_transformations.py', 'stock_dashboards.py',
+           'normalization_nifty_data.py', 'nse_indices_normalized.py',
+           'nse_indices_normalized_charting.py', 'NSE_mcap_weight.py', 'IntegratedApp.py',
+           'pipeline.py', 'dashboard_batch.py']
+
+MODULES = ['stock_store', 'stock_downloader', 'stock_indicators', 'stock_indicator_state',
+           'stock_resample', 'stock_panel', 'volume_profile', 'chart_downsample',
+           'figure_helpers', 'app_cache', 'ticker_metadata', 'ticker_universe']
+
+TIMER = """import time
+_started = time.perf_counter()
+{}
+print(time.perf_counter() - _started)
+"""
+
+
+#===================================================================
+#   Measuring
+#===================================================================
+
+def script_imports(path):
+    """The top-level import statements of a script, as source."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    return '\n'.join(ast.unparse(node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom))
+                     and getattr(node, 'module', None) != '__future__')
+
+
+def time_code(code, repeat=5):
+    """Median seconds to run code in a fresh interpreter, or the error."""
+    times = []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', TIMER.format(code)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            return None, proc.stderr.strip().splitlines()[-1]
+        times.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(times), None
+
+
+def interpreter_seconds(repeat=5):
+    """Median wall time of python -c pass: the unit every cost is given in."""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'], capture_output=True)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times)
+
+
+def measure(repeat=5):
+    """{target: (cost, error)}, cost in interpreter starts on this machine."""
+    unit = interpreter_seconds(repeat)
+    results = {}
+    for script in SCRIPTS:
+        if os.path.exists(script):
+            results[script] = time_code(script_imports(script), repeat)
+    for module in MODULES:
+        results[module] = time_code('import {}'.format(module), repeat)
+    return {name: (None if seconds is None else seconds / unit, error)
+            for name, (seconds, error) in results.items()}
+
+
+def missing_dependency(error):
+    """
+    The optional package an import error is about, or None.
+
+    A repository module that cannot be found is a real error, not a skip.
+    """
+    prefix = "ModuleNotFoundError: No module named '"
+    if not error or not error.startswith(prefix):
+        return None
+    package = error[len(prefix):].split("'")[0].split('.')[0]
+    here = os.path.dirname(os.path.abspath(__file__))
+    return None if os.path.exists(os.path.join(here, package + '.py')) else package
+
+
+#===================================================================
+#   Baseline
+#===================================================================
+
+def load_baseline(path=BASELINE_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    baseline = {name: round(seconds, 4) for name, (seconds, error) in results.items() if error is None}
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=1, sort_keys=True)
+
+
+def regressions(results, baseline, tolerance=1.5, slack=1.0):
+    slow = {}
+    for name, (seconds, error) in results.items():
+        if error is None and name in baseline and seconds > baseline[name] * tolerance + slack:
+            slow[name] = (baseline[name], seconds)
+    return slow
+
+
+def check_failures(results, baseline, tolerance=1.5, slack=1.0):
+    """Every reason for --check to fail, as printable lines."""
+    failures = []
+    for name, (cost, error) in results.items():
+        if error is not None:
+            if missing_dependency(error) is None:
+                failures.append('IMPORT ERROR {}: {}'.format(name, error))
+        elif name not in baseline:
+            failures.append('NO BASELINE {}: {:.2f}'.format(name, cost))
+    for name, (base, cost) in regressions(results, baseline, tolerance, slack).items():
+        failures.append('REGRESSION {}: {:.2f} (baseline {:.2f})'.format(name, cost, base))
+    return failures
+
+
+def report(results, baseline):
+    lines = ['{:<38} {:>9} {:>9}   (x python -c pass)'.format('Target', 'Cost', 'Baseline')]
+    for name, (cost, error) in results.items():
+        if error is not None:
+            package = missing_dependency(error)
+            note = 'skipped, {} is not installed'.format(package) if package else error
+            lines.append('{:<38} {:>9} {:>9}   {}'.format(name, '-', '-', note))
+            continue
+        base = baseline.get(name)
+        lines.append('{:<38} {:>9.2f} {:>9}'.format(name, cost, '{:.2f}'.format(base) if base else '-'))
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Import time of the entry scripts and modules.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    parser.add_argument('--check', action='store_true', help='exit 1 if a target got slower, failed to import or has no baseline')
+    parser.add_argument('--tolerance', type=float, default=1.5)
+    parser.add_argument('--slack', type=float, default=1.0, help='in interpreter starts')
+    args = parser.parse_args()
+
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+    results = measure(args.repeat)
+    baseline = load_baseline()
+    print (report(results, baseline))
+
+    #The first --check on a machine measures its own baseline
+    if args.save or (args.check and not baseline):
+        save_baseline(results)
+        print ('Baseline saved to {}'.format(BASELINE_PATH))
+        baseline = load_baseline()
+
+    if args.check:
+        failures = check_failures(results, baseline, args.tolerance, args.slack)
+        for line in failures:
+            print (line)
+        sys.exit(1 if failures else 0)
@@ -3,60 +3,43 @@ Testing the normed spagetti chart on Nifty
 """
 
 #Importing
-import bs4 as bs
+#Scraping and data source libraries are imported where they are used
 import datetime as dt
-import matplotlib.pyplot as plt
-from matplotlib import style
-import mplfinance as mpf
-import matplotlib.dates as mdates
-import matplotlib.animation as animation
 import numpy as np
 import os
-import pandas as pd
-import pandas_datareader.data as pdr
-import pickle
-import requests
-import yfinance as yf
+
+import stock_store
+from data_providers import DataReaderProvider
+from stock_panel import build_panel, rebase, store_reader, write_panel
+from ticker_universe import get_tickers
 
 
 #Setting the start and end dates for the data
 start = dt.datetime(2017,1,1)
 end = dt.date.today()
 
-#Getting the Nifty tickers - Sentdex
-def save_nifty_tickers():
-    
-    resp = requests.get('http://en.wikipedia.org/wiki/NIFTY_50')
-    soup = bs.BeautifulSoup(resp.text, 'lxml')
-    table = soup.find('table', {'class': 'wikitable sortable'})
-    
-    tickers = []
-    
-    for row in table.findAll('tr')[1:]:
-        ticker = row.findAll('td')[1].text.replace('.', '-')
-        ticker = ticker[:-3]+".NS"
-        tickers.append(ticker)
-        
-    with open("niftytickers.pickle", "wb") as f:
-        pickle.dump(tickers, f)
-    return tickers
+#The bars are kept in the Parquet store (stock_store.py), not in nifty_data/*.csv
+NIFTY_MARKET = 'nifty_yahoo'
 
-save_nifty_tickers()
+#Getting the Nifty tickers - from the local registry (ticker_universe.py)
+def save_nifty_tickers():
+    return get_tickers('nifty50', refresh=True)
 
 
 #Getting data, and setting the columns
 
 
 def get_data_from_yahoo(reload_nifty=False):
-    
+    provider = DataReaderProvider()
+
     if reload_nifty:
         tickers = save_nifty_tickers()
     else:
-        with open("niftytickers.pickle", "rb") as f:
-            tickers = pickle.load(f)
+        tickers = get_tickers('nifty50')
     
-    if not os.path.exists('nifty_data'):
-        os.makedirs('nifty_data')
+    #One-off import of the old CSV folder into the store
+    if not stock_store.list_tickers(NIFTY_MARKET) and os.path.isdir('nifty_data'):
+        stock_store.import_csv_directory('nifty_data', NIFTY_MARKET)
     
     #start = dt.datetime(2019, 6, 8)
     #end = dt.datetime.now()
@@ -66,13 +49,9 @@ def get_data_from_yahoo(reload_nifty=False):
         
         print(ticker)
         
-        if not os.path.exists('nifty_data/{}.csv'.format(ticker)):
-            #df = pdr.get_data_yahoo(ticker, start, end)
-            
-            df = pdr.DataReader(ticker, 'yahoo', start, end)
-            
-            df.reset_index(inplace=True)
-            df.set_index("Date", inplace=True)
+        if not stock_store.has_ticker(NIFTY_MARKET, ticker):
+            #Date index and the common column names (data_providers.py)
+            df = provider.get_history(ticker, start, end)
             
             
             
@@ -86,12 +65,11 @@ def get_data_from_yahoo(reload_nifty=False):
             df['flag_100'] = np.where( df['Adj Close'.format(ticker)] - df['{}_100ma'.format(ticker)] < 0, 1, -1 )
             df['flag_200'] = np.where( df['Adj Close'.format(ticker)] - df['{}_200ma'.format(ticker)] < 0, 1, -1 )
             
-            x_temp = df['Adj Close'][0]
-            df['norm_{}'.format(ticker)] = (df['Adj Close'] * 100) / x_temp
+            #No stored norm_ column: compile_data() rebases Adj Close on read
 
             
             
-            df.to_csv('nifty_data/{}.csv'.format(ticker))
+            stock_store.write_ticker(df, NIFTY_MARKET, ticker)
         else:
             print('Already have {}'.format(ticker))
 
@@ -100,32 +78,17 @@ get_data_from_yahoo()
 
 
 
-def compile_data():
-    with open("niftytickers.pickle", "rb") as f:
-        tickers = pickle.load(f)
-        
-    main_df = pd.DataFrame()
-    
-    for count, ticker in enumerate (tickers):
-        df = pd.read_csv('nifty_data/{}.csv'.format(ticker))
-        df.set_index('Date', inplace = True)
-        
-        #df.rename(columns = {'norm_{}'.format(ticker): ticker}, inplace = True)
-        #df.drop(['Open','High','Low','Close','Volume', 'Adj Close'], 1, inplace = True)
-        
-        df = df.filter(['norm_{}'.format(ticker)])
-        
-        if main_df.empty:
-            main_df = df
-        else:
-            main_df = main_df.join(df, how = "outer")
-            
-            
-        if count % 10 == 0:
-            print (count)
-            
-    print (main_df.head())
-    main_df.to_csv('.nifty_data/nifty_normalized.csv')
+def compile_data(path='nifty_data/nifty_adjusted.parquet', long=False, base_date=None):
+    tickers = get_tickers('nifty50')
+
+    #Reads the Adj Close columns from the store concurrently and joins them in one concat
+    main_df = build_panel(tickers, store_reader(NIFTY_MARKET, 'Adj Close'))
+    write_panel(main_df, path, long=long)
+
+    #Normalized to 100 at base_date (the first date by default)
+    normalized = rebase(main_df, base_date)
+    print (normalized.head())
+    return normalized
 
     
 compile_data()
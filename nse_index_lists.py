@@ -0,0 +1,42 @@
+"""
+Constituent lists of the NSE indices, as published by NSE.
+
+Shared by nse_indices_normalized.py (downloads) and ticker_metadata.py
+(company names and industries). Uncomment an index to include it.
+"""
+
+
+# dictionary for purposes of Testing
+#ticker_list = { 
+#        'nifty_50' : 'https://www1.nseindia.com/content/indices/ind_nifty50list.csv',
+#        'next_50' : 'https://www1.nseindia.com/content/indices/ind_niftynext50list.csv',
+#      #  'nifty_100' : 'https://www1.nseindia.com/content/indices/ind_nifty100list.csv',
+#}
+
+ticker_list = { 
+        'nifty_50' : 'https://www1.nseindia.com/content/indices/ind_nifty50list.csv',
+        'next_50' : 'https://www1.nseindia.com/content/indices/ind_niftynext50list.csv',
+        #'nifty_100' : 'https://www1.nseindia.com/content/indices/ind_nifty100list.csv',
+        #'nifty_200' : 'https://www1.nseindia.com/content/indices/ind_nifty200list.csv',
+        #'nifty_500' : 'https://www1.nseindia.com/content/indices/ind_nifty500list.csv',
+        #'midcap_50' : 'https://www1.nseindia.com/content/indices/ind_niftymidcap50list.csv',
+        #'midcap_150' : 'https://www1.nseindia.com/content/indices/ind_niftymidcap150list.csv',
+        #'midcap_100' : 'https://www1.nseindia.com/content/indices/ind_niftymidcap100list.csv',
+        #'smallcap_50' : 'https://www1.nseindia.com/content/indices/ind_niftysmallcap50list.csv',
+        #'smallcap_100' : 'https://www1.nseindia.com/content/indices/ind_niftysmallcap100list.csv',
+        #'smallcap_250' : 'https://www1.nseindia.com/content/indices/ind_niftysmallcap250list.csv',
+        #'auto_index' : 'https://www1.nseindia.com/content/indices/ind_niftyautolist.csv',
+        #'bank_index' : 'https://www1.nseindia.com/content/indices/ind_niftybanklist.csv',
+        #'con_durables' : 'https://www1.nseindia.com/content/indices/ind_niftyconsumerdurableslist.csv',
+        #'fin_index' : 'https://www1.nseindia.com/content/indices/ind_niftyfinancelist.csv',
+        #'fin_serv' : 'https://www1.nseindia.com/content/indices/ind_niftyfinancialservices25_50list.csv',
+        #'fmcg_nse' : 'https://www1.nseindia.com/content/indices/ind_niftyfmcglist.csv',
+        'it_nse' : 'https://www1.nseindia.com/content/indices/ind_niftyitlist.csv',
+        #'media_nse' : 'https://www1.nseindia.com/content/indices/ind_niftymedialist.csv',
+        #'metal_nse' : 'https://www1.nseindia.com/content/indices/ind_niftymetallist.csv',
+        #'oil_nse' : 'https://www1.nseindia.com/content/indices/ind_niftyoilgaslist.csv',
+        'pharma_nse' : 'https://www1.nseindia.com/content/indices/ind_niftypharmalist.csv',
+        'pbank_nse' : 'https://www1.nseindia.com/content/indices/ind_nifty_privatebanklist.csv',
+        'psu_bank' : 'https://www1.nseindia.com/content/indices/ind_niftypsubanklist.csv',
+        #'realty_nse' : 'https://www1.nseindia.com/content/indices/ind_niftyrealtylist.csv',
+}
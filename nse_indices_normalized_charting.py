@@ -1,7 +1,7 @@
 """
 This code goes along with the nse_indices_normalized.py. In this code
-we calculate the normed data, with an option to save it, and
-do a basic chart the normalized data.
+we calculate the normed data (rebased from the stored adjusted prices),
+with an option to save it, and do a basic chart the normalized data.
 """
 
 #=====================================================================
@@ -12,6 +12,8 @@ import pandas as pd
 import os
 from matplotlib import cm
 
+from stock_panel import rebase
+
 os.chdir('/home/lubuntu/Downloads/TempDelete/norm')
 
 if not os.path.exists('Normalized'):
@@ -21,15 +23,17 @@ normalized_df = pd.read_csv('Constants/dataframe_tickers.csv', index_col = 0,)
 
 column_norm_list = list(normalized_df.columns.values)
 
-norm = pd.DataFrame()
+#Base date of the normalization; the stored adjusted prices are rebased
+#when read, so any date works without downloading again.
+base_date = '2017-01-01'
 
 for col_ in column_norm_list:
 
-    tickers = normalized_df[col_].values.tolist()
+    tickers = normalized_df[col_].dropna().values.tolist()
 
-    for i in tickers[:10]:
-        df_temp = pd.read_csv('Data/{}.NS_normalized.csv'.format(i))
-        norm['{}'.format(i)] = df_temp['norm_{}.NS'.format(i)]
+    adjusted = pd.read_parquet('Normalized/adjusted_{}.parquet'.format(col_))
+    norm = rebase(adjusted.reindex(columns=['{}.NS'.format(i) for i in tickers[:10]]), base_date)
+    norm.columns = tickers[:10]
 
     norm.to_csv('Normalized/normalized_{}'.format(col_), float_format='%.2f', index = False)
     
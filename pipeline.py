@@ -0,0 +1,354 @@
+"""
+Non-interactive fetch -> transform -> render runs, e.g. a nightly cron job.
+
+    python pipeline.py --market nifty                      #whole universe
+    python pipeline.py --market sp500 --tickers AAPL,MSFT
+    python pipeline.py --market nifty --stages transform,render
+
+Every ticker is a chain of three tasks and the tasks of all tickers make
+one DAG. A task starts as soon as the task it depends on has finished, so
+one ticker can be rendered while others are still downloading. Each
+stage has its own worker pool:
+
+    fetch       stock_get_data.fetch_ticker / write_ticker into the store,
+                under the per-source limits of stock_downloader.py (threads)
+    transform   stock_data_transformations.transform() (threads)
+    render      stock_dashboards.render_dashboards() to a PDF or images,
+                on worker processes with the Agg backend, each reusing
+                its figure templates (see dashboard_batch.py)
+
+Outputs are cached between stages. The store is the fetch cache (a ticker
+already up to date is not requested). Transform results are kept as
+Parquet in pipeline_cache/<market>/<ticker>/ together with a fingerprint
+of the stored parts they were made from; they are only recomputed when
+the fingerprint changes, and a PDF is only rendered again when the
+transform output changed. A failed task skips the tasks depending on it.
+
+The run ends with the time spent in every stage.
+"""
+
+
+#Importing Modules
+#The stage modules are imported when their stage runs (see import_benchmark.py)
+import argparse
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import pandas as pd
+
+import stock_store
+
+
+CACHE_ROOT = 'pipeline_cache'
+STAGES = ['fetch', 'transform', 'render']
+
+#Workers per stage. pyplot keeps global state, so rendering runs on processes.
+STAGE_WORKERS = {'fetch': 8, 'transform': 4, 'render': os.cpu_count() or 1}
+PROCESS_STAGES = {'render'}
+
+MARKETS = {
+        'nifty' : {'chart_input': 'N', 'universe': 'nifty50'},
+        'sp500' : {'chart_input': 'S', 'universe': 'sp500'},
+}
+
+
+#===================================================================
+#   The DAG runner
+#===================================================================
+
+class Task:
+
+    def __init__(self, name, stage, fn, deps=()):
+        self.name = name
+        self.stage = stage
+        self.fn = fn
+        self.deps = list(deps)
+        self.status = 'pending'
+        self.error = None
+        self.seconds = 0.0
+
+    def __repr__(self):
+        return '<Task {} {}>'.format(self.name, self.status)
+
+
+def run_task(fn):
+    #(status, seconds); fn returns 'cached' when its output was up to date.
+    #A module-level function, so it can run on a process pool too.
+    started = time.perf_counter()
+    status = fn() or 'done'
+    return status, time.perf_counter() - started
+
+
+def run_dag(tasks, workers=STAGE_WORKERS, processes=PROCESS_STAGES):
+    """
+    Run tasks once their dependencies are done, on one pool per stage.
+
+    Stages in processes run on a process pool; their task functions must
+    be picklable (module-level functions or functools.partial).
+
+    Returns the tasks with status 'done', 'cached', 'failed' or 'skipped'.
+    """
+    by_name = {task.name: task for task in tasks}
+    waiting = {task.name: set(dep for dep in task.deps if dep in by_name) for task in tasks}
+    dependents = {name: [] for name in by_name}
+    for task in tasks:
+        for dep in waiting[task.name]:
+            dependents[dep].append(task.name)
+
+    #Worker processes are spawned: forking while the fetch threads run is unsafe
+    def make_pool(stage):
+        if stage in processes:
+            return ProcessPoolExecutor(max_workers=workers.get(stage, 1),
+                                       mp_context=multiprocessing.get_context('spawn'))
+        return ThreadPoolExecutor(max_workers=workers.get(stage, 1))
+
+    pools = {stage: make_pool(stage) for stage in set(task.stage for task in tasks)}
+    running = {}
+
+    def submit_ready():
+        for name in [name for name, deps in waiting.items() if not deps]:
+            if name not in waiting:
+                continue
+            del waiting[name]
+            task = by_name[name]
+            try:
+                running[pools[task.stage].submit(run_task, task.fn)] = task
+            except Exception as e:
+                #e.g. a broken process pool
+                fail(task, e)
+
+    def fail(task, error):
+        task.status = 'failed'
+        task.error = str(error) or type(error).__name__
+        skip(task.name)
+
+    def skip(name):
+        for child in dependents[name]:
+            if child in waiting:
+                del waiting[child]
+                by_name[child].status = 'skipped'
+                by_name[child].error = 'after {}'.format(name)
+                skip(child)
+
+    try:
+        submit_ready()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task = running.pop(future)
+                try:
+                    task.status, task.seconds = future.result()
+                except Exception as e:
+                    fail(task, e)
+                    continue
+                for child in dependents[task.name]:
+                    if child in waiting:
+                        waiting[child].discard(task.name)
+            submit_ready()
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+    return tasks
+
+
+def report(tasks, elapsed):
+    lines = ['{:<10} {:>6} {:>6} {:>6} {:>6} {:>7} {:>10} {:>8}'.format(
+        'Stage', 'done', 'cached', 'failed', 'skip', 'tasks', 'task sec', 'max sec')]
+    for stage in STAGES:
+        stage_tasks = [task for task in tasks if task.stage == stage]
+        if not stage_tasks:
+            continue
+        count = {status: sum(1 for task in stage_tasks if task.status == status)
+                 for status in ('done', 'cached', 'failed', 'skipped')}
+        lines.append('{:<10} {:>6} {:>6} {:>6} {:>6} {:>7} {:>10.2f} {:>8.2f}'.format(
+            stage, count['done'], count['cached'], count['failed'], count['skipped'],
+            len(stage_tasks), sum(task.seconds for task in stage_tasks),
+            max(task.seconds for task in stage_tasks)))
+    lines.append('Wall time: {:.2f}s'.format(elapsed))
+
+    for task in tasks:
+        if task.status in ('failed', 'skipped'):
+            lines.append('  {} {}: {}'.format(task.status.upper(), task.name, task.error))
+    return '\n'.join(lines)
+
+
+#===================================================================
+#   Stage outputs
+#===================================================================
+
+def cache_dir(market, ticker, root=CACHE_ROOT):
+    return os.path.join(root, market, ticker)
+
+
+def store_fingerprint(market, ticker):
+    """Changes whenever a part of the ticker is written, appended or compacted."""
+    parts = [(os.path.basename(path), os.path.getsize(path), os.path.getmtime(path))
+             for _, _, path in stock_store.list_parts(market, ticker)]
+    if not parts:
+        raise FileNotFoundError('{}: nothing stored in {}'.format(ticker, market))
+    return hashlib.sha1(json.dumps(parts).encode()).hexdigest()
+
+
+def read_key(directory, name):
+    try:
+        with open(os.path.join(directory, name)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_key(directory, name, value):
+    path = os.path.join(directory, name)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(value, f)
+    os.replace(path + '.tmp', path)
+
+
+def save_frames(frames, directory):
+    os.makedirs(directory, exist_ok=True)
+    for name, df in frames.items():
+        df.to_parquet(os.path.join(directory, '{}.parquet'.format(name)))
+
+
+def load_frames(directory):
+    return {name[:-len('.parquet')]: pd.read_parquet(os.path.join(directory, name))
+            for name in os.listdir(directory) if name.endswith('.parquet')}
+
+
+#===================================================================
+#   The stages
+#===================================================================
+
+def fetch_stage(symbol, source, provider=None):
+    from stock_downloader import NoDataError, fetch_with_retry
+    import stock_get_data
+
+    df, _ = fetch_with_retry(lambda t: stock_get_data.fetch_ticker(t, provider), symbol, source)
+    if df is None or df.empty:
+        #Nothing new for a stored ticker; nothing at all for a new one is a failure
+        if not stock_store.has_ticker(stock_get_data.store_market(), symbol):
+            raise NoDataError('no_data')
+        return 'cached'
+    stock_get_data.write_ticker(symbol, df)
+
+
+def transform_stage(market, ticker, cache_root=CACHE_ROOT):
+    from stock_data_transformations import transform
+
+    directory = cache_dir(market, ticker, cache_root)
+    key = store_fingerprint(market, ticker)
+    if read_key(directory, 'transform.json') == key:
+        return 'cached'
+
+    save_frames(transform(stock_store.read_ticker(market, ticker)), directory)
+    write_key(directory, 'transform.json', key)
+
+
+def render_stage(market, ticker, output_dir, cache_root=CACHE_ROOT, fmt='pdf'):
+    import matplotlib
+    matplotlib.use('Agg')
+    from stock_dashboards import render_dashboards
+
+    directory = cache_dir(market, ticker, cache_root)
+    key = read_key(directory, 'transform.json')
+    if key is None:
+        raise FileNotFoundError('{}: no transform output in {}'.format(ticker, directory))
+
+    rendered = read_key(directory, 'render.json')
+    if (rendered and rendered['key'] == key and rendered.get('format') == fmt
+            and all(os.path.exists(path) for path in rendered['paths'])):
+        return 'cached'
+
+    os.makedirs(output_dir, exist_ok=True)
+    paths = render_dashboards(load_frames(directory), ticker, output_dir, fmt)
+    write_key(directory, 'render.json', {'key': key, 'format': fmt, 'paths': paths})
+
+
+#===================================================================
+#   Building a run
+#===================================================================
+
+def universe_symbols(market, tickers=None):
+    """Store / source symbols of the market (nsepy symbols drop '.NS')."""
+    if not tickers:
+        from ticker_universe import get_tickers
+        tickers = get_tickers(MARKETS[market]['universe'])
+    if market == 'nifty':
+        return [ticker[:-3] if ticker.endswith('.NS') else ticker for ticker in tickers]
+    return list(tickers)
+
+
+def build_tasks(market, symbols, stages=STAGES, output_dir='charts', provider=None,
+                cache_root=CACHE_ROOT, fmt='pdf'):
+    source = provider.source if provider is not None else ('nsepy' if market == 'nifty' else 'yahoo')
+    tasks = []
+
+    for symbol in symbols:
+        previous = []
+        if 'fetch' in stages:
+            tasks.append(Task('fetch:' + symbol, 'fetch',
+                              lambda s=symbol: fetch_stage(s, source, provider)))
+            previous = ['fetch:' + symbol]
+        if 'transform' in stages:
+            tasks.append(Task('transform:' + symbol, 'transform',
+                              lambda s=symbol: transform_stage(market, s, cache_root), previous))
+            previous = ['transform:' + symbol]
+        if 'render' in stages:
+            tasks.append(Task('render:' + symbol, 'render',
+                              functools.partial(render_stage, market, symbol, output_dir,
+                                                cache_root, fmt), previous))
+    return tasks
+
+
+def run_pipeline(market='nifty', tickers=None, stages=STAGES, start=None, end=None,
+                 output_dir='charts', provider=None, workers=None, cache_root=CACHE_ROOT,
+                 fmt='pdf'):
+    import stock_get_data
+
+    #Market and dates for fetch_ticker / write_ticker, without the prompts
+    stock_get_data.configure(MARKETS[market]['chart_input'], start=start, end=end)
+
+    stage_workers = dict(STAGE_WORKERS, **(workers or {}))
+    tasks = build_tasks(market, universe_symbols(market, tickers), stages, output_dir,
+                        provider, cache_root, fmt)
+
+    started = time.perf_counter()
+    run_dag(tasks, stage_workers)
+    elapsed = time.perf_counter() - started
+    print (report(tasks, elapsed))
+    return tasks
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Fetch, transform and render a market without prompts.')
+    parser.add_argument('--market', choices=list(MARKETS), default='nifty')
+    parser.add_argument('--tickers', default='', help='comma separated (default: the whole universe)')
+    parser.add_argument('--stages', default=','.join(STAGES))
+    parser.add_argument('--start', default=None, help='YYYY-MM-DD for tickers not stored yet')
+    parser.add_argument('--end', default=None, help='YYYY-MM-DD (default: today)')
+    parser.add_argument('--output', default='charts', help='directory for the PDFs / images')
+    parser.add_argument('--format', default='pdf', help='pdf (one file per ticker), png, svg, ...')
+    parser.add_argument('--provider', default=None, help='data_providers.PROVIDERS name')
+    for stage in STAGES:
+        parser.add_argument('--{}-workers'.format(stage), type=int, default=STAGE_WORKERS[stage])
+    args = parser.parse_args()
+
+    provider = None
+    if args.provider:
+        from data_providers import get_provider
+        #The store keeps raw OHLC next to Adj Close
+        kwargs = {'auto_adjust': False} if args.provider == 'yfinance' else {}
+        provider = get_provider(args.provider, **kwargs)
+
+    tasks = run_pipeline(args.market,
+                         [ticker.strip() for ticker in args.tickers.split(',') if ticker.strip()],
+                         [stage.strip() for stage in args.stages.split(',')],
+                         args.start, args.end, args.output, provider,
+                         {stage: getattr(args, '{}_workers'.format(stage)) for stage in STAGES},
+                         fmt=args.format)
+    raise SystemExit(1 if any(task.status == 'failed' for task in tasks) else 0)
@@ -0,0 +1,92 @@
+"""
+Request coalescing ("single flight") for the app's fetch and processing.
+
+One "Update Charts" click fires several callbacks that all ask for the
+same (ticker, start, end). With a cold cache each of them would start its
+own Yahoo download and processing. A SingleFlight runs one call per key at
+a time; callers arriving while it is in flight wait for it and share its
+result (or its exception):
+
+    flight = SingleFlight('processing')
+
+    @flight.wrap
+    def get_processed_data(ticker, start_date, end_date):
+        ...
+
+Coalescing is per process. stats() counts the calls, how many actually
+ran and how many were served by a call already in flight.
+"""
+
+
+#Importing Modules
+import functools
+import threading
+
+
+class _Call:
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executions = 0
+        self.shared = 0
+        self.max_waiters = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.shared += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def wrap(self, fn):
+        """Decorator: coalesce calls of fn with equal arguments."""
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            key = (args, tuple(sorted(kwargs.items())))
+            return self.do(key, fn, *args, **kwargs)
+        return wrapper
+
+    def stats(self):
+        with self._lock:
+            return {'calls': self.calls,
+                    'executions': self.executions,
+                    'shared': self.shared,
+                    'shared_rate': round(self.shared / self.calls, 4) if self.calls else None,
+                    'max_waiters': self.max_waiters,
+                    'in_flight': len(self._calls)}
@@ -5,138 +5,42 @@ This data is used for the charting / dashboarding using stock_dashboards.py
 code.
 
 Sequence of code execution: stock_get_data.py > stock_data_transformations.py > stock_dashboards.py
+(or all three, without prompts, for many tickers: python pipeline.py)
 """
 
 
-#Importing Modules [Not all will be used here]
-from __future__ import with_statement
-import bs4 as bs
-import datetime
-from datetime import date, timedelta
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import matplotlib.gridspec as gridspec
-from matplotlib import style
-import matplotlib.dates as mdates
-import matplotlib.animation as animation
-import mplfinance as mpf
-from mplfinance.original_flavor import candlestick_ohlc
-import nsepy
-from nsepy import get_history
-import numpy as np
-import os
+#Importing Modules
+#matplotlib is only needed for the candlestick data (see make_candle_data)
+import sys
+
 import pandas as pd
-import pandas_datareader.data as pdr
-import pickle
-import requests
-from sklearn import preprocessing
-import yfinance as yf
 
+import stock_store
+from stock_indicators import compute_indicators, DAILY_INDICATORS, WEEKLY_INDICATORS
+from stock_resample import resample_bars, tranformations_for_weekly
+from volume_profile import close_profile
 
 
-#===================================================================
-#Tranformations on the Daily Charts
-#
-sbin['Pivot'] = (sbin['Open'] + sbin['High'] + sbin['Low'] + sbin['Close'] * 2)/5
-sbin['Typical'] = (sbin['VWAP'] * 2 + sbin ['Pivot'])/3
-sbin['Advantage'] = sbin['Typical'] - sbin['Close']
-sbin['M2M'] = (sbin['Advantage'] * sbin['Volume']).cumsum()
-million = 1_000_000
-sbin['Trades_trunc'] = (sbin['Trades'] / million)
-sbin['M2M50ma'] = sbin['M2M'].rolling(window=50, min_periods = 0).mean()
-sbin['%Del50ma'] = sbin['%Deliverble'].rolling(window=50, min_periods = 0).mean()
-sbin['DelVol50ma'] = sbin['Deliverable Volume'].rolling(window=50, min_periods = 0).mean()
-sbin['DelPerTrade'] = (sbin['Deliverable Volume']/sbin['Trades']).round(2)
-sbin['DelPerTrade50ma'] = sbin['DelPerTrade'].rolling(window=50, min_periods = 0).mean()
-sbin['Typical_200ma'] = sbin['Typical'].rolling(window=200, min_periods = 0).mean()
-sbin['Typical_100ma'] = sbin['Typical'].rolling(window=100, min_periods = 0).mean()
-sbin['Typical_55ma'] = sbin['Typical'].rolling(window=55, min_periods = 0).mean()
-sbin['Volume_200ma'] = sbin['Volume'].rolling(window=200, min_periods = 0).mean()
-
-#===================================================================
-#Charting Bolinger Bands
-#
-sbin['20ma'] = sbin['Typical'].rolling(window=20, min_periods =0).mean()
-std_dev = sbin['20ma'].rolling(window=20).std()
-sbin['upper_2_band'] = sbin['20ma'] + 2 * std_dev
-sbin['lower_2_band'] = sbin['20ma'] - 2 * std_dev
-sbin['upper_3_band'] = sbin['20ma'] + 3 * std_dev
-sbin['lower_3_band'] = sbin['20ma'] - 3 * std_dev
 
 #===================================================================
-#Charting VWAP Std Dev Bands
-#
-sbin['VWAP_20ma'] = sbin['VWAP'].rolling(window=20, min_periods =0).mean()
-std_dev_vwap = sbin['VWAP_20ma'].rolling(window=20).std()
-sbin['VWAP_upper_2_band'] = sbin['VWAP_20ma'] + 2 * std_dev_vwap
-sbin['VWAP_lower_2_band'] = sbin['VWAP_20ma'] - 2 * std_dev_vwap
-sbin['VWAP_upper_3_band'] = sbin['VWAP_20ma'] + 3 * std_dev_vwap
-sbin['VWAP_lower_3_band'] = sbin['VWAP_20ma'] - 3 * std_dev_vwap
-
-#===================================================================
-#Charting MACD with SMAs
+#Tranformations on the Daily Charts
 #
-sbin['macd_daily_fast'] = sbin['Typical'].rolling(window=27).mean()
-sbin['macd_daily_slow'] = sbin['Typical'].rolling(window=55).mean()
-sbin['macd_daily_trigger'] = sbin['Typical'].rolling(window=13).mean()
-sbin['macd_daily_macd'] = sbin['macd_daily_fast'] - sbin['macd_daily_slow'] 
-
-#===================================================================#
-#Charting M2M like MACD with SMAs
+#Pivot, Typical, M2M, Bolinger / VWAP bands, MACD with SMAs and Ichimoku
+#are computed by the engine in stock_indicators.py. sbin can hold a single
+#ticker (Date index) or a whole universe stacked by (Ticker, Date).
 #
-sbin['m2m_daily_fast'] = sbin['M2M'].rolling(window=27).mean()
-sbin['m2m_daily_slow'] = sbin['M2M'].rolling(window=55).mean()
-sbin['m2m_daily_trigger'] = sbin['M2M'].rolling(window=13).mean()
-sbin['m2m_daily_macd'] = sbin['m2m_daily_fast'] - sbin['m2m_daily_slow'] 
-
-#===================================================================
-#Ichimoku Shinko - Normal
-#
-#Tenkan Sen
-tenkan_max = sbin['High'].rolling(window = 9, min_periods = 0).max()
-tenkan_min = sbin['Low'].rolling(window = 9, min_periods = 0).min()
-sbin['tenkan_avg'] = (tenkan_max + tenkan_min) / 2
-
-#Kijun Sen
-kijun_max = sbin['High'].rolling(window = 26, min_periods = 0).max()
-kijun_min = sbin['Low'].rolling(window = 26, min_periods = 0).min()
-sbin['kijun_avg'] = (kijun_max + kijun_min) / 2
-
-#Senkou Span A
-#(Kijun + Tenkan) / 2 Shifted ahead by 26 periods
-sbin['senkou_a'] = ((sbin['kijun_avg'] + sbin['tenkan_avg']) / 2).shift(26)
-
-#Senkou Span B
-#52 period High + Low / 2
-senkou_b_max = sbin['High'].rolling(window = 52, min_periods = 0).max()
-senkou_b_min = sbin['Low'].rolling(window = 52, min_periods = 0).min()
-sbin['senkou_b'] = ((senkou_b_max + senkou_b_min) / 2).shift(52)
-
-#Chikou Span
-#Current close shifted -26
-sbin['chikou'] = (sbin['Close']).shift(-26)
+def daily_transformations(sbin):
+    return compute_indicators(sbin, DAILY_INDICATORS)
 
 #===================================================================
 # Making Data for Candlestick Charts
 
-candle_data = list(zip(mdates.date2num(sbin.index.to_pydatetime()),
-                         sbin['Open'], sbin['High'],
-                         sbin['Low'], sbin['Close']))
+def make_candle_data(sbin):
+    import matplotlib.dates as mdates
 
-#===================================================================
-# Making Daily Data for Market and Volume Profile
-
-sbin_daily_volPro = sbin[['Close', 'Volume', 'Deliverable Volume', 'High', 'Low']].copy()
-sbin_daily_volPro.set_index('Close', inplace = True)
-sbin_daily_volPro['delvolchange'] = sbin_daily_volPro['Deliverable Volume'].groupby(['Close']).sum()
-sbin_daily_volPro['sum_vol'] = sbin_daily_volPro[['Volume']].groupby(['Close']).sum()
-sbin_daily_volPro.reset_index(inplace=True)
-sbin_daily_volPro['last_count'] = sbin_daily_volPro['Close'].agg('count')
-sbin_daily_volPro['pct_change'] = sbin_daily_volPro['Close'].pct_change()
-
-#===================================================================
-         
-sbin.reset_index()
+    return list(zip(mdates.date2num(sbin.index.to_pydatetime()),
+                    sbin['Open'], sbin['High'],
+                    sbin['Low'], sbin['Close']))
 
 
 ##===================================================================
@@ -144,146 +48,65 @@ sbin.reset_index()
 ##===================================================================
 
 #Creating DF for the Weekly data
-sbin_weekly = sbin.copy()
-sbin_weekly.reset_index(drop=False, inplace=True)
-
-sbin_weekly['Week_Number'] = sbin_weekly['Date'].dt.week
-sbin_weekly['Year'] = sbin_weekly['Date'].dt.year
-
-#Dict for transformations
-tranformations_for_weekly = {
-                            'Date':'last', 
-                            'Open':'first',
-                            'High':'max',
-                            'Low':'min',
-                            'Close':'last',
-                            'Volume':'sum',
-                            'Trades': 'sum',
-                            'VWAP': 'mean',
-                            '%Deliverble': 'mean',
-                            'Deliverable Volume': "sum"
-                            }
-
-#Applying Transformations on Weekly DF
-sbin_weekly = sbin_weekly.groupby([sbin_weekly['Year'], sbin_weekly['Week_Number']]).agg(tranformations_for_weekly)
-sbin_weekly.sort_values(['Date'], ascending=True, inplace=True)
-
-#Applying further transformation and Creating columns
-sbin_weekly['Pivot'] = (sbin_weekly['Open'] + sbin_weekly['High'] + sbin_weekly['Low'] + sbin_weekly['Close'] * 2)/5
-sbin_weekly['Typical'] = (sbin_weekly['VWAP'] * 2 + sbin_weekly ['Pivot'])/3
-sbin_weekly['Advantage'] = sbin_weekly['Typical'] - sbin_weekly['Close']
-sbin_weekly['M2M'] = (sbin_weekly['Advantage'] * sbin_weekly['Volume']).cumsum()
-sbin_weekly['M2M50ma'] = sbin_weekly['M2M'].rolling(window=50, min_periods = 0).mean()
-sbin_weekly['%Del50ma'] = sbin_weekly['%Deliverble'].rolling(window=50, min_periods = 0).mean()
-sbin_weekly['DelVol50ma'] = sbin_weekly['Deliverable Volume'].rolling(window=50, min_periods = 0).mean()
-sbin_weekly['DelPerTrade'] = (sbin_weekly['Deliverable Volume']/sbin_weekly['Trades']).round(2)
-sbin_weekly['DelPerTrade50ma'] = sbin_weekly['DelPerTrade'].rolling(window=50, min_periods = 0).mean()
-sbin_weekly['Typical_200ma'] = sbin_weekly['Typical'].rolling(window=200).mean()
-sbin_weekly['Typical_100ma'] = sbin_weekly['Typical'].rolling(window=100).mean()
-sbin_weekly['Typical_55ma'] = sbin_weekly['Typical'].rolling(window=55).mean()
-sbin_weekly['Volume_55ma'] = sbin_weekly['Volume'].rolling(window=55).mean()
-
-#===================================================================
-#Charting Bolinger Bands
 #
-sbin_weekly['20ma'] = sbin_weekly['Typical'].rolling(window=20, min_periods =0).mean()
-std_dev_weekly = sbin_weekly['20ma'].rolling(window=20).std()
-sbin_weekly['upper_2_band'] = sbin_weekly['20ma'] + 2 * std_dev_weekly
-sbin_weekly['lower_2_band'] = sbin_weekly['20ma'] - 2 * std_dev_weekly
-sbin_weekly['upper_3_band'] = sbin_weekly['20ma'] + 3 * std_dev_weekly
-sbin_weekly['lower_3_band'] = sbin_weekly['20ma'] - 3 * std_dev_weekly
+#One pass over the daily bars, keyed by ISO year and ISO week
+#(see stock_resample.py for the tranformations_for_weekly spec and for
+#monthly / quarterly bars).
+def weekly_transformations(sbin):
+    sbin_weekly = resample_bars(sbin, 'W', tranformations_for_weekly)
 
-#===================================================================
-#Charting VWAP Std Dev Bands
-#
-sbin_weekly['VWAP_20ma'] = sbin_weekly['VWAP'].rolling(window=20, min_periods =0).mean()
-std_dev_vwap_weekly = sbin_weekly['VWAP_20ma'].rolling(window=20).std()
-sbin_weekly['VWAP_upper_2_band'] = sbin_weekly['VWAP_20ma'] + 2 * std_dev_vwap_weekly
-sbin_weekly['VWAP_lower_2_band'] = sbin_weekly['VWAP_20ma'] - 2 * std_dev_vwap_weekly
-sbin_weekly['VWAP_upper_3_band'] = sbin_weekly['VWAP_20ma'] + 3 * std_dev_vwap_weekly
-sbin_weekly['VWAP_lower_3_band'] = sbin_weekly['VWAP_20ma'] - 3 * std_dev_vwap_weekly
+    #Applying further transformation and Creating columns
+    return compute_indicators(sbin_weekly, WEEKLY_INDICATORS)
 
-#===================================================================
-#Charting MACD with SMAs
-#
-sbin_weekly['macd_daily_fast'] = sbin_weekly['Typical'].rolling(window=14).mean()
-sbin_weekly['macd_daily_slow'] = sbin_weekly['Typical'].rolling(window=28).mean()
-sbin_weekly['macd_daily_trigger'] = sbin_weekly['Typical'].rolling(window=7).mean()
-sbin_weekly['macd_daily_macd'] = sbin_weekly['macd_daily_fast'] - sbin_weekly['macd_daily_slow'] 
 
-#===================================================================#
-#Charting M2M like MACD with SMAs
-#
-sbin_weekly['m2m_daily_fast'] = sbin_weekly['M2M'].rolling(window=14).mean()
-sbin_weekly['m2m_daily_slow'] = sbin_weekly['M2M'].rolling(window=28).mean()
-sbin_weekly['m2m_daily_trigger'] = sbin_weekly['M2M'].rolling(window=7).mean()
-sbin_weekly['m2m_daily_macd'] = sbin_weekly['m2m_daily_fast'] - sbin_weekly['m2m_daily_slow'] 
+#Weekly bars indexed by their last Date, for the candlestick charts
+def weekly_for_candle(sbin_weekly):
+    sbin_weekly_for_candle = sbin_weekly.reset_index(drop = True)
+    return sbin_weekly_for_candle.set_index('Date')
 
 #===================================================================
-#Ichimoku Shinko - Normal
-#
-#Tenkan Sen
-tenkan_max_weekly = sbin_weekly['High'].rolling(window = 9, min_periods = 0).max()
-tenkan_min_weekly = sbin_weekly['Low'].rolling(window = 9, min_periods = 0).min()
-sbin_weekly['tenkan_avg'] = (tenkan_max_weekly + tenkan_min_weekly) / 2
-
-#Kijun Sen
-kijun_max_weekly = sbin_weekly['High'].rolling(window = 26, min_periods = 0).max()
-kijun_min_weekly = sbin_weekly['Low'].rolling(window = 26, min_periods = 0).min()
-sbin_weekly['kijun_avg'] = (kijun_max_weekly + kijun_min_weekly) / 2
-
-#Senkou Span A
-#(Kijun + Tenkan) / 2 Shifted ahead by 26 periods
-sbin_weekly['senkou_a'] = ((sbin_weekly['kijun_avg'] + sbin_weekly['tenkan_avg']) / 2).shift(26)
+#Pivot Points [Not used yet, in the charts]
 
-#Senkou Span B
-#52 period High + Low / 2
-senkou_b_max_weekly = sbin_weekly['High'].rolling(window = 52, min_periods = 0).max()
-senkou_b_min_weekly = sbin_weekly['Low'].rolling(window = 52, min_periods = 0).min()
-sbin_weekly['senkou_b'] = ((senkou_b_max_weekly + senkou_b_min_weekly) / 2).shift(52)
+def weekly_pivot_points(sbin_weekly):
+    pivot_points =  pd.DataFrame(columns=['PP','R1','R2','R3','S1','S2','S3'], index=['Weekly','Monthly'], dtype=float)
+    
+    high, low, close = sbin_weekly['High'].iloc[-1], sbin_weekly['Low'].iloc[-1], sbin_weekly['Close'].iloc[-1]
+    pp = (high + low + close) / 3
+    
+    pivot_points.loc['Weekly', 'PP'] = pp
+    pivot_points.loc['Weekly', 'R1'] = pp * 2 - low
+    pivot_points.loc['Weekly', 'R2'] = pp + high - low
+    pivot_points.loc['Weekly', 'R3'] = high + (2 * (pp - low))
+    pivot_points.loc['Weekly', 'S1'] = (2* pp) - high
+    pivot_points.loc['Weekly', 'S2'] = pp - high + low
+    pivot_points.loc['Weekly', 'S3'] = low - 2*(high - pp)
+    return pivot_points
 
-#Chikou Span
-#Current close shifted -26
-sbin_weekly['chikou'] = (sbin_weekly['Close']).shift(-26)
 
 #===================================================================
-# 
-#Making Data for Candlestick Charts
-# Weekly CandleStick Chart
+#All the frames used by stock_dashboards.py
 #
-
-sbin_weekly_for_candle = sbin_weekly.copy()
-sbin_weekly_for_candle.head(2)
-
-sbin_weekly_for_candle.reset_index(drop = True, inplace = True)
-sbin_weekly_for_candle.set_index('Date', inplace = True)
-sbin_weekly_for_candle.head(2)
-
-sbin_weekly_candle_data = list(zip(mdates.date2num(sbin_weekly_for_candle.index.to_pydatetime()),
-                         sbin_weekly_for_candle['Open'], sbin_weekly_for_candle['High'],
-                         sbin_weekly_for_candle['Low'], sbin_weekly_for_candle['Close']))
-
-#===================================================================
-# Making Weekly Data for Market and Volume Profile
-
-sbin_weekly_volPro = sbin_weekly[['Close', 'Volume', 'Deliverable Volume', 'High', 'Low']].copy()
-sbin_weekly_volPro.set_index('Close', inplace = True)
-sbin_weekly_volPro['delvolchange'] = sbin_weekly_volPro['Deliverable Volume'].groupby(['Close']).sum()
-sbin_weekly_volPro['sum_vol'] = sbin_weekly_volPro[['Volume']].groupby(['Close']).sum()
-sbin_weekly_volPro.reset_index(inplace=True)
-sbin_weekly_volPro['last_count'] = sbin_weekly_volPro['Close'].agg('count')
-sbin_weekly_volPro['pct_change'] = sbin_weekly_volPro['Close'].pct_change()
-
-#===================================================================
-#Pivot Points [Not used yet, in the charts]
-
-pivot_points =  pd.DataFrame(columns=['PP','R1','R2','R3','S1','S2','S3'], index=['Weekly','Monthly'])
-
-pivot_points['PP']['Weekly'] = (sbin_weekly['High'][-1] + sbin_weekly['Low'][-1] + sbin_weekly['Close'][-1]) / 3
-pivot_points['R1']['Weekly'] = pivot_points['PP']['Weekly'] * 2 - sbin_weekly['Low'][-1]
-pivot_points['R2']['Weekly'] = pivot_points['PP']['Weekly'] + sbin_weekly['High'][-1] - sbin_weekly['Low'][-1]
-pivot_points['R3']['Weekly'] = sbin_weekly['High'][-1] + (2 * (pivot_points['PP']['Weekly'] - sbin_weekly['Low'][-1]))
-pivot_points['S1']['Weekly'] = (2* pivot_points['PP']['Weekly']) - sbin_weekly['High'][-1]
-pivot_points['S2']['Weekly'] = pivot_points['PP']['Weekly'] - sbin_weekly['High'][-1] + sbin_weekly['Low'][-1]
-pivot_points['S3']['Weekly'] = sbin_weekly['Low'][-1] - 2*(sbin_weekly['High'][-1] - pivot_points['PP']['Weekly'])
-
+#The daily and weekly Market and Volume Profiles come from
+#volume_profile.close_profile(). Candlestick data is left to the
+#dashboards (make_candle_data), so this step does not need matplotlib.
+def transform(sbin):
+    sbin = daily_transformations(sbin)
+    sbin_weekly = weekly_transformations(sbin)
+    
+    return {'sbin': sbin,
+            'sbin_daily_volPro': close_profile(sbin),
+            'sbin_weekly': sbin_weekly,
+            'sbin_weekly_volPro': close_profile(sbin_weekly),
+            'pivot_points': weekly_pivot_points(sbin_weekly)}
+
+
+
+if __name__ == '__main__':
+    
+    #python stock_data_transformations.py [TICKER] [MARKET]
+    ticker = sys.argv[1] if len(sys.argv) > 1 else 'SBIN'
+    market = sys.argv[2] if len(sys.argv) > 2 else 'nifty'
+    
+    globals().update(transform(stock_store.read_ticker(market, ticker)))
+    candle_data = make_candle_data(sbin)
+    sbin_weekly_candle_data = make_candle_data(weekly_for_candle(sbin_weekly))
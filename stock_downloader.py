@@ -0,0 +1,326 @@
+"""
+Concurrent downloader for the ticker lists used in stock_get_data.py.
+
+Tickers are fanned out over a bounded thread pool. Every data source
+('nsepy', 'yahoo', ...) has its own concurrency limit, failed fetches are
+retried with exponential backoff, and a summary of the tickers that
+succeeded or failed is returned at the end.
+
+FakeProvider serves synthetic bars with a configurable latency, so the
+download path can be benchmarked offline:
+
+    python stock_downloader.py --tickers 500 --workers 16 --latency 0.2
+"""
+
+
+#Importing Modules
+import argparse
+import random
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+
+#===================================================================
+#   Concurrency limits per source
+#===================================================================
+
+SOURCE_LIMITS = {
+        'nsepy' : 4,
+        'yahoo' : 8,
+        'fake' : 32,
+}
+DEFAULT_SOURCE_LIMIT = 4
+
+_source_semaphores = {}
+_source_lock = threading.Lock()
+
+
+def get_source_semaphore(source):
+    """Shared semaphore capping the in-flight requests for one source."""
+    with _source_lock:
+        if source not in _source_semaphores:
+            limit = SOURCE_LIMITS.get(source, DEFAULT_SOURCE_LIMIT)
+            _source_semaphores[source] = threading.BoundedSemaphore(limit)
+        return _source_semaphores[source]
+
+
+def set_source_limit(source, limit):
+    with _source_lock:
+        SOURCE_LIMITS[source] = limit
+        _source_semaphores[source] = threading.BoundedSemaphore(limit)
+
+
+#===================================================================
+#   Retry with backoff
+#===================================================================
+
+class NoDataError(Exception):
+    pass
+
+
+def fetch_with_retry(fetch, ticker, source, retries=3, backoff=1.0, max_backoff=30.0):
+    """
+    Call fetch(ticker) under the source limit, retrying on errors.
+
+    The wait doubles after every failed attempt (plus a little jitter) and
+    is spent outside the semaphore, so a failing ticker does not hold a
+    slot that other tickers could use. Returns (result, attempts).
+    """
+    semaphore = get_source_semaphore(source)
+    attempt = 0
+
+    while True:
+        attempt += 1
+        try:
+            with semaphore:
+                result = fetch(ticker)
+            return result, attempt
+
+        except NoDataError:
+            raise
+
+        except Exception:
+            if attempt > retries:
+                raise
+            delay = min(max_backoff, backoff * 2 ** (attempt - 1))
+            time.sleep(delay + random.uniform(0, delay * 0.1))
+
+
+#===================================================================
+#   Download summary
+#===================================================================
+
+class DownloadSummary:
+
+    def __init__(self, source):
+        self.source = source
+        self.succeeded = []
+        self.failed = {}
+        self.attempts = {}
+        self.frames = {}
+        self.elapsed = 0.0
+        self.requests = None
+        self.batch_size = None
+
+    def __repr__(self):
+        return '<DownloadSummary {}: {} ok, {} failed, {:.2f}s>'.format(
+            self.source, len(self.succeeded), len(self.failed), self.elapsed)
+
+    def report(self):
+        total = len(self.succeeded) + len(self.failed)
+        retried = sum(1 for n in self.attempts.values() if n > 1)
+        rate = total / self.elapsed if self.elapsed else 0.0
+
+        lines = ['Source: {}'.format(self.source),
+                 'Tickers: {} ({} succeeded, {} failed, {} retried)'.format(
+                     total, len(self.succeeded), len(self.failed), retried),
+                 'Wall time: {:.2f}s ({:.1f} tickers/s)'.format(self.elapsed, rate)]
+        if self.requests is not None:
+            lines.append('Requests: {} (batch size {})'.format(self.requests, self.batch_size))
+
+        for ticker, error in sorted(self.failed.items()):
+            lines.append('  FAILED {}: {}'.format(ticker, error))
+
+        return '\n'.join(lines)
+
+
+#===================================================================
+#   The concurrent download
+#===================================================================
+
+def download_tickers(tickers, fetch, source='yahoo', max_workers=8,
+                     retries=3, backoff=1.0, on_result=None):
+    """
+    Fetch every ticker with fetch(ticker) on a bounded thread pool.
+
+    on_result(ticker, df) is called from the calling thread as downloads
+    complete, so results can be written to disk without any locking. If it
+    is not given, the frames are kept on summary.frames instead.
+    """
+    summary = DownloadSummary(source)
+    started = time.perf_counter()
+
+    def _fetch(ticker):
+        df = fetch(ticker)
+        if df is not None and len(df) == 0:
+            raise NoDataError('no_data')
+        return df
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(fetch_with_retry, _fetch, ticker, source, retries, backoff): ticker
+                   for ticker in tickers}
+
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                df, attempts = future.result()
+            except NoDataError:
+                summary.failed[ticker] = 'no_data'
+                summary.attempts[ticker] = 1
+                continue
+            except Exception as e:
+                summary.failed[ticker] = str(e) or type(e).__name__
+                summary.attempts[ticker] = retries + 1
+                continue
+
+            summary.attempts[ticker] = attempts
+            try:
+                if on_result is not None:
+                    on_result(ticker, df)
+                else:
+                    summary.frames[ticker] = df
+            except Exception as e:
+                summary.failed[ticker] = 'write: {}'.format(e)
+            else:
+                summary.succeeded.append(ticker)
+
+    summary.elapsed = time.perf_counter() - started
+    return summary
+
+
+#===================================================================
+#   Bulk (multi-ticker) requests
+#===================================================================
+
+def batches(tickers, batch_size):
+    tickers = list(tickers)
+    return [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+
+
+def download_batches(tickers, fetch_batch, source='yahoo', batch_size=100, max_workers=2,
+                     retries=3, backoff=1.0, on_batch=None):
+    """
+    Fetch tickers in groups with fetch_batch(list_of_tickers) -> {ticker: df}.
+
+    Every batch is one request, retried as a whole. on_batch(frames) is
+    called on the calling thread with the frames of one batch, so they can
+    be written together; without it the frames are kept on summary.frames.
+    Tickers missing from a batch's result count as no_data. The summary
+    also has the number of requests made and the batch size.
+    """
+    groups = batches(tickers, batch_size)
+    summary = DownloadSummary(source)
+
+    def store(key, frames):
+        #Counted as succeeded only once the batch has been written
+        group = groups[int(key)]
+        try:
+            if on_batch is not None:
+                on_batch(frames)
+            else:
+                summary.frames.update(frames)
+        except Exception as e:
+            for ticker in group:
+                summary.failed[ticker] = 'write: {}'.format(e)
+            return
+        for ticker in group:
+            if ticker in frames:
+                summary.succeeded.append(ticker)
+            else:
+                summary.failed[ticker] = 'no_data'
+
+    batch_summary = download_tickers([str(i) for i in range(len(groups))],
+                                     lambda key: fetch_batch(groups[int(key)]),
+                                     source=source, max_workers=max_workers,
+                                     retries=retries, backoff=backoff, on_result=store)
+
+    for key, error in batch_summary.failed.items():
+        for ticker in groups[int(key)]:
+            if ticker not in summary.succeeded:
+                summary.failed.setdefault(ticker, error if error == 'no_data' else 'batch: {}'.format(error))
+    for key, attempts in batch_summary.attempts.items():
+        summary.attempts.update(dict.fromkeys(groups[int(key)], attempts))
+
+    summary.elapsed = batch_summary.elapsed
+    summary.batch_size = batch_size
+    summary.requests = sum(batch_summary.attempts.values())
+    return summary
+
+
+#===================================================================
+#   Local fake provider for offline runs
+#===================================================================
+
+NSEPY_COLUMNS = ['Symbol', 'Series', 'Prev Close', 'Open', 'High', 'Low', 'Last', 'Close',
+                 'VWAP', 'Volume', 'Turnover', 'Trades', 'Deliverable Volume', '%Deliverble']
+
+YAHOO_COLUMNS = ['High', 'Low', 'Open', 'Close', 'Volume', 'Adj Close']
+
+
+class FakeProvider:
+    """
+    Serves deterministic random-walk bars in the nsepy or Yahoo layout.
+
+    latency is the simulated round trip in seconds, failure_rate the chance
+    that a call raises (to exercise the retry path).
+    """
+
+    def __init__(self, name='fake', flavour='nsepy', latency=0.2, failure_rate=0.0, seed=None):
+        self.name = name
+        self.flavour = flavour
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get_history(self, ticker, start, end):
+        with self._lock:
+            self.calls += 1
+            fail = self._random.random() < self.failure_rate
+
+        time.sleep(self.latency)
+        if fail:
+            raise IOError('{}: simulated failure for {}'.format(self.name, ticker))
+
+        dates = pd.bdate_range(pd.Timestamp(start), pd.Timestamp(end), name='Date')
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(dates))))
+        open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+        high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, len(dates)))
+        low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, len(dates)))
+        volume = rng.integers(100_000, 5_000_000, len(dates))
+
+        if self.flavour == 'yahoo':
+            return pd.DataFrame({'High': high, 'Low': low, 'Open': open_, 'Close': close,
+                                 'Volume': volume, 'Adj Close': close},
+                                index=dates, columns=YAHOO_COLUMNS)
+
+        trades = (volume / rng.uniform(50, 150, len(dates))).astype(np.int64)
+        deliverable = (volume * rng.uniform(0.2, 0.7, len(dates))).astype(np.int64)
+        vwap = (high + low + close) / 3
+
+        return pd.DataFrame({'Symbol': ticker, 'Series': 'EQ',
+                             'Prev Close': np.r_[close[:1], close[:-1]],
+                             'Open': open_, 'High': high, 'Low': low, 'Last': close, 'Close': close,
+                             'VWAP': vwap, 'Volume': volume, 'Turnover': vwap * volume,
+                             'Trades': trades, 'Deliverable Volume': deliverable,
+                             '%Deliverble': deliverable / volume},
+                            index=dates, columns=NSEPY_COLUMNS)
+
+
+def benchmark(n_tickers=500, max_workers=16, latency=0.2, failure_rate=0.0, days=300):
+    provider = FakeProvider(latency=latency, failure_rate=failure_rate, seed=0)
+    end = pd.Timestamp.today().normalize()
+    start = end - pd.Timedelta(days=days)
+    tickers = ['FAKE{:04d}'.format(i) for i in range(n_tickers)]
+
+    set_source_limit(provider.name, max_workers)
+    return download_tickers(tickers, lambda t: provider.get_history(t, start, end),
+                            source=provider.name, max_workers=max_workers, backoff=0.05)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the downloader against FakeProvider.')
+    parser.add_argument('--tickers', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--latency', type=float, default=0.2)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(benchmark(args.tickers, args.workers, args.latency, args.failure_rate).report())
@@ -6,256 +6,262 @@ This code creates, gets and/or updates the data
 based on the tickers scraped from Wikipedia.
 
 Sequence of code execution: stock_get_data.py > stock_data_transformations.py > stock_dashboards.py
+(or all three, without prompts, for many tickers: python pipeline.py)
 """
 
 
 #Importing Modules
-from __future__ import with_statement
-import bs4 as bs
+#The data source and scraping libraries are slow to import, so they are
+#imported by the functions that use them (see import_benchmark.py).
 import datetime
-from datetime import date, timedelta
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import matplotlib.gridspec as gridspec
-from matplotlib import style
-import matplotlib.dates as mdates
-import matplotlib.animation as animation
-import mplfinance as mpf
-from mplfinance.original_flavor import candlestick_ohlc
-import nsepy
-from nsepy import get_history
-import numpy as np
+from datetime import timedelta
 import os
-import pandas as pd
-import pandas_datareader.data as pdr
-import pickle
-import requests
-from sklearn import preprocessing
-import yfinance as yf
+
+import stock_store
+from data_providers import as_provider, get_provider, normalize_frame
+from stock_downloader import download_batches, download_tickers
+from ticker_universe import get_tickers
 
 
 #Getting and Setting the inputs
+#
+#configure() sets the market, ticker and dates used by the functions
+#below. Run as a script, the values are asked for (see the end of this
+#file); pipeline.py passes them in without any prompt.
 
-chart_input = str(input("""
-Market to chart:
+NIFTY_INPUTS = ['NSE', 'nse', 'Nifty', 'NIFTY', 'nifty', 'N', 'n']
+SP500_INPUTS = ['sp500', 'SP500', 'S&P500', 'S', 's']
 
-For Nifty India (enter Nifty or N):
-For S&P500 USA (enter SP500 or S):
-""") or "N")
 
-ticker_input = str(input("""Ticker to chart:
-"""))
+def parse_day(day):
+    #'YYYY,MM,DD' (or 'YYYY-MM-DD') as typed, or a date
+    if isinstance(day, str):
+        return datetime.date(*(int(part) for part in day.replace('-', ',').split(',')))
+    return day
 
-start_day = str(input("""Start Date (YYYY,MM,DD). Don't prefix zero. (default = 400 sessions)
-"""))
 
+def configure(market="N", ticker="", start=None, end=None):
+    
+    global chart_input, ticker_input, start_day, end_day, market_to_chart, tickers
+    
+    chart_input = market
+    ticker_input = ticker
+    end_day = parse_day(end) if end else datetime.date.today()
+    start_day = parse_day(start) if start else end_day - timedelta(300)
+    
+    #Setting some default values and validating inputs
+    if chart_input in NIFTY_INPUTS:
+        market_to_chart = "Nifty"
+        if not ticker_input:
+            ticker_input = "SBIN"
+            tickers = ticker_input
+    else:
+        if chart_input in SP500_INPUTS:
+            market_to_chart = "SP500"
+            if not ticker_input:
+                ticker_input = "MSFT"
+                tickers = ticker_input
 
-end_day = datetime.date.today()
 
-if not start_day:
-    start_day = end_day - timedelta(300)
+configure()
 
 
 
 #Start the Calcualtions:
     
-#Function to get the SP500 data
+#The ticker lists come from the local registry (ticker_universe.py); the
+#Wikipedia pages are only fetched again when the stored lists are stale.
 def save_sp500_tickers():
+    return get_tickers('sp500', refresh=True)
+
+def save_nifty_tickers():
+    return get_tickers('nifty50', refresh=True)
+
+
+#Get Start Day calculation for updates
+#
+#Resume point for an incremental update: the day after the last stored
+#bar, read from the store's part names without loading any data.
+def get_start_day(ticker, market='nifty'):
+    _, last_date = stock_store.date_range(market, ticker)
     
-    resp = requests.get('http://en.wikipedia.org/wiki/List_of_S%26P_500_companies')
-    soup = bs.BeautifulSoup(resp.text, 'lxml')
-    table = soup.find('table', {'class': 'wikitable sortable'})
+    if last_date is None:
+        return start_day
     
-    tickers = []
+    if last_date.date() != datetime.date.today():
+        print (f'Trying to update the {ticker} chart')
+    return (last_date + timedelta(1)).date()
+
+
+
+#
+#Fetching and writing a single ticker
+#
+#The fetch step only talks to the data source, the write step only touches
+#the store, so the fetches can run concurrently and the writes stay serial.
+#Bars are kept in the columnar store (stock_store.py) under the market
+#'nifty' or 'sp500' instead of one CSV per ticker.
+
+def store_market():
+    if market_to_chart == "Nifty":
+        return 'nifty'
+    return 'sp500'
+
+
+def source_history(ticker, start, end, provider=None):
+    #Bars in the common schema of data_providers.py, whatever the source
+    if provider is None:
+        provider = get_provider('nsepy' if market_to_chart == "Nifty" else 'datareader')
+    return normalize_frame(provider.get_history(ticker, start, end))
+
+
+def fetch_ticker(ticker, provider=None):
     
-    for row in table.findAll('tr')[1:]:
-        ticker = row.findAll('td')[0].text.replace('.', '-')
-        ticker = ticker[:-1]
-        tickers.append(ticker)
-    with open("sp500tickers.pickle", "wb") as f:
-        pickle.dump(tickers, f)
-        
-    return tickers
-
-save_sp500_tickers()
-
-#Function to get the Nifty data
-def save_nifty_tickers():
+    if not stock_store.has_ticker(store_market(), ticker):
+        return source_history(ticker, start_day, end_day, provider)
     
-    resp = requests.get('http://en.wikipedia.org/wiki/NIFTY_50')
-    soup = bs.BeautifulSoup(resp.text, 'lxml')
-    table = soup.find('table', {'class': 'wikitable sortable'})
+    print('{}: Stored. Checking for updates.'.format(ticker))
+    resume_day = get_start_day(ticker, store_market())
     
-    tickers = []
+    if resume_day > end_day:
+        return None
     
-    for row in table.findAll('tr')[1:]:
-        ticker = row.findAll('td')[1].text.replace('.', '-')
-        ticker = ticker[:-3]+".NS"
-        tickers.append(ticker)
-        
-    with open("niftytickers.pickle", "wb") as f:
-        pickle.dump(tickers, f)
-        
-    return tickers
-
-save_nifty_tickers()
-
-
-#Setting some default values and validating inputs
-if chart_input in ['NSE', 'nse', 'Nifty', 'NIFTY', 'nifty', 'N', 'n']:
-    market_to_chart = "Nifty"
-    if not ticker_input:
-        ticker_input = "SBIN"
-        tickers = ticker_input
-else:
-    if chart_input in ['sp500', 'SP500', 'S&P500', 'S', 's']:
-        market_to_chart = "SP500"
-        if not ticker_input:
-            ticker_input = "MSFT"
-            tickers = ticker_input
+    print (f'{ticker}: Updating chart from {resume_day}.')
+    df = source_history(ticker, resume_day, end_day, provider)
+    if df is None or df.empty:
+        return None
+    return df
 
+
+def write_ticker(ticker, df):
+    
+    if df is not None:
+        if not stock_store.has_ticker(store_market(), ticker):
+            print (f'Creating the {ticker} data')
+            stock_store.write_ticker(df, store_market(), ticker)
             
-            
-#Get Start Day calculation for updates
-def get_start_day(ticker):
-    df_temp = pd.read_csv('stock_dataset_nifty/{}.csv'.format(ticker), parse_dates = True)
+        else:
+            rows = stock_store.append_ticker(df, store_market(), ticker)
+            print (f'{ticker}: Chart updated ({rows} new rows).')
+    
+    print (f'{ticker}: Done.')
+
+
+
+#
+#Bulk mode: many tickers per request
+#
+#yfinance can download a group of symbols in one request. Tickers are
+#sorted by the day they resume from, grouped batch_size at a time, and
+#each combined frame is split per ticker in memory and written to the
+#store as one batch. append_ticker() drops any rows already stored, so a
+#batch can start at the earliest resume day of its tickers.
+
+def bulk_update(symbols, provider, batch_size=100, max_workers=2):
+    
+    provider = as_provider(provider)
+    resume_days = {ticker: get_start_day(ticker, store_market()) for ticker in symbols}
+    pending = sorted((ticker for ticker, day in resume_days.items() if day <= end_day),
+                     key=lambda ticker: resume_days[ticker])
+    
+    def fetch_batch(batch):
+        start = min(resume_days[ticker] for ticker in batch)
+        return provider.get_histories(batch, start, end_day)
+    
+    def write_batch(frames):
+        for ticker, df in frames.items():
+            write_ticker(ticker, df)
     
-    if len(df_temp['Date']) > 0:
-        if df_temp['Date'].iloc[-1] != datetime.date.today():
-            print (f'Trying to update the {ticker} chart')
-            start_day = df_temp['Date'].iloc[-2]
-    return start_day
+    summary = download_batches(pending, fetch_batch, source=provider.source,
+                               batch_size=batch_size, max_workers=max_workers,
+                               on_batch=write_batch)
+    print ('{} tickers already up to date.'.format(len(symbols) - len(pending)))
+    print (summary.report())
+    return summary
 
 
 
 #
 #The main function that calculates and updates
-def get_data_from_yahoo(reload=False):
+#
+#concurrent=True fetches the tickers on a bounded thread pool (see
+#stock_downloader.py). provider is a data_providers provider or any object
+#with a get_history(ticker, start, end) method, e.g. stock_downloader.FakeProvider.
+#bulk=True (S&P 500) fetches batch_size tickers per request with yfinance.
+def get_data_from_yahoo(reload=False, concurrent=False, max_workers=8, provider=None,
+                        bulk=False, batch_size=100):
     
     global start_day, end_day, tickers, chart_input, ticker_input
     
     
     if reload == True:
-        if chart_input in ['NSE', 'nse', 'Nifty', 'NIFTY', 'nifty', 'N', 'n']:
-            save_nifty_tickers()
+        if chart_input in NIFTY_INPUTS:
+            tickers = save_nifty_tickers()
         else:
-            if chart_input in ['sp500', 'SP500', 'S&P500', 'S', 's']:
-                save_sp500_tickers()
+            if chart_input in SP500_INPUTS:
+                tickers = save_sp500_tickers()
             
     else:
         if market_to_chart == "Nifty":
-            
-            if not os.path.exists('stock_dataset_nifty'):
-                os.makedirs('stock_dataset_nifty')
-                
-            with open("niftytickers.pickle", "rb") as f:
-                tickers = pickle.load(f)
+            tickers = get_tickers('nifty50')
                 
         else:
             if market_to_chart == "SP500":
+                tickers = get_tickers('sp500')
     
-                if not os.path.exists('stock_dataset_sp500'):
-                    os.makedirs('stock_dataset_sp500')
     
-                with open("sp500tickers.pickle", "rb") as f:
-                    tickers = pickle.load(f)
-            
-            
-    for ticker in tickers[0:]:
+    if market_to_chart == "Nifty":
+        symbols = [ticker[:-3] for ticker in tickers]
+        source = 'nsepy'
+    else:
+        symbols = list(tickers)
+        source = 'yahoo'
+    
+    #The per-source concurrency limit is shared by every provider of a source
+    if provider is not None:
+        provider = as_provider(provider)
+        source = provider.source
+    
+    #One-off import of the old CSV folder into the store
+    csv_directory = 'stock_dataset_{}'.format(store_market())
+    if not stock_store.list_tickers(store_market()) and os.path.isdir(csv_directory):
+        stock_store.import_csv_directory(csv_directory, store_market())
+    
+    print ("""Updating {}...
+    """.format(market_to_chart))
+    
+    
+    if bulk and market_to_chart != "Nifty":
+        #The store keeps raw OHLC next to Adj Close
+        return bulk_update(symbols, provider or get_provider('yfinance', auto_adjust=False), batch_size)
+    
+    if concurrent:
+        summary = download_tickers(symbols, lambda ticker: fetch_ticker(ticker, provider),
+                                   source=source, max_workers=max_workers,
+                                   on_result=write_ticker)
+        print (summary.report())
+        return summary
+    
+    for ticker in symbols:
         print (ticker)
+        write_ticker(ticker, fetch_ticker(ticker, provider))
 
-        if market_to_chart == "Nifty":
-            
-            ticker = ticker[:-3]
-            
-            print ("""Updating SP500...
-            """)
-            
-            if not os.path.exists('stock_dataset_nifty/{}.csv'.format(ticker)):
-                df = get_history(ticker, start_day, end_day)
-                df.reset_index(inplace=True)
-                df.set_index("Date", inplace=True)
-                print (f'Creating the following {ticker} file')
-                df.to_csv('stock_dataset_nifty/{}.csv'.format(ticker))
-                
-                
-            else:
-                
-                print('{}: File exists. Checking for updates.'.format(ticker))
-                df_temp = pd.read_csv('stock_dataset_nifty/{}.csv'.format(ticker), parse_dates = True)
-                
-                if len(df_temp['Date']) > 0:                              
-                    if df_temp['Date'].iloc[-1] != datetime.date.today(): 
-                        print (f'{ticker}: Updating chart.')
-                
-                        try:
-                            with open('stock_dataset_nifty/{}.csv'.format(ticker),'a') as file:
-                                start_day = end_day - timedelta(400)
-                                            
-                                get_file = get_history(ticker, start_day, end_day)
-                                file.write(get_file.to_string(index=True, header=False))
-                                print (f'{ticker}: Chart updated.')
-                                
-                        except EnvironmentError:
-                            print (f'{ticker}: Error in updating the file.')
-         
-            
-            
-            temp_read = pd.read_csv('stock_dataset_nifty/{}.csv'.format(ticker), parse_dates=True, index_col=0)
-            if temp_read.duplicated(subset = ['VWAP', 'Volume','Trades']).any() == True:
-                print (f'{ticker}: Checking for duplicate entries.')
-                temp_read.drop_duplicates(subset= ['VWAP', 'Volume','Trades', 'Close'], keep='first', inplace = True)
-                temp_read.to_csv('stock_dataset_nifty/{}.csv'.format(ticker))
-            else:
-                pass
-            
-            print (f'{ticker}: Done.')
-            
-            
-            
-        
-        if market_to_chart == "SP500":
-            
-            print ("""Updating SP500...
-                """)
-
-            if not os.path.exists('stock_dataset_sp500/{}.csv'.format(ticker)):
-                df = pdr.get_data_yahoo(ticker, start_day, end_day)
-                df.reset_index(inplace=True)
-                df.set_index("Date", inplace=True)
-                print (f'Creating the {ticker} file')
-                df.to_csv('stock_dataset_sp500/{}.csv'.format(ticker))
-                            
-            else:
-                
-                print('{}: File exists. Checking for updates.'.format(ticker))
 
-                df_temp = pd.read_csv('stock_dataset_sp500/{}.csv'.format(ticker), parse_dates = True)
-                
-                if len(df_temp['Date']) > 0:                              
-                    if df_temp['Date'].iloc[-1] != datetime.date.today(): 
-                        print (f'{ticker}: Updating chart.')
-                
-                        try:
-                            with open('stock_dataset_sp500/{}.csv'.format(ticker),'a') as file:
-                                start_day = end_day - timedelta(400)
-                                get_file = pdr.get_data_yahoo(ticker, start_day, end_day)
-                                file.write(get_file.to_string(index=True, header=False))
-                                print (f'{ticker}: Chart updated.')
-                                
-                        except EnvironmentError:
-                            print (f'{ticker}: Error in updating the file.')
-           
-            
-            temp_read = pd.read_csv('stock_dataset_sp500/{}.csv'.format(ticker), parse_dates=True, index_col=0)
-            if temp_read.duplicated(subset = ['Open','High', 'Low', 'Close']).any() == True:
-                print (f'{ticker}: Checking for duplicate entries.')
-                temp_read.drop_duplicates(subset= ['Open', 'High','Low', 'Close'], keep='first', inplace = True)
-                temp_read.to_csv('stock_dataset_sp500/{}.csv'.format(ticker))
-            else:
-                pass
-            
-            print (f'{ticker}: Done.')
-            
-            
-get_data_from_yahoo()
+
+if __name__ == '__main__':
+    
+    chart_input = str(input("""
+Market to chart:
+
+For Nifty India (enter Nifty or N):
+For S&P500 USA (enter SP500 or S):
+""") or "N")
+
+    ticker_input = str(input("""Ticker to chart:
+"""))
+
+    start_day = str(input("""Start Date (YYYY,MM,DD). Don't prefix zero. (default = 400 sessions)
+"""))
+    
+    configure(chart_input, ticker_input, start_day)
+    get_data_from_yahoo()
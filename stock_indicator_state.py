@@ -0,0 +1,318 @@
+"""
+Streaming (incremental) state for the indicators in stock_indicators.py.
+
+Each ticker keeps the running sums, sums of squares, monotonic max/min
+deques and lag buffers behind its rolling windows, so one new bar updates
+every indicator in O(1) without touching the history:
+
+    states = build_states(stock_store.read_market('nifty'))
+    save_states(states, 'indicator_state/nifty.pickle')
+    ...
+    states = load_states('indicator_state/nifty.pickle')
+    latest = update_states(states, todays_bars)
+
+The values match compute_indicators() for the same bars, except chikou:
+it looks 26 bars ahead, so it is not known for a new bar and is NaN.
+"""
+
+
+#Importing Modules
+import math
+import os
+import pickle
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from stock_indicators import DAILY_INDICATORS, INPUT_COLUMNS, million
+
+
+nan = float('nan')
+
+#Running sums are re-added from the window every so often, to stop
+#floating point drift over long intraday sessions.
+RESYNC_EVERY = 1000
+
+
+#===================================================================
+#   Rolling window building blocks
+#===================================================================
+
+class RollingMean:
+    """rolling(window, min_periods).mean() one value at a time."""
+
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque()
+        self.total = 0.0
+        self.count = 0
+        self.pushes = 0
+
+    def push(self, x):
+        self.values.append(x)
+        if not math.isnan(x):
+            self.total += x
+            self.count += 1
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.total -= old
+                self.count -= 1
+
+        self.pushes += 1
+        if self.pushes % RESYNC_EVERY == 0:
+            self.total = math.fsum(v for v in self.values if not math.isnan(v))
+
+        if self.count == 0 or self.count < self.min_periods:
+            return nan
+        return self.total / self.count
+
+
+class RollingStd:
+    """rolling(window).std() (ddof=1) from a running sum and sum of squares."""
+
+    def __init__(self, window):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.count = 0
+        self.pushes = 0
+
+    def push(self, x):
+        self.values.append(x)
+        if not math.isnan(x):
+            self.total += x
+            self.total_sq += x * x
+            self.count += 1
+
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            if not math.isnan(old):
+                self.total -= old
+                self.total_sq -= old * old
+                self.count -= 1
+
+        self.pushes += 1
+        if self.pushes % RESYNC_EVERY == 0:
+            valid = [v for v in self.values if not math.isnan(v)]
+            self.total = math.fsum(valid)
+            self.total_sq = math.fsum(v * v for v in valid)
+
+        if self.count < self.window:
+            return nan
+        variance = (self.total_sq - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+
+class RollingExtreme:
+    """rolling(window, min_periods=0).max() or .min() with a monotonic deque."""
+
+    def __init__(self, window, largest=True):
+        self.window = window
+        self.largest = largest
+        self.candidates = deque()
+        self.position = -1
+
+    def push(self, x):
+        self.position += 1
+
+        if not math.isnan(x):
+            if self.largest:
+                while self.candidates and self.candidates[-1][1] <= x:
+                    self.candidates.pop()
+            else:
+                while self.candidates and self.candidates[-1][1] >= x:
+                    self.candidates.pop()
+            self.candidates.append((self.position, x))
+
+        while self.candidates and self.candidates[0][0] <= self.position - self.window:
+            self.candidates.popleft()
+
+        return self.candidates[0][1] if self.candidates else nan
+
+
+class Lag:
+    """shift(periods): the value pushed periods bars ago."""
+
+    def __init__(self, periods):
+        self.values = deque([nan] * periods, maxlen=periods)
+
+    def push(self, x):
+        old = self.values[0]
+        self.values.append(x)
+        return old
+
+
+class CumulativeSum:
+    """cumsum(), skipping NaN like pandas does."""
+
+    def __init__(self):
+        self.total = 0.0
+
+    def push(self, x):
+        if math.isnan(x):
+            return nan
+        self.total += x
+        return self.total
+
+
+#===================================================================
+#   Per-ticker indicator state
+#===================================================================
+
+class IndicatorState:
+    """All the rolling state of one ticker, for one parameter set."""
+
+    def __init__(self, params=DAILY_INDICATORS):
+        self.params = params
+        self.last_date = None
+        typical_min = params['typical_ma_min_periods']
+
+        self.m2m = CumulativeSum()
+        self.means = {
+                'M2M50ma' : RollingMean(50, 0),
+                '%Del50ma' : RollingMean(50, 0),
+                'DelVol50ma' : RollingMean(50, 0),
+                'DelPerTrade50ma' : RollingMean(50, 0),
+                'Typical_200ma' : RollingMean(200, typical_min),
+                'Typical_100ma' : RollingMean(100, typical_min),
+                'Typical_55ma' : RollingMean(55, typical_min),
+                '20ma' : RollingMean(20, 0),
+                'VWAP_20ma' : RollingMean(20, 0),
+        }
+        volume_name, volume_window, volume_min = params['volume_ma']
+        self.volume_name = volume_name
+        self.means[volume_name] = RollingMean(volume_window, volume_min)
+
+        fast, slow, trigger = params['macd_windows']
+        for prefix in ('macd', 'm2m'):
+            self.means['{}_daily_fast'.format(prefix)] = RollingMean(fast)
+            self.means['{}_daily_slow'.format(prefix)] = RollingMean(slow)
+            self.means['{}_daily_trigger'.format(prefix)] = RollingMean(trigger)
+
+        self.std_20ma = RollingStd(20)
+        self.std_vwap = RollingStd(20)
+
+        self.extremes = {window: (RollingExtreme(window, True), RollingExtreme(window, False))
+                         for window in (9, 26, 52)}
+        self.senkou_a_lag = Lag(26)
+        self.senkou_b_lag = Lag(52)
+
+    def update(self, bar, date=None):
+        """Feed one bar (mapping of INPUT_COLUMNS) and return its indicators."""
+        b = {name: float(bar[name]) for name in INPUT_COLUMNS}
+        means = self.means
+        out = {}
+
+        out['Pivot'] = (b['Open'] + b['High'] + b['Low'] + b['Close'] * 2) / 5
+        out['Typical'] = (b['VWAP'] * 2 + out['Pivot']) / 3
+        out['Advantage'] = out['Typical'] - b['Close']
+        out['M2M'] = self.m2m.push(out['Advantage'] * b['Volume'])
+        if self.params['trades_trunc']:
+            out['Trades_trunc'] = b['Trades'] / million
+        out['M2M50ma'] = means['M2M50ma'].push(out['M2M'])
+        out['%Del50ma'] = means['%Del50ma'].push(b['%Deliverble'])
+        out['DelVol50ma'] = means['DelVol50ma'].push(b['Deliverable Volume'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['DelPerTrade'] = float(np.round(np.float64(b['Deliverable Volume']) / b['Trades'], 2))
+        out['DelPerTrade50ma'] = means['DelPerTrade50ma'].push(out['DelPerTrade'])
+        for name in ('Typical_200ma', 'Typical_100ma', 'Typical_55ma'):
+            out[name] = means[name].push(out['Typical'])
+        out[self.volume_name] = means[self.volume_name].push(b['Volume'])
+
+        #Bolinger Bands
+        out['20ma'] = means['20ma'].push(out['Typical'])
+        std_dev = self.std_20ma.push(out['20ma'])
+        out['upper_2_band'] = out['20ma'] + 2 * std_dev
+        out['lower_2_band'] = out['20ma'] - 2 * std_dev
+        out['upper_3_band'] = out['20ma'] + 3 * std_dev
+        out['lower_3_band'] = out['20ma'] - 3 * std_dev
+
+        #VWAP Std Dev Bands
+        out['VWAP_20ma'] = means['VWAP_20ma'].push(b['VWAP'])
+        std_dev_vwap = self.std_vwap.push(out['VWAP_20ma'])
+        out['VWAP_upper_2_band'] = out['VWAP_20ma'] + 2 * std_dev_vwap
+        out['VWAP_lower_2_band'] = out['VWAP_20ma'] - 2 * std_dev_vwap
+        out['VWAP_upper_3_band'] = out['VWAP_20ma'] + 3 * std_dev_vwap
+        out['VWAP_lower_3_band'] = out['VWAP_20ma'] - 3 * std_dev_vwap
+
+        #MACD and M2M like MACD with SMAs
+        for prefix, source in (('macd', out['Typical']), ('m2m', out['M2M'])):
+            for part in ('fast', 'slow', 'trigger'):
+                name = '{}_daily_{}'.format(prefix, part)
+                out[name] = means[name].push(source)
+            out['{}_daily_macd'.format(prefix)] = out['{}_daily_fast'.format(prefix)] - out['{}_daily_slow'.format(prefix)]
+
+        #Ichimoku Shinko - Normal
+        highs_lows = {window: (high.push(b['High']), low.push(b['Low']))
+                      for window, (high, low) in self.extremes.items()}
+        out['tenkan_avg'] = sum(highs_lows[9]) / 2
+        out['kijun_avg'] = sum(highs_lows[26]) / 2
+        out['senkou_a'] = self.senkou_a_lag.push((out['kijun_avg'] + out['tenkan_avg']) / 2)
+        out['senkou_b'] = self.senkou_b_lag.push(sum(highs_lows[52]) / 2)
+        out['chikou'] = nan
+
+        if date is not None:
+            self.last_date = pd.Timestamp(date)
+        return out
+
+
+#===================================================================
+#   Many tickers, persisted
+#===================================================================
+
+def build_states(df, params=DAILY_INDICATORS):
+    """
+    Warm up one IndicatorState per ticker from its stored history.
+
+    df is a (Ticker, Date) frame such as stock_store.read_market()
+    returns. This replays the history once; afterwards only new bars
+    need to be fed.
+    """
+    states = {}
+    for ticker, bars in df.groupby(level='Ticker', sort=False):
+        state = IndicatorState(params)
+        for date, bar in zip(bars.index.get_level_values('Date'), bars[INPUT_COLUMNS].to_dict('records')):
+            state.update(bar, date)
+        states[ticker] = state
+    return states
+
+
+def update_states(states, bars, params=DAILY_INDICATORS):
+    """
+    Feed new bars to the states and return their indicators.
+
+    bars is a (Ticker, Date) frame. Bars at or before a ticker's last
+    processed date are skipped, so feeding the same bars twice is safe.
+    Returns a (Ticker, Date) frame with one row per bar consumed.
+    """
+    rows = {}
+    for (ticker, date), bar in zip(bars.index, bars[INPUT_COLUMNS].to_dict('records')):
+        state = states.get(ticker)
+        if state is None:
+            state = states[ticker] = IndicatorState(params)
+        if state.last_date is not None and pd.Timestamp(date) <= state.last_date:
+            continue
+        rows[(ticker, date)] = state.update(bar, date)
+
+    if not rows:
+        return pd.DataFrame()
+    return pd.DataFrame.from_dict(rows, orient='index').rename_axis(['Ticker', 'Date'])
+
+
+def save_states(states, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump(states, f)
+    os.replace(path + '.tmp', path)
+
+
+def load_states(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'rb') as f:
+        return pickle.load(f)
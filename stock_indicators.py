@@ -0,0 +1,188 @@
+"""
+Vectorized indicator engine for stock_data_transformations.py.
+
+Computes the Pivot / Typical / M2M columns, the Bollinger and VWAP bands,
+the MACD-style SMAs and Ichimoku for a whole universe at once.
+
+The bars of all tickers are laid out on one 2-D grid (row number within
+the ticker x ticker), so each indicator is a single rolling / shift /
+cumsum over the whole grid instead of one pass per ticker. Rows are
+counted per ticker, so the results are identical to running the original
+script on every ticker separately.
+
+    df = stock_store.read_market('nifty')          #(Ticker, Date) frame
+    df = compute_indicators(df, DAILY_INDICATORS)
+"""
+
+
+#Importing Modules
+import numpy as np
+import pandas as pd
+
+import stock_store
+
+
+#===================================================================
+#   Indicator settings
+#===================================================================
+
+million = 1_000_000
+
+DAILY_INDICATORS = {
+        'typical_ma_min_periods' : 0,
+        'volume_ma' : ('Volume_200ma', 200, 0),
+        'macd_windows' : (27, 55, 13),
+        'trades_trunc' : True,
+}
+
+WEEKLY_INDICATORS = {
+        'typical_ma_min_periods' : None,
+        'volume_ma' : ('Volume_55ma', 55, None),
+        'macd_windows' : (14, 28, 7),
+        'trades_trunc' : False,
+}
+
+INPUT_COLUMNS = ['Open', 'High', 'Low', 'Close', 'VWAP', 'Volume', 'Trades',
+                 '%Deliverble', 'Deliverable Volume']
+
+
+#===================================================================
+#   Grid layout
+#===================================================================
+
+def is_stacked(df):
+    return 'Ticker' in df.index.names
+
+
+def grid_positions(df):
+    """(row, col, shape) placing every bar of df on the ticker grid."""
+    if is_stacked(df):
+        col, _ = pd.factorize(df.index.get_level_values('Ticker'))
+        row = df.groupby(level='Ticker', sort=False).cumcount().to_numpy()
+    else:
+        col = np.zeros(len(df), dtype=np.intp)
+        row = np.arange(len(df))
+
+    shape = (int(row.max()) + 1 if len(row) else 0, int(col.max()) + 1 if len(col) else 0)
+    return row, col, shape
+
+
+def to_grid(values, row, col, shape):
+    grid = np.full(shape, np.nan)
+    grid[row, col] = values
+    return pd.DataFrame(grid)
+
+
+def from_grid(grid, row, col):
+    return grid.to_numpy()[row, col]
+
+
+#===================================================================
+#   Indicators on the grid
+#===================================================================
+
+def indicator_grids(g, params=DAILY_INDICATORS):
+    """
+    All indicators from the input grids g (column name -> grid).
+
+    Every operation below works on a whole grid, i.e. on all tickers at
+    once. Returns a dict of output column -> grid, in the column order of
+    the original script.
+    """
+    out = {}
+    typical_min = params['typical_ma_min_periods']
+
+    out['Pivot'] = (g['Open'] + g['High'] + g['Low'] + g['Close'] * 2) / 5
+    out['Typical'] = (g['VWAP'] * 2 + out['Pivot']) / 3
+    out['Advantage'] = out['Typical'] - g['Close']
+    out['M2M'] = (out['Advantage'] * g['Volume']).cumsum()
+    if params['trades_trunc']:
+        out['Trades_trunc'] = g['Trades'] / million
+    out['M2M50ma'] = out['M2M'].rolling(window=50, min_periods=0).mean()
+    out['%Del50ma'] = g['%Deliverble'].rolling(window=50, min_periods=0).mean()
+    out['DelVol50ma'] = g['Deliverable Volume'].rolling(window=50, min_periods=0).mean()
+    out['DelPerTrade'] = (g['Deliverable Volume'] / g['Trades']).round(2)
+    out['DelPerTrade50ma'] = out['DelPerTrade'].rolling(window=50, min_periods=0).mean()
+    out['Typical_200ma'] = out['Typical'].rolling(window=200, min_periods=typical_min).mean()
+    out['Typical_100ma'] = out['Typical'].rolling(window=100, min_periods=typical_min).mean()
+    out['Typical_55ma'] = out['Typical'].rolling(window=55, min_periods=typical_min).mean()
+
+    volume_name, volume_window, volume_min = params['volume_ma']
+    out[volume_name] = g['Volume'].rolling(window=volume_window, min_periods=volume_min).mean()
+
+    #Bolinger Bands
+    out['20ma'] = out['Typical'].rolling(window=20, min_periods=0).mean()
+    std_dev = out['20ma'].rolling(window=20).std()
+    out['upper_2_band'] = out['20ma'] + 2 * std_dev
+    out['lower_2_band'] = out['20ma'] - 2 * std_dev
+    out['upper_3_band'] = out['20ma'] + 3 * std_dev
+    out['lower_3_band'] = out['20ma'] - 3 * std_dev
+
+    #VWAP Std Dev Bands
+    out['VWAP_20ma'] = g['VWAP'].rolling(window=20, min_periods=0).mean()
+    std_dev_vwap = out['VWAP_20ma'].rolling(window=20).std()
+    out['VWAP_upper_2_band'] = out['VWAP_20ma'] + 2 * std_dev_vwap
+    out['VWAP_lower_2_band'] = out['VWAP_20ma'] - 2 * std_dev_vwap
+    out['VWAP_upper_3_band'] = out['VWAP_20ma'] + 3 * std_dev_vwap
+    out['VWAP_lower_3_band'] = out['VWAP_20ma'] - 3 * std_dev_vwap
+
+    #MACD and M2M like MACD with SMAs
+    fast, slow, trigger = params['macd_windows']
+    for prefix, source in (('macd', out['Typical']), ('m2m', out['M2M'])):
+        out['{}_daily_fast'.format(prefix)] = source.rolling(window=fast).mean()
+        out['{}_daily_slow'.format(prefix)] = source.rolling(window=slow).mean()
+        out['{}_daily_trigger'.format(prefix)] = source.rolling(window=trigger).mean()
+        out['{}_daily_macd'.format(prefix)] = out['{}_daily_fast'.format(prefix)] - out['{}_daily_slow'.format(prefix)]
+
+    #Ichimoku Shinko - Normal
+    tenkan_max = g['High'].rolling(window=9, min_periods=0).max()
+    tenkan_min = g['Low'].rolling(window=9, min_periods=0).min()
+    out['tenkan_avg'] = (tenkan_max + tenkan_min) / 2
+
+    kijun_max = g['High'].rolling(window=26, min_periods=0).max()
+    kijun_min = g['Low'].rolling(window=26, min_periods=0).min()
+    out['kijun_avg'] = (kijun_max + kijun_min) / 2
+
+    out['senkou_a'] = ((out['kijun_avg'] + out['tenkan_avg']) / 2).shift(26)
+
+    senkou_b_max = g['High'].rolling(window=52, min_periods=0).max()
+    senkou_b_min = g['Low'].rolling(window=52, min_periods=0).min()
+    out['senkou_b'] = ((senkou_b_max + senkou_b_min) / 2).shift(52)
+
+    #The grid padding below a ticker's last bar is NaN, so chikou ends in
+    #NaN exactly as it does for a single ticker.
+    out['chikou'] = g['Close'].shift(-26)
+
+    return out
+
+
+#===================================================================
+#   Frames in, frames out
+#===================================================================
+
+def compute_indicators(df, params=DAILY_INDICATORS):
+    """
+    Add the indicator columns to df.
+
+    df is either a single ticker, taken in row order, or many tickers
+    stacked with a (Ticker, Date) index such as stock_store.read_market()
+    returns.
+    """
+    if is_stacked(df):
+        df = df.sort_index()
+    row, col, shape = grid_positions(df)
+
+    grids = {name: to_grid(df[name].to_numpy(dtype=float), row, col, shape)
+             for name in INPUT_COLUMNS}
+
+    out = indicator_grids(grids, params)
+    columns = {name: from_grid(grid, row, col) for name, grid in out.items()}
+
+    return df.assign(**columns)
+
+
+def compute_market(market, tickers=None, start=None, end=None, params=DAILY_INDICATORS):
+    """Indicators for every stored ticker of a market, in one pass."""
+    df = stock_store.read_market(market, tickers=tickers, columns=INPUT_COLUMNS,
+                                 start=start, end=end)
+    return compute_indicators(df, params)
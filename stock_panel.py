@@ -0,0 +1,203 @@
+"""
+Wide / long panels of one column across many tickers.
+
+normalization_nifty_data.compile_data() used to grow its panel with one
+outer join per ticker, re-aligning the whole frame every time. Here the
+columns are read on a thread pool and combined by a single concat on the
+union of their dates:
+
+    panel = build_panel(tickers, store_reader('nifty_yahoo', 'Adj Close'))
+    write_panel(panel, 'nifty_data/nifty_adjusted.parquet')
+
+The wide panel has one column per ticker, indexed by Date. to_long()
+turns it into a (Date, Ticker) frame with a single value column.
+
+Normalized ("base 100") charts are not stored: the adjusted prices are,
+and rebase() normalizes a whole panel to any base date when it is read.
+
+    norm = rebase(panel, '2020-03-23')
+
+adjusted_fetcher() / adjusted_writer() keep the stored adjusted prices
+current with stock_downloader.download_tickers, rewriting a ticker's
+history when the source re-adjusted it.
+"""
+
+
+#Importing Modules
+import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+#===================================================================
+#   Readers
+#===================================================================
+
+def csv_reader(directory, column='Adj Close', date_column='Date', filename='{}.csv'):
+    """read(ticker) for <directory>/<filename>, returning one column named ticker."""
+    def read(ticker):
+        name = column.format(ticker)
+        df = pd.read_csv(os.path.join(directory, filename.format(ticker)),
+                         usecols=[date_column, name], index_col=date_column, parse_dates=True)
+        return df[name].rename(ticker)
+    return read
+
+
+def store_reader(market, column='Adj Close'):
+    """read(ticker) from the Parquet store, returning one column."""
+    import stock_store
+
+    def read(ticker):
+        return stock_store.read_ticker(market, ticker, columns=[column])[column].rename(ticker)
+    return read
+
+
+#===================================================================
+#   Building and writing
+#===================================================================
+
+def build_panel(tickers, read, max_workers=8, verbose=True):
+    """
+    Wide panel of read(ticker) for every ticker, one concat.
+
+    Tickers whose file is missing or unreadable are skipped (and
+    reported). Columns are kept in ticker order; the index is sorted.
+    """
+    def safe_read(ticker):
+        try:
+            return read(ticker)
+        except (OSError, ValueError, KeyError) as e:
+            if verbose:
+                print ('{}: Skipped ({}).'.format(ticker, e))
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        columns = [s for s in pool.map(safe_read, tickers) if s is not None]
+
+    if not columns:
+        return pd.DataFrame()
+
+    panel = pd.concat(columns, axis=1, join='outer', sort=True)
+    panel.index.name = 'Date'
+    if verbose:
+        print ('Panel: {} tickers x {} dates'.format(panel.shape[1], panel.shape[0]))
+    return panel
+
+
+def to_long(panel, value_name='value'):
+    """Wide panel -> (Date, Ticker) frame, dropping the missing values."""
+    long = panel.melt(var_name='Ticker', value_name=value_name, ignore_index=False)
+    return long.dropna().set_index('Ticker', append=True).sort_index()
+
+
+def write_panel(panel, path, long=False):
+    """Write the panel to Parquet (wide by default, or long)."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    frame = to_long(panel) if long else panel
+    frame.to_parquet(path)
+    return path
+
+
+#===================================================================
+#   Normalizing on read
+#===================================================================
+
+def rebase(panel, base_date=None, base=100):
+    """
+    Every column as base * value / its first value on or after base_date.
+
+    Rows before base_date are dropped. A column without any value from
+    base_date on is all NaN. The whole panel is scaled by one broadcast
+    divide, so any base date can be picked at read time.
+    """
+    if base_date is not None:
+        panel = panel.loc[pd.Timestamp(base_date):]
+    values = panel.to_numpy(dtype=float)
+    if values.size == 0:
+        return panel.astype(float)
+
+    valid = ~np.isnan(values)
+    first = valid.argmax(axis=0)
+    base_values = np.where(valid.any(axis=0), values[first, np.arange(values.shape[1])], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rebased = values * (base / base_values)
+    return pd.DataFrame(rebased, index=panel.index, columns=panel.columns)
+
+
+#===================================================================
+#   Keeping the adjusted prices current
+#===================================================================
+
+#Yahoo re-adjusts the whole history after every dividend or split, so new
+#Adj Close rows can only be appended if the adjustment basis is unchanged.
+#The last stored bar is fetched again as an overlap: if its Adj Close no
+#longer matches the stored one, the whole history is fetched and rewritten.
+ADJUSTMENT_TOLERANCE = 1e-6
+
+
+def basis_changed(market, ticker, fresh, last_date, root=None):
+    """True if the fresh overlap bar no longer matches the stored Adj Close."""
+    import stock_store
+
+    root = root or stock_store.STORE_ROOT
+    stored = stock_store.read_ticker(market, ticker, columns=['Adj Close'], start=last_date, root=root)
+    if last_date not in fresh.index or stored.empty:
+        return True
+    old, new = stored['Adj Close'].iloc[-1], fresh.loc[last_date, 'Adj Close']
+    return abs(new - old) > ADJUSTMENT_TOLERANCE * abs(old)
+
+
+def adjusted_fetcher(provider, market, start, end, root=None):
+    """
+    fetch(ticker) for stock_downloader.download_tickers.
+
+    A new ticker gets its whole history. A stored one gets the days from
+    its last bar on, or its whole history again (attrs['rewrite']) if the
+    adjustment basis changed. None means there is nothing to write: the
+    store is up to date, or the source has no bars after the last one.
+    """
+    import stock_store
+
+    root = root or stock_store.STORE_ROOT
+
+    def fetch(ticker):
+        _, last_date = stock_store.date_range(market, ticker, root)
+        if last_date is None:
+            return provider.get_history(ticker, start, end)
+        if last_date.date() >= datetime.date.today():
+            print('{}: Stored data is up to date.'.format(ticker))
+            return None
+
+        #Only the days from the last stored one (the overlap) are downloaded
+        df = provider.get_history(ticker, last_date, end)
+        if df.empty:
+            #No new bars yet (e.g. before the close): 0 rows, not a failure
+            print('{}: No new bars.'.format(ticker))
+            return None
+        if basis_changed(market, ticker, df, last_date, root):
+            print('{}: Adjusted prices changed, fetching the whole history.'.format(ticker))
+            df = provider.get_history(ticker, start, end)
+            df.attrs['rewrite'] = True
+        return df
+    return fetch
+
+
+def adjusted_writer(market, root=None):
+    """on_result(ticker, df) writing what adjusted_fetcher returned."""
+    import stock_store
+
+    root = root or stock_store.STORE_ROOT
+
+    def write(ticker, df):
+        if df is None:
+            return
+        if df.attrs.get('rewrite'):
+            stock_store.write_ticker(df, market, ticker, root)
+            print (f'{ticker}: history rewritten ({len(df)} rows).')
+        else:
+            rows = stock_store.append_ticker(df, market, ticker, root)
+            print (f'{ticker}: {rows} new rows.')
+    return write
@@ -0,0 +1,169 @@
+"""
+Resampling of daily bars into weekly, monthly or quarterly bars.
+
+The aggregation of every column is driven by a spec such as
+tranformations_for_weekly (used by stock_data_transformations.py). Weeks
+are keyed by ISO year and ISO week, so the days around New Year land in
+the right week instead of being split or merged across years.
+
+Many tickers, stacked by (Ticker, Date), are resampled in one groupby.
+update_last_period() refreshes only the current, still open period when
+new daily bars arrive.
+"""
+
+
+#Importing Modules
+import numpy as np
+import pandas as pd
+
+
+#===================================================================
+#   Aggregation spec
+#===================================================================
+
+#Dict for transformations
+tranformations_for_weekly = {
+                            'Date':'last',
+                            'Open':'first',
+                            'High':'max',
+                            'Low':'min',
+                            'Close':'last',
+                            'Volume':'sum',
+                            'Trades': 'sum',
+                            'VWAP': 'mean',
+                            '%Deliverble': 'mean',
+                            'Deliverable Volume': "sum"
+                            }
+
+#Period key columns for every frequency
+PERIOD_KEYS = {
+        'W' : ['Year', 'Week_Number'],
+        'M' : ['Year', 'Month'],
+        'Q' : ['Year', 'Quarter'],
+}
+
+
+#===================================================================
+#   Period keys
+#===================================================================
+
+def period_keys(dates, freq='W'):
+    """Year and period number for every date (ISO calendar for weeks)."""
+    dates = pd.DatetimeIndex(dates)
+    year_name, period_name = PERIOD_KEYS[freq]
+
+    if freq == 'W':
+        iso = dates.isocalendar()
+        return {year_name: iso['year'].to_numpy(), period_name: iso['week'].to_numpy()}
+    if freq == 'M':
+        return {year_name: dates.year.to_numpy(), period_name: dates.month.to_numpy()}
+    return {year_name: dates.year.to_numpy(), period_name: dates.quarter.to_numpy()}
+
+
+def period_start(date, freq='W'):
+    """First calendar day of the period containing date."""
+    date = pd.Timestamp(date).normalize()
+    if freq == 'W':
+        return date - pd.Timedelta(days=date.weekday())
+    if freq == 'M':
+        return date.replace(day=1)
+    return date.replace(day=1, month=3 * (date.quarter - 1) + 1)
+
+
+#===================================================================
+#   Resampling
+#===================================================================
+
+def resample_bars(df, freq='W', spec=tranformations_for_weekly):
+    """
+    Daily bars -> weekly ('W'), monthly ('M') or quarterly ('Q') bars.
+
+    df is one ticker indexed by Date, or many tickers indexed by
+    (Ticker, Date). The result is indexed by (Year, period) - with Ticker
+    in front for a stacked frame - and sorted in time order. Columns of
+    the spec that df does not have are skipped.
+    """
+    stacked = 'Ticker' in df.index.names
+    dates = df.index.get_level_values('Date')
+
+    keys = period_keys(dates, freq)
+    if stacked:
+        keys = dict(Ticker=df.index.get_level_values('Ticker').to_numpy(), **keys)
+
+    columns = {col: how for col, how in spec.items() if col == 'Date' or col in df.columns}
+    flat = df.reset_index(level='Ticker', drop=True) if stacked else df
+    flat = flat.reset_index()[[col for col in columns]]
+
+    grouper = [pd.Series(values, name=name) for name, values in keys.items()]
+    return flat.groupby(grouper, sort=True).agg(columns)
+
+
+def starts_with_open_period(stored, bars, spec=tranformations_for_weekly):
+    """
+    True if bars (one ticker's daily bars, Date indexed) start with the
+    first bar of the stored open period.
+
+    There is no trading calendar here, so it is read from the stored row:
+    the first bar must have the row's Open and the bars up to the row's
+    Date must add up to its Volume.
+    """
+    if spec.get('Open') != 'first' or spec.get('Volume') != 'sum':
+        return False
+    if not {'Open', 'Volume'} <= set(bars.columns):
+        return False
+    bars = bars[bars.index <= stored['Date']]
+    if bars.empty:
+        return False
+    return bool(np.isclose(bars['Open'].iloc[0], stored['Open'])
+                and np.isclose(bars['Volume'].sum(), stored['Volume']))
+
+
+def update_last_period(resampled, daily, freq='W', spec=tranformations_for_weekly):
+    """
+    Refresh the still open period(s) of resampled from new daily bars.
+
+    Only the daily bars from the first calendar day of the last stored
+    period onwards are aggregated again; the closed periods are left as
+    they are. daily can be the full daily frame or a recent tail. A tail
+    that starts after that day (weekend, holiday) must start with the
+    open period's first stored bar (starts_with_open_period); a tail
+    starting partway through the open period would replace it by a
+    partial aggregate, so it raises ValueError.
+    """
+    if resampled.empty:
+        return resample_bars(daily, freq, spec)
+
+    stacked = 'Ticker' in resampled.index.names
+    dates = daily.index.get_level_values('Date')
+    if stacked:
+        open_rows = {ticker: rows.iloc[-1] for ticker, rows in resampled.groupby(level='Ticker', sort=False)}
+        starts = pd.Series({ticker: period_start(row['Date'], freq) for ticker, row in open_rows.items()})
+        first = pd.Series(dates, index=daily.index.get_level_values('Ticker')).groupby(level=0).min()
+        late = {}
+        for ticker, start in starts.items():
+            if ticker in first.index and first[ticker] > start:
+                bars = daily.xs(ticker, level='Ticker')
+                if not starts_with_open_period(open_rows[ticker], bars, spec):
+                    late[ticker] = start
+        #Every ticker from the start of its own open period (new tickers whole)
+        cut = pd.DatetimeIndex(daily.index.get_level_values('Ticker').map(starts))
+        keep = cut.isna() | (dates >= cut)
+    else:
+        since = period_start(resampled['Date'].max(), freq)
+        keep = dates >= since
+        late = {}
+        if len(dates) and dates.min() > since and not starts_with_open_period(resampled.iloc[-1], daily, spec):
+            late = {'daily': since}
+
+    if late:
+        raise ValueError('daily bars start partway through the open period ({}); '
+                         'pass the bars from its first day on'.format(
+                             ', '.join('{} {}'.format(name, start.date()) for name, start in late.items())))
+
+    tail = daily[keep]
+    if tail.empty:
+        return resampled
+
+    fresh = resample_bars(tail, freq, spec)
+    kept = resampled[~resampled.index.isin(fresh.index)]
+    return pd.concat([kept, fresh]).sort_index()
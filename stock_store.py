@@ -0,0 +1,315 @@
+"""
+Columnar on-disk store for the daily bars.
+
+Replaces the one-CSV-per-ticker folders (stock_dataset_nifty/,
+stock_dataset_sp500/, nifty_data/, Data/) with typed Parquet files,
+partitioned by market and ticker:
+
+    stock_store/<market>/<ticker>/part-<first date>-<last date>.parquet
+
+The date span of every part is in its file name, so a read for a date
+range only opens the parts that overlap it, and only the requested
+columns are decoded. Nothing is parsed from text after the one-off
+import of the old CSV folders:
+
+    python stock_store.py import
+
+Daily updates are appended as new parts (append_ticker) without touching
+the stored history; once a ticker has more than COMPACT_PARTS parts they
+are merged back into one (compact_ticker). A part may have columns the
+older ones lack (e.g. Adj Close after an import of an old CSV); reads
+fill them with NaN for the older rows.
+"""
+
+
+#Importing Modules
+import argparse
+import glob
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+#===================================================================
+#   Settings
+#===================================================================
+
+STORE_ROOT = 'stock_store'
+
+#Old CSV folders and the market they are imported into
+CSV_DIRECTORIES = {
+        'stock_dataset_nifty' : 'nifty',
+        'stock_dataset_sp500' : 'sp500',
+        'nifty_data' : 'nifty_yahoo',
+        'Data' : 'nse_normalized',
+}
+
+DATE_FORMAT = '%Y%m%d'
+
+#append_ticker compacts a ticker once it has more parts than this
+COMPACT_PARTS = 20
+
+
+#===================================================================
+#   Paths and partitions
+#===================================================================
+
+def ticker_dir(market, ticker, root=STORE_ROOT):
+    return os.path.join(root, market, ticker)
+
+
+def part_name(df):
+    return 'part-{}-{}.parquet'.format(df.index.min().strftime(DATE_FORMAT),
+                                       df.index.max().strftime(DATE_FORMAT))
+
+
+def list_parts(market, ticker, root=STORE_ROOT):
+    """Parts of one ticker as (first, last, path), oldest first."""
+    parts = []
+    for path in glob.glob(os.path.join(ticker_dir(market, ticker, root), 'part-*.parquet')):
+        _, first, last = os.path.basename(path)[:-len('.parquet')].split('-')
+        parts.append((pd.Timestamp(first), pd.Timestamp(last), path))
+    return sorted(parts)
+
+
+def list_tickers(market, root=STORE_ROOT):
+    market_dir = os.path.join(root, market)
+    if not os.path.isdir(market_dir):
+        return []
+    return sorted(t for t in os.listdir(market_dir) if list_parts(market, t, root))
+
+
+def has_ticker(market, ticker, root=STORE_ROOT):
+    return bool(list_parts(market, ticker, root))
+
+
+def date_range(market, ticker, root=STORE_ROOT):
+    """(first, last) stored date, read from the file names only."""
+    parts = list_parts(market, ticker, root)
+    if not parts:
+        return None, None
+    return parts[0][0], max(last for _, last, _ in parts)
+
+
+#===================================================================
+#   Typing
+#===================================================================
+
+def typed_frame(df):
+    """
+    Date index, sorted and unique, with numeric columns as numbers.
+
+    Columns that are numbers stored as text (e.g. from an old CSV) are
+    converted; genuine text columns such as Symbol and Series are kept.
+    """
+    df = df.copy()
+    if df.index.name != 'Date' and 'Date' in df.columns:
+        df.set_index('Date', inplace=True)
+
+    df.index = pd.to_datetime(df.index)
+    df.index.name = 'Date'
+    df = df[~df.index.duplicated(keep='last')].sort_index()
+
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            converted = pd.to_numeric(df[col], errors='coerce')
+            if converted.notna().sum() == df[col].notna().sum():
+                df[col] = converted
+
+    return df
+
+
+#===================================================================
+#   Writing
+#===================================================================
+
+def write_ticker(df, market, ticker, root=STORE_ROOT):
+    """Replace everything stored for a ticker with df."""
+    df = typed_frame(df)
+    path = ticker_dir(market, ticker, root)
+    os.makedirs(path, exist_ok=True)
+
+    old_parts = list_parts(market, ticker, root)
+    new_name = None
+    if not df.empty:
+        new_name = part_name(df)
+        tmp_path = os.path.join(path, new_name + '.tmp')
+        df.to_parquet(tmp_path)
+        os.replace(tmp_path, os.path.join(path, new_name))
+
+    for _, _, old_path in old_parts:
+        if os.path.basename(old_path) != new_name:
+            os.remove(old_path)
+
+
+def part_columns(path):
+    return [name for name in pq.read_schema(path).names if name != 'Date']
+
+
+def stored_dtypes(market, ticker, root=STORE_ROOT):
+    """Column dtypes over all parts (the newest part wins), from the Parquet footers only."""
+    parts = list_parts(market, ticker, root)
+    if not parts:
+        return None
+    dtypes = {}
+    for _, _, path in parts:
+        dtypes.update(pq.read_schema(path).empty_table().to_pandas().dtypes.items())
+    return pd.Series(dtypes, dtype=object)
+
+
+def append_ticker(df, market, ticker, root=STORE_ROOT, compact_parts=COMPACT_PARTS):
+    """
+    Append the rows of df that are newer than the stored history.
+
+    The new rows go into a part file of their own, with the stored
+    columns plus any new ones; the columns already stored are cast to
+    their stored types. The cost depends only on the number of new rows:
+    the existing history is not read or rewritten, except when the ticker
+    has more than compact_parts parts and is compacted. Returns the
+    number of rows appended.
+    """
+    _, last_date = date_range(market, ticker, root)
+    if last_date is None:
+        write_ticker(df, market, ticker, root)
+        return len(df)
+
+    df = typed_frame(df)
+    df = df[df.index > last_date]
+    if df.empty:
+        return 0
+
+    dtypes = stored_dtypes(market, ticker, root)
+    new_columns = [col for col in df.columns if col not in dtypes.index]
+    df = df.reindex(columns=list(dtypes.index) + new_columns)
+    for col, dtype in dtypes.items():
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass
+
+    path = ticker_dir(market, ticker, root)
+    tmp_path = os.path.join(path, part_name(df) + '.tmp')
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, os.path.join(path, part_name(df)))
+
+    if compact_parts and len(list_parts(market, ticker, root)) > compact_parts:
+        compact_ticker(market, ticker, root)
+    return len(df)
+
+
+def compact_ticker(market, ticker, root=STORE_ROOT):
+    """Merge the appended parts of a ticker back into a single part."""
+    if len(list_parts(market, ticker, root)) > 1:
+        write_ticker(read_ticker(market, ticker, root=root), market, ticker, root)
+
+
+#===================================================================
+#   Reading
+#===================================================================
+
+def read_ticker(market, ticker, columns=None, start=None, end=None, root=STORE_ROOT):
+    """
+    Read one ticker, decoding only the given columns and date range.
+
+    Parts outside [start, end] are skipped by file name; inside a part the
+    date filter is pushed down to the Parquet reader.
+    """
+    start = pd.Timestamp(start) if start is not None else None
+    end = pd.Timestamp(end) if end is not None else None
+
+    filters = []
+    if start is not None:
+        filters.append(('Date', '>=', start))
+    if end is not None:
+        filters.append(('Date', '<=', end))
+
+    frames = []
+    for first, last, path in list_parts(market, ticker, root):
+        if (start is not None and last < start) or (end is not None and first > end):
+            continue
+        #Older parts may lack columns added later: read what they have
+        available = columns if columns is None else [col for col in columns if col in part_columns(path)]
+        frames.append(pd.read_parquet(path, columns=available, filters=filters or None))
+
+    if not frames:
+        return pd.DataFrame(columns=columns or [], index=pd.DatetimeIndex([], name='Date'))
+
+    df = pd.concat(frames) if len(frames) > 1 else frames[0]
+    if columns is not None:
+        df = df.reindex(columns=columns)
+    return df[~df.index.duplicated(keep='last')].sort_index()
+
+
+def read_market(market, tickers=None, columns=None, start=None, end=None, root=STORE_ROOT):
+    """Several tickers stacked into one frame indexed by (Ticker, Date)."""
+    if tickers is None:
+        tickers = list_tickers(market, root)
+
+    frames = {ticker: read_ticker(market, ticker, columns, start, end, root) for ticker in tickers}
+    frames = {ticker: df for ticker, df in frames.items() if not df.empty}
+    if not frames:
+        return pd.DataFrame(columns=columns or [])
+
+    return pd.concat(frames, names=['Ticker', 'Date'])
+
+
+#===================================================================
+#   One-off import of the CSV folders
+#===================================================================
+
+def import_csv_directory(directory, market, root=STORE_ROOT, overwrite=False):
+    """
+    Import every <ticker>.csv in directory into the store.
+
+    Tickers already in the store are skipped unless overwrite=True, so
+    running it again is cheap. Returns the number of tickers imported.
+    """
+    imported = 0
+    for path in sorted(glob.glob(os.path.join(directory, '*.csv'))):
+        ticker = os.path.basename(path)[:-len('.csv')]
+        if ticker.endswith('_normalized'):
+            ticker = ticker[:-len('_normalized')]
+
+        if has_ticker(market, ticker, root) and not overwrite:
+            continue
+
+        try:
+            df = pd.read_csv(path, index_col=0)
+            df.index = pd.to_datetime(df.index, errors='coerce')
+            df = df[df.index.notna()]
+            df.index.name = 'Date'
+            write_ticker(df, market, ticker, root)
+            imported += 1
+        except (ValueError, KeyError, pd.errors.ParserError) as e:
+            print ('{}: Could not import ({}).'.format(path, e))
+
+    return imported
+
+
+def import_csv_directories(directories=CSV_DIRECTORIES, root=STORE_ROOT, overwrite=False):
+    for directory, market in directories.items():
+        if os.path.isdir(directory):
+            count = import_csv_directory(directory, market, root, overwrite)
+            print ('{} -> {}/{}: {} tickers imported.'.format(directory, root, market, count))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Columnar store for the daily bars.')
+    parser.add_argument('command', choices=['import', 'list', 'compact'])
+    parser.add_argument('--market', default=None)
+    parser.add_argument('--root', default=STORE_ROOT)
+    parser.add_argument('--overwrite', action='store_true')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        import_csv_directories(root=args.root, overwrite=args.overwrite)
+    elif args.command == 'compact':
+        markets = [args.market] if args.market else sorted(os.listdir(args.root))
+        for market in markets:
+            for ticker in list_tickers(market, args.root):
+                compact_ticker(market, ticker, args.root)
+    else:
+        markets = [args.market] if args.market else sorted(os.listdir(args.root))
+        for market in markets:
+            print (market, ':', ', '.join(list_tickers(market, args.root)))
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+#The modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_bars(start='2024-01-01', periods=30, seed=0, freq='B'):
+    """Daily bars in the store layout: Date index, OHLCV and the NSE columns."""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=periods, freq=freq, name='Date')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    open_ = close * (1 + rng.normal(0, 0.005, periods))
+    volume = rng.integers(100_000, 1_000_000, periods).astype(float)
+    return pd.DataFrame({'Open': open_,
+                         'High': np.maximum(open_, close) * 1.01,
+                         'Low': np.minimum(open_, close) * 0.99,
+                         'Close': close,
+                         'VWAP': close,
+                         'Volume': volume,
+                         'Trades': volume / 100,
+                         'Deliverable Volume': volume / 2,
+                         '%Deliverble': np.full(periods, 0.5)}, index=dates)
+
+
+@pytest.fixture
+def bars():
+    return make_bars()
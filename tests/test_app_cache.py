@@ -0,0 +1,180 @@
+import types
+
+import pandas as pd
+import pytest
+
+import app_cache
+from app_cache import HistoryRangeCache, SimpleLRUCache, SQLiteLRUCache
+
+
+class Clock:
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def tick(self, seconds=1.0):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(app_cache, 'time', types.SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture(params=['simple', 'sqlite'])
+def make_cache(request, tmp_path):
+    def make(max_bytes=app_cache.DEFAULT_MAX_BYTES, default_timeout=300):
+        if request.param == 'simple':
+            return SimpleLRUCache(max_bytes=max_bytes, default_timeout=default_timeout)
+        return SQLiteLRUCache(str(tmp_path / 'cache.sqlite'), max_bytes=max_bytes,
+                              default_timeout=default_timeout)
+    return make
+
+
+#===================================================================
+#   LRU backends
+#===================================================================
+
+def test_least_recently_used_entry_is_evicted(make_cache, clock):
+    value = b'x' * 100
+    cache = make_cache(max_bytes=250)
+
+    cache.set('a', value)
+    clock.tick()
+    cache.set('b', value)
+    clock.tick()
+    assert cache.get('a') == value   #a is now more recent than b
+    clock.tick()
+    cache.set('c', value)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == value and cache.get('c') == value
+    assert cache.stats()['evictions'] == 1
+
+
+def test_entry_larger_than_the_cache_is_not_stored(make_cache, clock):
+    cache = make_cache(max_bytes=50)
+    assert cache.set('big', b'x' * 100) is False
+    assert cache.get('big') is None
+
+
+def test_entries_expire_after_their_timeout(make_cache, clock):
+    cache = make_cache(default_timeout=10)
+    cache.set('default', 1)
+    cache.set('short', 2, timeout=5)
+    cache.set('forever', 3, timeout=0)
+
+    clock.tick(6)
+    assert cache.get('short') is None and not cache.has('short')
+    assert cache.get('default') == 1
+
+    clock.tick(10)
+    assert cache.get('default') is None
+    assert cache.get('forever') == 3
+
+
+def test_hits_and_misses_are_counted(make_cache, clock):
+    cache = make_cache()
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('missing')
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+
+#===================================================================
+#   HistoryRangeCache
+#===================================================================
+
+class FakeFetch:
+    """Daily bars for any range [start, end), recording every call."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, ticker, start, end):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        dates = pd.date_range(start, end, freq='D', inclusive='left', name='Date')
+        if dates.empty:
+            return pd.DataFrame(), ticker, 'no_data'
+        df = pd.DataFrame({'close': [float(d.day) for d in dates]}, index=dates)
+        return df, '{} Ltd'.format(ticker), None
+
+
+@pytest.fixture
+def history(clock):
+    fetch = FakeFetch()
+    return HistoryRangeCache(SimpleLRUCache(), fetch, recent_ttl=60), fetch
+
+
+def test_range_inside_the_cached_one_is_a_slice(history):
+    ranges, fetch = history
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+    df, long_name, status = ranges.get('sbin.ns', '2024-01-10', '2024-01-20')
+
+    assert len(fetch.calls) == 1
+    assert status is None and long_name == 'SBIN.NS Ltd'
+    #Half-open: the end date itself is not included
+    assert df.index[0] == pd.Timestamp('2024-01-10')
+    assert df.index[-1] == pd.Timestamp('2024-01-19')
+
+
+def test_only_the_missing_edges_are_fetched_and_merged(history):
+    ranges, fetch = history
+    ranges.get('SBIN.NS', '2024-01-10', '2024-01-20')
+    df, _, _ = ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+
+    assert fetch.calls[1:] == [(pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-10')),
+                               (pd.Timestamp('2024-01-20'), pd.Timestamp('2024-02-01'))]
+    assert len(df) == 31 and df.index.is_unique and df.index.is_monotonic_increasing
+
+
+def test_adjacent_ranges_share_no_bar(history):
+    ranges, fetch = history
+    first, _, _ = ranges.get('SBIN.NS', '2024-01-01', '2024-01-15')
+    second, _, _ = ranges.get('SBIN.NS', '2024-01-15', '2024-01-31')
+    assert first.index.max() < second.index.min()
+    assert ranges.metrics.snapshot()['misses'] == 2
+
+
+def test_newest_bar_is_refetched_once_the_entry_is_old(history, clock):
+    ranges, fetch = history
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+    assert len(fetch.calls) == 1
+
+    clock.tick(61)
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+    assert fetch.calls[-1] == (pd.Timestamp('2024-01-31'), pd.Timestamp('2024-02-01'))
+
+
+def test_watched_tickers_are_served_stale_until_refreshed(clock):
+    fetch = FakeFetch()
+    ranges = HistoryRangeCache(SimpleLRUCache(), fetch, recent_ttl=60,
+                               serve_stale=lambda ticker: ticker == 'SBIN.NS')
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+
+    clock.tick(61)
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+    assert len(fetch.calls) == 1
+
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01', refresh=True)
+    assert len(fetch.calls) == 2
+
+
+def test_errors_are_not_cached(clock):
+    calls = []
+
+    def failing(ticker, start, end):
+        calls.append(ticker)
+        return pd.DataFrame(), ticker, 'error: timeout'
+
+    ranges = HistoryRangeCache(SimpleLRUCache(), failing)
+    assert ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')[2] == 'error: timeout'
+    ranges.get('SBIN.NS', '2024-01-01', '2024-02-01')
+    assert len(calls) == 2
@@ -0,0 +1,68 @@
+import json
+import time
+
+import app_prefetch
+from app_prefetch import load_watchlist, PrefetchScheduler
+from stock_downloader import NoDataError
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError('timed out')
+        time.sleep(0.01)
+
+
+def test_explicit_watchlist():
+    assert load_watchlist('') == []
+    assert load_watchlist(' aapl, MSFT ,,') == ['AAPL', 'MSFT']
+
+
+def test_nifty_watchlist_comes_from_the_notebook(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    notebook = {'cells': [{'cell_type': 'markdown', 'source': ['nse_list = 1']},
+                          {'cell_type': 'code', 'source': ['import x\n', 'def (']},
+                          {'cell_type': 'code', 'source': ["nse_list = ['SBIN.NS',\n", " 'INFY.NS']"]}]}
+    with open(app_prefetch.NOTEBOOK_PATH, 'w') as f:
+        json.dump(notebook, f)
+    assert load_watchlist('nifty50') == ['SBIN.NS', 'INFY.NS']
+
+
+def test_sp500_watchlist_uses_yahoo_symbols(monkeypatch):
+    import ticker_universe
+    monkeypatch.setattr(ticker_universe, 'get_tickers', lambda name: ['BRK.B ', 'AAPL'])
+    assert load_watchlist('sp500') == ['BRK-B', 'AAPL']
+
+
+def test_only_one_scheduler_holds_the_lock(tmp_path):
+    lock_path = str(tmp_path / 'prefetch.lock')
+    warmed = []
+    first = PrefetchScheduler(warmed.append, ['SBIN', 'INFY'], interval=0.05, lock_path=lock_path)
+    second = PrefetchScheduler(warmed.append, ['SBIN', 'INFY'], interval=0.05, lock_path=lock_path)
+    try:
+        first.start()
+        wait_for(lambda: first.cycles >= 2)
+        second.start().start()
+        time.sleep(0.2)
+
+        assert first.leader and not second.leader
+        assert second.cycles == 0
+        assert sorted(set(warmed)) == ['INFY', 'SBIN']
+        assert first.status()['warm'] == 2
+    finally:
+        first.stop()
+        second.stop()
+
+
+def test_failures_are_recorded_per_ticker(tmp_path):
+    def warm(ticker):
+        if ticker == 'BAD':
+            raise NoDataError(ticker)   #not retried
+
+    scheduler = PrefetchScheduler(warm, ['SBIN', 'BAD'], lock_path=str(tmp_path / 'lock'))
+    summary = scheduler.refresh()
+    assert summary.succeeded == ['SBIN']
+    status = scheduler.status()
+    assert status['last_cycle']['failed'] == 1
+    assert status['tickers']['BAD']['error'] == 'no_data' and status['tickers']['SBIN']['error'] is None
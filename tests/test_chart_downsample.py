@@ -0,0 +1,31 @@
+import numpy as np
+
+from chart_downsample import bucket_starts, detail_span, needs_rebucket, window_budget
+
+
+def test_short_history_is_never_rebucketed():
+    assert detail_span(500, 100, 200, max_points=1000) == (0, 500)
+    assert not needs_rebucket(500, None, 100, 200, max_points=1000)
+
+
+def test_detail_span_is_drawn_bar_for_bar():
+    first, last = detail_span(5000, 4700, 4950, max_points=1000)
+    assert (first, last) == (5000 - window_budget(1000), 5000)
+
+    starts = bucket_starts(5000, 1000, first, last)
+    assert len(starts) == 1000
+    assert np.array_equal(starts[(starts >= first) & (starts < last)], np.arange(first, last))
+
+
+def test_rebucket_only_when_the_window_leaves_the_detail_span():
+    detail = detail_span(5000, 2000, 2200, max_points=1000)
+    assert not needs_rebucket(5000, detail, 2050, 2150, max_points=1000)
+    assert not needs_rebucket(5000, detail, detail[0], detail[1], max_points=1000)
+    assert needs_rebucket(5000, detail, detail[0] - 1, 2200, max_points=1000)
+
+
+def test_wide_window_is_rebucketed_on_every_change():
+    detail = detail_span(5000, 0, 5000, max_points=1000)
+    assert detail == (0, 5000)
+    assert not needs_rebucket(5000, detail, 0, 5000, max_points=1000)
+    assert needs_rebucket(5000, detail, 50, 4950, max_points=1000)
@@ -0,0 +1,93 @@
+import os
+
+import pytest
+
+matplotlib = pytest.importorskip('matplotlib')
+pytest.importorskip('mplfinance')
+matplotlib.use('Agg')
+
+import stock_dashboards
+import stock_store
+from conftest import make_bars
+from dashboard_batch import BatchReport, render_batch
+from stock_dashboards import dashboard_figures, dashboard_templates, FigureTemplate
+from stock_data_transformations import transform
+
+
+def artist_counts(figure):
+    return [(len(ax.lines), len(ax.patches), len(ax.collections), len(ax.texts), len(ax.images))
+            for ax in figure.axes]
+
+
+@pytest.fixture
+def templates():
+    yield dashboard_templates()
+    for template in stock_dashboards._templates.values():
+        template.close()
+    stock_dashboards._templates.clear()
+
+
+def test_template_draws_the_next_ticker_without_the_previous_artists(templates):
+    first = transform(make_bars('2022-01-03', periods=300, seed=1))
+    second = transform(make_bars('2022-06-01', periods=200, seed=2))
+
+    reused_first = dashboard_figures(first, templates)
+    reused_second = dashboard_figures(second, templates)
+    assert all(a is b for a, b in zip(reused_first, reused_second))
+
+    fresh = dashboard_figures(second)
+    try:
+        for reused, new in zip(reused_second, fresh):
+            assert len(reused.axes) == len(new.axes)
+            assert artist_counts(reused) == artist_counts(new)
+    finally:
+        for figure in fresh:
+            matplotlib.pyplot.close(figure)
+
+
+def test_template_builds_its_layout_once():
+    calls = []
+
+    def layout():
+        calls.append(1)
+        figure = matplotlib.pyplot.figure()
+        return figure, figure.add_subplot()
+
+    template = FigureTemplate(layout)
+    figure, ax = template.get()
+    ax.plot([1, 2, 3])
+    assert template.get() == (figure, ax)
+    assert calls == [1] and len(ax.lines) == 0
+    template.close()
+
+
+def test_batch_report_counts_figures_and_failures(templates, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for seed, ticker in enumerate(['AAA', 'BBB']):
+        stock_store.write_ticker(make_bars('2022-01-03', periods=300, seed=seed), 'nifty', ticker)
+
+    summary = render_batch(['AAA', 'BBB', 'MISSING'], 'nifty', 'charts', fmt='png', dpi=20,
+                           max_workers=0)
+
+    assert sorted(summary.rendered) == ['AAA', 'BBB']
+    assert summary.figures == 6
+    assert all(os.path.exists(path) for paths in summary.rendered.values() for path in paths)
+    assert list(summary.failed) == ['MISSING']
+    assert 'Tickers: 3 (2 rendered, 1 failed)' in summary.report()
+    assert 'Figures: 6' in summary.report()
+
+
+def test_batch_report_rates():
+    summary = BatchReport(4)
+    summary.rendered = {'AAA': ['a1', 'a2', 'a3'], 'BBB': ['b1', 'b2', 'b3']}
+    summary.seconds = {'AAA': 1.0, 'BBB': 3.0}
+    summary.failed = {'CCC': 'no data'}
+    summary.elapsed = 2.0
+
+    assert summary.report().splitlines() == ['Workers: 4',
+                                             'Tickers: 3 (2 rendered, 1 failed)',
+                                             'Figures: 6',
+                                             'Wall time: 2.00s (3.00 figures/s)',
+                                             'Render time: 4.00s (2.00s per ticker)',
+                                             '  FAILED CCC: no data']
+    assert BatchReport(0).report().splitlines()[0] == 'Workers: in process'
@@ -0,0 +1,64 @@
+import pandas as pd
+import pytest
+
+from conftest import make_bars
+from data_providers import (as_provider, normalize_frame, split_combined, DataProvider,
+                            InvalidTickerError, ReplayProvider, SCHEMA)
+from stock_downloader import FakeProvider
+
+
+def test_fake_provider_is_adapted_with_its_source():
+    provider = as_provider(FakeProvider(latency=0, seed=0))
+    assert isinstance(provider, DataProvider)
+    assert (provider.name, provider.source) == ('fake', 'fake')
+    df = provider.get_history('SBIN', '2024-01-01', '2024-01-10')
+    assert list(df.columns[:len(SCHEMA)]) == SCHEMA and len(df) == 8
+
+    replay = ReplayProvider()
+    assert as_provider(replay) is replay
+    with pytest.raises(TypeError):
+        as_provider(object())
+
+
+def test_legacy_columns_are_renamed_and_the_timezone_dropped():
+    dates = pd.date_range('2024-01-01', periods=3, freq='D', tz='Asia/Kolkata')
+    raw = pd.DataFrame({'date': dates,
+                        'open': [1.0, 2.0, 3.0],
+                        'Adj_Close': ['1.5', '2.5', 'n/a'],
+                        'No. of Trades': [10, 20, 30],
+                        '% Dly Qt to Traded Qty': [0.4, 0.5, 0.6],
+                        'Symbol': ['SBIN'] * 3})
+
+    df = normalize_frame(raw)
+    assert df.index.name == 'Date' and df.index.tz is None
+    assert list(df.index) == list(pd.date_range('2024-01-01', periods=3, freq='D'))
+    assert list(df.columns) == SCHEMA + ['Symbol']
+    assert df['Open'].tolist() == [1.0, 2.0, 3.0]
+    assert df['Adj Close'].iloc[:2].tolist() == [1.5, 2.5] and pd.isna(df['Adj Close'].iloc[2])
+    assert df['Trades'].tolist() == [10.0, 20.0, 30.0]
+    assert df['%Deliverble'].tolist() == [0.4, 0.5, 0.6]
+    assert df['VWAP'].isna().all()
+    assert list(normalize_frame(raw, extra=False).columns) == SCHEMA
+
+
+def test_single_ticker_download_is_split_without_a_ticker_level():
+    bars = make_bars('2024-01-01', periods=5)[['Open', 'High', 'Low', 'Close', 'Volume']]
+    frames = split_combined(bars, ['SBIN.NS'])
+    assert list(frames) == ['SBIN.NS']
+    assert frames['SBIN.NS']['Close'].tolist() == bars['Close'].tolist()
+
+    combined = pd.concat({'AAA': bars, 'BBB': bars * float('nan')}, axis=1)
+    assert list(split_combined(combined, ['AAA', 'BBB', 'CCC'])) == ['AAA']
+
+
+def test_replay_serves_the_recorded_rows_between_the_dates(tmp_path):
+    make_bars('2024-01-01', periods=20).to_parquet(tmp_path / 'SBIN.parquet')
+    provider = ReplayProvider(str(tmp_path))
+
+    df = provider.get_history('SBIN', '2024-01-08', '2024-01-12')
+    assert list(df.index) == list(pd.date_range('2024-01-08', '2024-01-12', freq='B'))
+    assert provider.tickers() == ['SBIN']
+
+    with pytest.raises(InvalidTickerError):
+        provider.get_history('INFY', '2024-01-01', '2024-01-31')
+    assert provider.get_histories(['SBIN', 'INFY'], '2024-01-01', '2024-01-03').keys() == {'SBIN'}
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from figure_helpers import highlight_colors, sign_colors, top_n, up_down_colors
+
+
+def test_up_down_colors_match_the_per_bar_list():
+    #Up, down and unchanged bars; an unchanged bar was drawn red
+    bars = pd.DataFrame({'open': [10.0, 12.0, 11.0, 11.0, 9.5],
+                         'close': [11.0, 11.5, 11.0, 12.0, 9.0]})
+    old = ['green' if bars['close'].iloc[i] > bars['open'].iloc[i] else 'red' for i in range(len(bars))]
+
+    assert list(up_down_colors(bars['open'], bars['close'])) == old
+    assert old == ['green', 'red', 'red', 'green', 'red']
+
+
+def test_sign_colors_match_the_per_value_list():
+    returns = pd.Series([0.05, -0.02, 0.0, np.nan, -0.0])
+    old = ['tab:green' if x else 'tab:red' for x in (returns >= 0)]
+
+    assert list(sign_colors(returns)) == old
+    assert list(sign_colors(returns, 'tab:olive', 'tab:brown')) == [
+        'tab:olive' if x else 'tab:brown' for x in (returns >= 0)]
+
+
+def test_highlight_colors_match_the_top_two_loop():
+    profile = pd.Series([5.0, 40.0, 12.0, 40.5, 7.0])
+    top_indices = np.argsort(profile.values)[-2:]
+    old = ['rgba(150,150,150,0.2)'] * len(profile)
+    for i in top_indices:
+        old[i] = 'orange'
+
+    assert list(highlight_colors(len(profile), top_n(profile, 2), 'rgba(150,150,150,0.2)', 'orange')) == old
@@ -0,0 +1,20 @@
+from import_benchmark import check_failures, missing_dependency
+
+
+def test_missing_optional_package_is_skipped_not_failed():
+    error = "ModuleNotFoundError: No module named 'matplotlib.pyplot'"
+    assert missing_dependency(error) == 'matplotlib'
+    assert check_failures({'stock_dashboards.py': (None, error)}, {}) == []
+
+
+def test_missing_repository_module_is_an_import_error():
+    error = "ModuleNotFoundError: No module named 'stock_store'"
+    assert missing_dependency(error) is None
+    assert check_failures({'pipeline.py': (None, error)}, {}) == ['IMPORT ERROR pipeline.py: ' + error]
+
+
+def test_costs_are_compared_relative_to_the_baseline():
+    baseline = {'stock_store': 4.0, 'stock_panel': 4.0}
+    results = {'stock_store': (6.5, None), 'stock_panel': (7.5, None), 'volume_profile': (3.0, None)}
+    assert check_failures(results, baseline) == ['NO BASELINE volume_profile: 3.00',
+                                                 'REGRESSION stock_panel: 7.50 (baseline 4.00)']
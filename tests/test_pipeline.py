@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+
+import pipeline
+import stock_data_transformations
+import stock_get_data
+import stock_store
+from conftest import make_bars
+from pipeline import Task, run_dag
+
+
+def run_threads(tasks):
+    return run_dag(tasks, workers={'fetch': 4, 'transform': 2, 'render': 2}, processes=set())
+
+
+def test_tasks_run_after_their_dependencies():
+    order = []
+    lock = threading.Lock()
+
+    def step(name):
+        def fn():
+            with lock:
+                order.append(name)
+        return fn
+
+    tasks = []
+    for symbol in ['A', 'B', 'C']:
+        tasks.append(Task('fetch:' + symbol, 'fetch', step('fetch:' + symbol)))
+        tasks.append(Task('transform:' + symbol, 'transform', step('transform:' + symbol),
+                          ['fetch:' + symbol]))
+        tasks.append(Task('render:' + symbol, 'render', step('render:' + symbol),
+                          ['transform:' + symbol]))
+    run_threads(tasks)
+
+    assert all(task.status == 'done' for task in tasks)
+    assert len(order) == 9
+    for symbol in ['A', 'B', 'C']:
+        assert (order.index('fetch:' + symbol) < order.index('transform:' + symbol)
+                < order.index('render:' + symbol))
+
+
+def test_a_failed_task_skips_its_dependents_only():
+    def boom():
+        raise ValueError('bad bars')
+
+    tasks = [Task('fetch:A', 'fetch', boom),
+             Task('transform:A', 'transform', lambda: None, ['fetch:A']),
+             Task('render:A', 'render', lambda: None, ['transform:A']),
+             Task('fetch:B', 'fetch', lambda: 'cached'),
+             Task('transform:B', 'transform', lambda: None, ['fetch:B'])]
+    run_threads(tasks)
+
+    status = {task.name: task.status for task in tasks}
+    assert status == {'fetch:A': 'failed', 'transform:A': 'skipped', 'render:A': 'skipped',
+                      'fetch:B': 'cached', 'transform:B': 'done'}
+    assert tasks[0].error == 'bad bars'
+    assert tasks[1].error == 'after fetch:A' and tasks[2].error == 'after transform:A'
+
+
+def test_transform_is_skipped_until_the_stored_parts_change(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    calls = []
+
+    def transform(df):
+        calls.append(len(df))
+        return {'sbin': df}
+    monkeypatch.setattr(stock_data_transformations, 'transform', transform)
+
+    stock_store.write_ticker(make_bars('2024-01-01', periods=20), 'nifty', 'SBIN')
+    assert pipeline.transform_stage('nifty', 'SBIN') is None
+    assert pipeline.transform_stage('nifty', 'SBIN') == 'cached'
+    assert calls == [20]
+
+    stock_store.append_ticker(make_bars('2024-01-29', periods=5, seed=1), 'nifty', 'SBIN')
+    assert pipeline.transform_stage('nifty', 'SBIN') is None
+    assert calls == [20, 25]
+
+
+@pytest.fixture
+def nifty(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    stock_get_data.configure('N', start='2024-01-01', end='2024-03-01')
+
+
+def test_empty_fetch_fails_for_a_ticker_with_nothing_stored(nifty, monkeypatch):
+    monkeypatch.setattr(stock_get_data, 'source_history', lambda *args: make_bars(periods=0))
+
+    task = Task('fetch:NEW', 'fetch', lambda: pipeline.fetch_stage('NEW', 'fake'))
+    run_threads([task])
+    assert (task.status, task.error) == ('failed', 'no_data')
+
+
+def test_empty_fetch_is_cached_for_a_stored_ticker(nifty, monkeypatch):
+    stock_store.write_ticker(make_bars('2024-01-01', periods=20), stock_get_data.store_market(), 'SBIN')
+    monkeypatch.setattr(stock_get_data, 'source_history', lambda *args: make_bars(periods=0))
+
+    assert pipeline.fetch_stage('SBIN', 'fake') == 'cached'
@@ -0,0 +1,68 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def run_together(flight, fn, callers=4, key='key'):
+    """Start callers calls of fn under one key while the first is still running."""
+    release = threading.Event()
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        leader = pool.submit(flight.do, key, slow)
+        started.wait(5)
+        followers = [pool.submit(flight.do, key, slow) for _ in range(callers - 1)]
+        #Wait until every follower is waiting on the leader's call
+        while flight.stats()['shared'] < callers - 1:
+            time.sleep(0.001)
+        release.set()
+        return [leader] + followers
+
+
+def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight('test')
+    runs = []
+
+    futures = run_together(flight, lambda: runs.append(1) or 'result')
+    assert [f.result() for f in futures] == ['result'] * 4
+    assert len(runs) == 1
+
+    stats = flight.stats()
+    assert (stats['calls'], stats['executions'], stats['shared']) == (4, 1, 3)
+    assert stats['max_waiters'] == 3 and stats['in_flight'] == 0
+
+
+def test_waiters_get_the_leaders_exception():
+    flight = SingleFlight('test')
+
+    def fail():
+        raise ValueError('boom')
+
+    for future in run_together(flight, fail, callers=3):
+        with pytest.raises(ValueError, match='boom'):
+            future.result()
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight('test')
+    runs = []
+
+    @flight.wrap
+    def fetch(ticker, start=None):
+        runs.append((ticker, start))
+        return ticker
+
+    assert fetch('SBIN', start=1) == 'SBIN'
+    assert fetch('SBIN', start=1) == 'SBIN'
+    fetch('INFY', start=1)
+    assert runs == [('SBIN', 1), ('SBIN', 1), ('INFY', 1)]
+    assert flight.stats()['shared'] == 0
@@ -0,0 +1,38 @@
+import pandas as pd
+
+from conftest import make_bars
+from stock_downloader import batches, download_batches
+
+
+def fetch_batch(batch):
+    #'MISSING' is left out of the result, like a bulk download does
+    return {ticker: make_bars(periods=5) for ticker in batch if ticker != 'MISSING'}
+
+
+def test_batches():
+    assert batches(['A', 'B', 'C'], 2) == [['A', 'B'], ['C']]
+
+
+def test_download_batches_counts_requests_and_missing_tickers():
+    written = {}
+    summary = download_batches(['A', 'B', 'MISSING', 'C'], fetch_batch, source='test',
+                               batch_size=2, backoff=0, on_batch=written.update)
+
+    assert sorted(summary.succeeded) == ['A', 'B', 'C']
+    assert summary.failed == {'MISSING': 'no_data'}
+    assert summary.requests == 2
+    assert sorted(written) == ['A', 'B', 'C']
+    assert all(isinstance(df, pd.DataFrame) for df in written.values())
+
+
+def test_failed_batch_write_marks_the_batch_failed():
+    def write_batch(frames):
+        if 'B' in frames:
+            raise IOError('disk full')
+
+    summary = download_batches(['A', 'B', 'C'], fetch_batch, source='test', batch_size=2,
+                               backoff=0, on_batch=write_batch)
+
+    assert summary.succeeded == ['C']
+    assert summary.failed == {'A': 'write: disk full', 'B': 'write: disk full'}
+    assert '1 succeeded, 2 failed' in summary.report()
@@ -0,0 +1,45 @@
+import pytest
+
+import stock_get_data
+import stock_store
+from stock_downloader import FakeProvider
+
+
+TICKERS = ['AAA', 'BBB', 'CCC']
+
+
+@pytest.fixture
+def sp500(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(stock_get_data, 'get_tickers', lambda name, refresh=False: list(TICKERS))
+    stock_get_data.configure('S', start='2024-01-01', end='2024-03-01')
+    yield
+    stock_get_data.configure()
+
+
+def test_bulk_update_with_a_plain_fake_provider(sp500):
+    provider = FakeProvider(flavour='yahoo', latency=0, seed=0)
+    summary = stock_get_data.get_data_from_yahoo(bulk=True, batch_size=2, provider=provider)
+
+    assert sorted(summary.succeeded) == TICKERS and summary.requests == 2
+    assert stock_store.list_tickers('sp500') == TICKERS
+    assert stock_store.date_range('sp500', 'AAA')[1].date().isoformat() == '2024-03-01'
+
+    #Everything is stored up to the end day: nothing left to fetch
+    again = stock_get_data.get_data_from_yahoo(bulk=True, batch_size=2, provider=provider)
+    assert again.succeeded == [] and again.failed == {}
+
+
+def test_bulk_update_reports_a_failed_write(sp500, monkeypatch):
+    write = stock_get_data.write_ticker
+
+    def failing_write(ticker, df):
+        if ticker == 'BBB':
+            raise IOError('disk full')
+        write(ticker, df)
+
+    monkeypatch.setattr(stock_get_data, 'write_ticker', failing_write)
+    summary = stock_get_data.get_data_from_yahoo(bulk=True, batch_size=2,
+                                                 provider=FakeProvider(flavour='yahoo', latency=0))
+    assert summary.succeeded == ['CCC']
+    assert summary.failed == {'AAA': 'write: disk full', 'BBB': 'write: disk full'}
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from conftest import make_bars
+from stock_indicator_state import (build_states, load_states, save_states, update_states,
+                                   IndicatorState, RollingExtreme, RollingMean, RollingStd)
+from stock_indicators import compute_indicators, INPUT_COLUMNS
+
+
+def stacked(frames):
+    return pd.concat(frames, names=['Ticker']).sort_index()
+
+
+def pushed(block, values):
+    return np.array([block.push(x) for x in values])
+
+
+def test_rolling_blocks_match_pandas():
+    values = pd.Series(np.random.default_rng(0).normal(size=60))
+    values[[5, 6, 30]] = np.nan
+
+    np.testing.assert_allclose(pushed(RollingMean(10, 3), values),
+                               values.rolling(10, min_periods=3).mean(), equal_nan=True)
+    np.testing.assert_allclose(pushed(RollingStd(10), values.fillna(0)),
+                               values.fillna(0).rolling(10).std(), equal_nan=True)
+    np.testing.assert_allclose(pushed(RollingExtreme(7, True), values),
+                               values.rolling(7, min_periods=0).max(), equal_nan=True)
+    np.testing.assert_allclose(pushed(RollingExtreme(7, False), values),
+                               values.rolling(7, min_periods=0).min(), equal_nan=True)
+
+
+def test_streamed_values_match_the_batch_indicators():
+    bars = make_bars(periods=120)
+    batch = compute_indicators(bars)
+
+    state = IndicatorState()
+    rows = [state.update(bar, date) for date, bar in zip(bars.index, bars[INPUT_COLUMNS].to_dict('records'))]
+    streamed = pd.DataFrame(rows, index=bars.index)
+
+    columns = [col for col in streamed.columns if col != 'chikou']
+    pd.testing.assert_frame_equal(streamed[columns], batch[columns], check_freq=False,
+                                  check_dtype=False, rtol=1e-9)
+    assert streamed['chikou'].isna().all()
+
+
+def test_update_continues_from_the_warmed_up_state():
+    a, b = make_bars(seed=1, periods=80), make_bars(seed=2, periods=80)
+    history = stacked({'A': a.iloc[:70], 'B': b.iloc[:70]})
+    states = build_states(history)
+
+    new = stacked({'A': a.iloc[70:], 'B': b.iloc[70:]})
+    latest = update_states(states, new)
+    full = compute_indicators(stacked({'A': a, 'B': b}))
+
+    assert latest.index.equals(new.index)
+    np.testing.assert_allclose(latest['Typical_55ma'], full.loc[new.index, 'Typical_55ma'])
+
+
+def test_bars_already_seen_are_skipped(bars):
+    states = build_states(stacked({'A': bars.iloc[:20]}))
+    assert update_states(states, stacked({'A': bars.iloc[:20]})).empty
+
+    latest = update_states(states, stacked({'A': bars.iloc[15:]}))
+    assert len(latest) == 10
+    assert states['A'].last_date == bars.index[-1]
+
+
+def test_states_survive_a_save_and_load(tmp_path, bars):
+    path = str(tmp_path / 'state' / 'nifty.pickle')
+    assert load_states(path) == {}
+
+    save_states(build_states(stacked({'A': bars.iloc[:20]})), path)
+    states = load_states(path)
+    latest = update_states(states, stacked({'A': bars.iloc[20:21]}))
+    assert math.isclose(latest['20ma'].iloc[0],
+                        compute_indicators(bars)['20ma'].iloc[20], rel_tol=1e-9)
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_bars
+from stock_indicators import compute_indicators, DAILY_INDICATORS
+
+
+def old_daily_block(sbin):
+    #The per-ticker block stock_data_transformations.py ran before the grid engine
+    sbin = sbin.copy()
+    sbin['Pivot'] = (sbin['Open'] + sbin['High'] + sbin['Low'] + sbin['Close'] * 2)/5
+    sbin['Typical'] = (sbin['VWAP'] * 2 + sbin ['Pivot'])/3
+    sbin['Advantage'] = sbin['Typical'] - sbin['Close']
+    sbin['M2M'] = (sbin['Advantage'] * sbin['Volume']).cumsum()
+    sbin['Trades_trunc'] = (sbin['Trades'] / 1_000_000)
+    sbin['M2M50ma'] = sbin['M2M'].rolling(window=50, min_periods = 0).mean()
+    sbin['%Del50ma'] = sbin['%Deliverble'].rolling(window=50, min_periods = 0).mean()
+    sbin['DelVol50ma'] = sbin['Deliverable Volume'].rolling(window=50, min_periods = 0).mean()
+    sbin['DelPerTrade'] = (sbin['Deliverable Volume']/sbin['Trades']).round(2)
+    sbin['DelPerTrade50ma'] = sbin['DelPerTrade'].rolling(window=50, min_periods = 0).mean()
+    sbin['Typical_200ma'] = sbin['Typical'].rolling(window=200, min_periods = 0).mean()
+    sbin['Typical_100ma'] = sbin['Typical'].rolling(window=100, min_periods = 0).mean()
+    sbin['Typical_55ma'] = sbin['Typical'].rolling(window=55, min_periods = 0).mean()
+    sbin['Volume_200ma'] = sbin['Volume'].rolling(window=200, min_periods = 0).mean()
+
+    sbin['20ma'] = sbin['Typical'].rolling(window=20, min_periods =0).mean()
+    std_dev = sbin['20ma'].rolling(window=20).std()
+    sbin['upper_2_band'] = sbin['20ma'] + 2 * std_dev
+    sbin['lower_2_band'] = sbin['20ma'] - 2 * std_dev
+    sbin['upper_3_band'] = sbin['20ma'] + 3 * std_dev
+    sbin['lower_3_band'] = sbin['20ma'] - 3 * std_dev
+
+    sbin['VWAP_20ma'] = sbin['VWAP'].rolling(window=20, min_periods =0).mean()
+    std_dev_vwap = sbin['VWAP_20ma'].rolling(window=20).std()
+    sbin['VWAP_upper_2_band'] = sbin['VWAP_20ma'] + 2 * std_dev_vwap
+    sbin['VWAP_lower_2_band'] = sbin['VWAP_20ma'] - 2 * std_dev_vwap
+    sbin['VWAP_upper_3_band'] = sbin['VWAP_20ma'] + 3 * std_dev_vwap
+    sbin['VWAP_lower_3_band'] = sbin['VWAP_20ma'] - 3 * std_dev_vwap
+
+    sbin['macd_daily_fast'] = sbin['Typical'].rolling(window=27).mean()
+    sbin['macd_daily_slow'] = sbin['Typical'].rolling(window=55).mean()
+    sbin['macd_daily_trigger'] = sbin['Typical'].rolling(window=13).mean()
+    sbin['macd_daily_macd'] = sbin['macd_daily_fast'] - sbin['macd_daily_slow']
+
+    sbin['m2m_daily_fast'] = sbin['M2M'].rolling(window=27).mean()
+    sbin['m2m_daily_slow'] = sbin['M2M'].rolling(window=55).mean()
+    sbin['m2m_daily_trigger'] = sbin['M2M'].rolling(window=13).mean()
+    sbin['m2m_daily_macd'] = sbin['m2m_daily_fast'] - sbin['m2m_daily_slow']
+
+    tenkan_max = sbin['High'].rolling(window = 9, min_periods = 0).max()
+    tenkan_min = sbin['Low'].rolling(window = 9, min_periods = 0).min()
+    sbin['tenkan_avg'] = (tenkan_max + tenkan_min) / 2
+    kijun_max = sbin['High'].rolling(window = 26, min_periods = 0).max()
+    kijun_min = sbin['Low'].rolling(window = 26, min_periods = 0).min()
+    sbin['kijun_avg'] = (kijun_max + kijun_min) / 2
+    sbin['senkou_a'] = ((sbin['kijun_avg'] + sbin['tenkan_avg']) / 2).shift(26)
+    senkou_b_max = sbin['High'].rolling(window = 52, min_periods = 0).max()
+    senkou_b_min = sbin['Low'].rolling(window = 52, min_periods = 0).min()
+    sbin['senkou_b'] = ((senkou_b_max + senkou_b_min) / 2).shift(52)
+    sbin['chikou'] = (sbin['Close']).shift(-26)
+    return sbin
+
+
+def test_stacked_grid_matches_the_old_block_per_ticker():
+    #Different lengths and start dates, so the grid is ragged
+    singles = {'AAA': make_bars('2023-01-02', periods=120, seed=1),
+               'BBB': make_bars('2023-03-01', periods=70, seed=2),
+               'CCC': make_bars('2023-05-01', periods=30, seed=3)}
+    stacked = pd.concat(singles, names=['Ticker', 'Date'])
+
+    result = compute_indicators(stacked, DAILY_INDICATORS)
+
+    for ticker, single in singles.items():
+        expected = old_daily_block(single)
+        got = result.xs(ticker, level='Ticker')
+        assert list(got.columns) == list(expected.columns)
+        for column in expected.columns:
+            assert np.allclose(got[column], expected[column], equal_nan=True), (ticker, column)
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+import stock_store
+from conftest import make_bars
+from stock_downloader import download_tickers
+from stock_panel import adjusted_fetcher, adjusted_writer, build_panel, rebase
+
+
+def adjusted(df):
+    df = df.copy()
+    df['Adj Close'] = df['Close']
+    return df
+
+
+class HistoryStub:
+    """get_history over fixed frames, recording every (start, end) asked for."""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def get_history(self, ticker, start, end):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        return self.frames[ticker].loc[pd.Timestamp(start):pd.Timestamp(end)]
+
+
+def test_build_panel_skips_unreadable_tickers_and_sorts_dates():
+    series = {'A': pd.Series([1.0, 2.0], index=pd.to_datetime(['2024-01-03', '2024-01-01'])),
+              'B': pd.Series([5.0], index=pd.to_datetime(['2024-01-02']))}
+
+    def read(ticker):
+        return series[ticker].rename(ticker)
+
+    panel = build_panel(['A', 'MISSING', 'B'], read, verbose=False)
+    assert list(panel.columns) == ['A', 'B']
+    assert list(panel.index) == list(pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']))
+    assert panel.index.name == 'Date'
+    assert panel.loc['2024-01-02', 'B'] == 5.0 and np.isnan(panel.loc['2024-01-02', 'A'])
+
+
+def test_rebase_scales_each_column_from_its_first_value():
+    index = pd.date_range('2024-01-01', periods=4, name='Date')
+    panel = pd.DataFrame({'A': [10.0, 20.0, 40.0, 5.0],
+                          'B': [np.nan, np.nan, 4.0, 8.0],
+                          'C': [1.0, np.nan, np.nan, np.nan]}, index=index)
+
+    norm = rebase(panel, '2024-01-02')
+    assert list(norm.index) == list(index[1:])
+    assert norm['A'].tolist() == [100.0, 200.0, 25.0]
+    assert np.isnan(norm['B'].iloc[0]) and norm['B'].iloc[1:].tolist() == [100.0, 200.0]
+    assert norm['C'].isna().all()
+
+
+def test_up_to_date_ticker_with_no_new_bars_is_not_a_failure(tmp_path):
+    root = str(tmp_path)
+    history = adjusted(make_bars('2024-01-01', periods=20))
+    stock_store.write_ticker(history, 'adj', 'AAA', root)
+
+    #The source has nothing from the last stored bar on
+    provider = HistoryStub({'AAA': history.iloc[:-1]})
+    fetch = adjusted_fetcher(provider, 'adj', history.index[0], history.index[-1] + pd.Timedelta(days=5), root)
+    summary = download_tickers(['AAA'], fetch, source='fake', on_result=adjusted_writer('adj', root))
+
+    assert summary.failed == {}
+    assert len(stock_store.read_ticker('adj', 'AAA', root=root)) == 20
+
+
+def test_new_bars_are_appended_when_the_basis_is_unchanged(tmp_path):
+    root = str(tmp_path)
+    history = adjusted(make_bars('2024-01-01', periods=25))
+    stock_store.write_ticker(history.iloc[:20], 'adj', 'AAA', root)
+
+    provider = HistoryStub({'AAA': history})
+    fetch = adjusted_fetcher(provider, 'adj', history.index[0], history.index[-1], root)
+    download_tickers(['AAA'], fetch, source='fake', on_result=adjusted_writer('adj', root))
+
+    assert provider.calls == [(history.index[19], history.index[-1])]
+    stored = stock_store.read_ticker('adj', 'AAA', root=root)
+    assert len(stored) == 25
+    assert np.allclose(stored['Adj Close'], history['Adj Close'])
+
+
+def test_changed_basis_rewrites_the_whole_history(tmp_path):
+    root = str(tmp_path)
+    history = adjusted(make_bars('2024-01-01', periods=25))
+    stock_store.write_ticker(history.iloc[:20], 'adj', 'AAA', root)
+
+    #A dividend re-adjusted every bar before the new ones
+    readjusted = history.copy()
+    readjusted['Adj Close'] *= 0.98
+    provider = HistoryStub({'AAA': readjusted})
+    fetch = adjusted_fetcher(provider, 'adj', history.index[0], history.index[-1], root)
+    download_tickers(['AAA'], fetch, source='fake', on_result=adjusted_writer('adj', root))
+
+    assert provider.calls == [(history.index[19], history.index[-1]),
+                              (history.index[0], history.index[-1])]
+    stored = stock_store.read_ticker('adj', 'AAA', root=root)
+    assert len(stored) == 25
+    assert np.allclose(stored['Adj Close'], readjusted['Adj Close'])
+    assert len(stock_store.list_parts('adj', 'AAA', root)) == 1
@@ -0,0 +1,120 @@
+import pandas as pd
+import pytest
+
+from conftest import make_bars
+from stock_resample import period_start, resample_bars, update_last_period
+
+
+def stacked(frames):
+    return pd.concat(frames, names=['Ticker']).sort_index()
+
+
+def test_weekly_bars_aggregate_each_iso_week(bars):
+    weekly = resample_bars(bars, 'W')
+    first_week = bars.loc['2024-01-01':'2024-01-05']
+
+    assert len(weekly) == 6
+    row = weekly.iloc[0]
+    assert row['Open'] == first_week['Open'].iloc[0]
+    assert row['High'] == first_week['High'].max()
+    assert row['Low'] == first_week['Low'].min()
+    assert row['Close'] == first_week['Close'].iloc[-1]
+    assert row['Volume'] == first_week['Volume'].sum()
+    assert row['Date'] == first_week.index[-1]
+
+
+def test_weeks_around_new_year_use_the_iso_year():
+    bars = make_bars('2020-12-28', periods=10)
+    weekly = resample_bars(bars, 'W')
+    assert list(weekly.index) == [(2020, 53), (2021, 1)]
+
+
+def test_period_start():
+    assert period_start('2024-01-10', 'W') == pd.Timestamp('2024-01-08')
+    assert period_start('2024-05-17', 'M') == pd.Timestamp('2024-05-01')
+    assert period_start('2024-05-17', 'Q') == pd.Timestamp('2024-04-01')
+
+
+def test_update_matches_a_full_resample(bars):
+    old, new = bars.iloc[:17], bars
+    updated = update_last_period(resample_bars(old, 'W'), new, 'W')
+    pd.testing.assert_frame_equal(updated, resample_bars(new, 'W'))
+
+
+def test_update_with_a_tail_from_the_period_start(bars):
+    #Stored up to Wednesday of week 4; the tail starts on that week's Monday
+    stored = resample_bars(bars.loc[:'2024-01-24'], 'W')
+    tail = bars.loc['2024-01-22':]
+    updated = update_last_period(stored, tail, 'W')
+    pd.testing.assert_frame_equal(updated, resample_bars(bars, 'W'))
+
+
+def test_update_rejects_a_tail_starting_mid_week(bars):
+    stored = resample_bars(bars.loc[:'2024-01-17'], 'W')
+    tail = bars.loc['2024-01-17':]
+
+    with pytest.raises(ValueError):
+        update_last_period(stored, tail, 'W')
+    #The stored open week is not replaced by a partial aggregate
+    assert stored.loc[(2024, 3), 'Volume'] == bars.loc['2024-01-15':'2024-01-17', 'Volume'].sum()
+
+
+def test_update_stacked_tickers():
+    a, b = make_bars(seed=1), make_bars(seed=2, periods=25)
+    stored = resample_bars(stacked({'A': a.iloc[:12], 'B': b.iloc[:22]}), 'W')
+    #Each ticker's tail starts at its own open period
+    daily = stacked({'A': a.loc['2024-01-15':], 'B': b.loc['2024-01-29':]})
+    updated = update_last_period(stored, daily, 'W')
+    pd.testing.assert_frame_equal(updated, resample_bars(stacked({'A': a, 'B': b}), 'W'))
+
+    with pytest.raises(ValueError):
+        update_last_period(stored, stacked({'A': a.loc['2024-01-16':], 'B': b}), 'W')
+
+
+def test_update_with_a_tail_from_the_first_weekday_of_the_month():
+    #June 2024 starts on a Saturday: a tail from Monday the 3rd is complete
+    bars = make_bars('2024-05-01', periods=40)
+    stored = resample_bars(bars.loc[:'2024-06-12'], 'M')
+    updated = update_last_period(stored, bars.loc['2024-06-03':], 'M')
+    pd.testing.assert_frame_equal(updated, resample_bars(bars, 'M'))
+
+    with pytest.raises(ValueError):
+        update_last_period(stored, bars.loc['2024-06-04':], 'M')
+
+
+@pytest.mark.parametrize('freq', ['M', 'Q'])
+def test_update_matches_a_full_resample_for_months_and_quarters(freq):
+    bars = make_bars('2023-10-02', periods=150)
+    for stop in (40, 95, 149):
+        updated = update_last_period(resample_bars(bars.iloc[:stop], freq), bars, freq)
+        pd.testing.assert_frame_equal(updated, resample_bars(bars, freq))
+
+
+def test_update_of_an_empty_resample_resamples_everything(bars):
+    empty = resample_bars(bars.iloc[:0], 'W')
+    pd.testing.assert_frame_equal(update_last_period(empty, bars, 'W'), resample_bars(bars, 'W'))
+
+
+def test_update_without_new_bars_keeps_the_stored_periods(bars):
+    stored = resample_bars(bars, 'W')
+    pd.testing.assert_frame_equal(update_last_period(stored, bars.iloc[:5], 'W'), stored)
+
+
+def test_update_with_a_tail_from_the_first_trading_day_after_a_holiday(bars):
+    #Monday 15 January is a holiday: the week's first bar is on Tuesday
+    bars = bars.drop(pd.Timestamp('2024-01-15'))
+    stored = resample_bars(bars.loc[:'2024-01-17'], 'W')
+    updated = update_last_period(stored, bars.loc['2024-01-16':], 'W')
+    pd.testing.assert_frame_equal(updated, resample_bars(bars, 'W'))
+
+    with pytest.raises(ValueError):
+        update_last_period(stored, bars.loc['2024-01-17':], 'W')
+
+
+def test_stacked_update_after_a_holiday():
+    a, b = make_bars(seed=1), make_bars(seed=2)
+    a = a.drop(pd.Timestamp('2024-01-15'))
+    stored = resample_bars(stacked({'A': a.loc[:'2024-01-17'], 'B': b.loc[:'2024-01-17']}), 'W')
+    daily = stacked({'A': a.loc['2024-01-16':], 'B': b.loc['2024-01-15':]})
+    updated = update_last_period(stored, daily, 'W')
+    pd.testing.assert_frame_equal(updated, resample_bars(stacked({'A': a, 'B': b}), 'W'))
@@ -0,0 +1,110 @@
+import pandas as pd
+import pytest
+
+import stock_store
+from conftest import make_bars
+
+
+@pytest.fixture
+def root(tmp_path):
+    return str(tmp_path / 'store')
+
+
+def test_write_and_read_back(root, bars):
+    stock_store.write_ticker(bars, 'nifty', 'SBIN', root)
+
+    pd.testing.assert_frame_equal(stock_store.read_ticker('nifty', 'SBIN', root=root), bars,
+                                  check_freq=False)
+    assert stock_store.list_tickers('nifty', root) == ['SBIN']
+    assert stock_store.date_range('nifty', 'SBIN', root) == (bars.index[0], bars.index[-1])
+
+
+def test_read_only_the_asked_columns_and_dates(root, bars):
+    stock_store.write_ticker(bars, 'nifty', 'SBIN', root)
+    df = stock_store.read_ticker('nifty', 'SBIN', columns=['Close'],
+                                 start='2024-01-08', end='2024-01-12', root=root)
+    assert list(df.columns) == ['Close']
+    assert list(df.index) == list(pd.bdate_range('2024-01-08', '2024-01-12'))
+
+
+def test_write_replaces_the_stored_history(root, bars):
+    stock_store.write_ticker(bars, 'nifty', 'SBIN', root)
+    stock_store.write_ticker(bars.iloc[5:10], 'nifty', 'SBIN', root)
+    assert len(stock_store.read_ticker('nifty', 'SBIN', root=root)) == 5
+
+
+def test_read_market_stacks_tickers(root):
+    stock_store.write_ticker(make_bars(seed=1), 'nifty', 'SBIN', root)
+    stock_store.write_ticker(make_bars(seed=2, periods=10), 'nifty', 'INFY', root)
+
+    df = stock_store.read_market('nifty', columns=['Close'], root=root)
+    assert df.index.names == ['Ticker', 'Date']
+    assert df.groupby(level='Ticker').size().to_dict() == {'INFY': 10, 'SBIN': 30}
+
+
+def test_import_csv_directory_converts_text_columns(root, tmp_path, bars):
+    directory = tmp_path / 'csv'
+    directory.mkdir()
+    bars.assign(Symbol='SBIN').to_csv(directory / 'SBIN.csv')
+
+    assert stock_store.import_csv_directory(str(directory), 'nifty', root) == 1
+    assert stock_store.import_csv_directory(str(directory), 'nifty', root) == 0
+    df = stock_store.read_ticker('nifty', 'SBIN', root=root)
+    assert df['Close'].dtype == float and df['Symbol'].iloc[0] == 'SBIN'
+
+
+
+def test_append_adds_only_newer_rows_as_a_new_part(root, bars):
+    stock_store.write_ticker(bars.iloc[:20], 'nifty', 'SBIN', root)
+    #Overlapping input: the first 5 rows are already stored
+    assert stock_store.append_ticker(bars.iloc[15:], 'nifty', 'SBIN', root) == 10
+    assert stock_store.append_ticker(bars.iloc[15:], 'nifty', 'SBIN', root) == 0
+
+    assert len(stock_store.list_parts('nifty', 'SBIN', root)) == 2
+    pd.testing.assert_frame_equal(stock_store.read_ticker('nifty', 'SBIN', root=root), bars,
+                                  check_freq=False)
+
+
+def test_append_casts_to_the_stored_types(root, bars):
+    stock_store.write_ticker(bars.iloc[:20], 'nifty', 'SBIN', root)
+    tail = bars.iloc[20:].astype({'Volume': 'int64'}).drop(columns=['Trades'])
+    stock_store.append_ticker(tail, 'nifty', 'SBIN', root)
+
+    df = stock_store.read_ticker('nifty', 'SBIN', root=root)
+    assert df['Volume'].dtype == bars['Volume'].dtype
+    assert df['Trades'].iloc[20:].isna().all()
+
+
+def test_compact_merges_the_parts(root, bars):
+    stock_store.write_ticker(bars.iloc[:10], 'nifty', 'SBIN', root)
+    stock_store.append_ticker(bars.iloc[10:20], 'nifty', 'SBIN', root)
+    stock_store.append_ticker(bars.iloc[20:], 'nifty', 'SBIN', root)
+
+    stock_store.compact_ticker('nifty', 'SBIN', root)
+    parts = stock_store.list_parts('nifty', 'SBIN', root)
+    assert [(first, last) for first, last, _ in parts] == [(bars.index[0], bars.index[-1])]
+
+
+def test_append_keeps_columns_the_stored_parts_lack(root, bars):
+    #Imported from an old CSV without VWAP and Trades
+    stock_store.write_ticker(bars.iloc[:20].drop(columns=['VWAP', 'Trades']), 'nifty', 'SBIN', root)
+    stock_store.append_ticker(bars.iloc[20:], 'nifty', 'SBIN', root)
+
+    df = stock_store.read_ticker('nifty', 'SBIN', root=root)
+    assert {'VWAP', 'Trades'} <= set(df.columns)
+    assert df['VWAP'].iloc[:20].isna().all()
+    assert (df['VWAP'].iloc[20:] == bars['VWAP'].iloc[20:]).all()
+
+    vwap = stock_store.read_ticker('nifty', 'SBIN', columns=['Close', 'VWAP'], root=root)
+    assert list(vwap.columns) == ['Close', 'VWAP'] and len(vwap) == 30
+
+
+def test_append_compacts_once_there_are_too_many_parts(root, bars):
+    stock_store.write_ticker(bars.iloc[:10], 'nifty', 'SBIN', root)
+    for i in range(10, 14):
+        stock_store.append_ticker(bars.iloc[i:i + 1], 'nifty', 'SBIN', root, compact_parts=4)
+        assert len(stock_store.list_parts('nifty', 'SBIN', root)) <= 4
+
+    assert len(stock_store.list_parts('nifty', 'SBIN', root)) == 1
+    pd.testing.assert_frame_equal(stock_store.read_ticker('nifty', 'SBIN', root=root), bars.iloc[:14],
+                                  check_freq=False)
@@ -0,0 +1,49 @@
+import json
+
+from ticker_metadata import TickerMetadataStore
+
+
+def test_workers_keep_each_others_entries(tmp_path):
+    path = str(tmp_path / 'metadata.json')
+    first = TickerMetadataStore(path, max_workers=1)
+    second = TickerMetadataStore(path, max_workers=1)
+
+    first.put('SBIN.NS', {'long_name': 'State Bank of India'})
+    second.put('INFY.NS', {'long_name': 'Infosys'})
+
+    with open(path) as f:
+        assert set(json.load(f)) == {'SBIN.NS', 'INFY.NS'}
+    assert second.long_name('SBIN.NS') == 'State Bank of India'
+
+
+def test_newer_record_wins_the_merge(tmp_path):
+    path = str(tmp_path / 'metadata.json')
+    first = TickerMetadataStore(path, max_workers=1)
+    second = TickerMetadataStore(path, max_workers=1)
+
+    first.put('SBIN.NS', {'long_name': 'old'})
+    second.put('SBIN.NS', {'long_name': 'new'})
+    first.put('INFY.NS', {'long_name': 'Infosys'})
+
+    with open(path) as f:
+        assert json.load(f)['SBIN.NS']['long_name'] == 'new'
+
+
+def test_failed_lookup_is_not_retried_within_the_ttl(tmp_path):
+    calls = []
+
+    def fetch(ticker):
+        calls.append(ticker)
+        raise ValueError('no such ticker')
+
+    store = TickerMetadataStore(str(tmp_path / 'metadata.json'), fetch=fetch, max_workers=1)
+    assert store.long_name('BAD') == 'BAD'
+    store._pool.shutdown(wait=True)
+    assert store.get('BAD') is None
+    assert calls == ['BAD']
+
+    store.failure_ttl = 0
+    store._pool = type(store._pool)(max_workers=1)
+    store.get('BAD')
+    store._pool.shutdown(wait=True)
+    assert calls == ['BAD', 'BAD']
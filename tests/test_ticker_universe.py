@@ -0,0 +1,112 @@
+import os
+import pickle
+
+import pytest
+import requests
+
+from ticker_universe import TickerUniverse, UNIVERSES
+
+
+class Response:
+
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError('{} error'.format(self.status_code))
+
+
+class Page:
+    """Stub for requests.get: one page with an ETag, answering 304 when it matches."""
+
+    def __init__(self, text, etag='"v1"', last_modified='Mon, 01 Jan 2024 00:00:00 GMT'):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.status_code = None
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.status_code is not None:
+            return Response(self.status_code)
+        if headers.get('If-None-Match') == self.etag:
+            return Response(304)
+        return Response(200, self.text, {'ETag': self.etag, 'Last-Modified': self.last_modified})
+
+
+@pytest.fixture
+def page(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    #One ticker per line instead of the Wikipedia table, so bs4 is not needed
+    monkeypatch.setitem(UNIVERSES['sp500'], 'parse', lambda html: html.split())
+    page = Page('AAA BBB')
+    monkeypatch.setattr(requests, 'get', page.get)
+    return page
+
+
+def test_unchanged_page_is_not_parsed_again(page, tmp_path):
+    universe = TickerUniverse(str(tmp_path / 'universe.json'))
+    assert universe.get('sp500') == ['AAA', 'BBB']
+    assert page.requests == [{}]
+    checked = universe.entries['sp500']['checked_at']
+
+    page.text = 'CCC'
+    assert universe.refresh('sp500') is False
+    assert page.requests[-1] == {'If-None-Match': '"v1"',
+                                 'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert universe.get('sp500') == ['AAA', 'BBB']
+    assert universe.entries['sp500']['checked_at'] >= checked
+
+    #The headers are kept on disk for the next process
+    assert TickerUniverse(str(tmp_path / 'universe.json')).entries['sp500']['etag'] == '"v1"'
+
+
+def test_changed_or_forced_page_is_parsed(page, tmp_path):
+    universe = TickerUniverse(str(tmp_path / 'universe.json'))
+    universe.get('sp500')
+
+    page.text, page.etag = 'AAA CCC', '"v2"'
+    assert universe.refresh('sp500') is True
+    assert universe.get('sp500') == ['AAA', 'CCC']
+
+    page.text = 'DDD'
+    assert universe.refresh('sp500', force=True) is True
+    assert page.requests[-1] == {}
+    assert universe.get('sp500') == ['DDD']
+
+
+def test_fresh_list_is_served_without_a_request(page, tmp_path):
+    universe = TickerUniverse(str(tmp_path / 'universe.json'))
+    universe.get('sp500')
+    assert universe.get('sp500') == ['AAA', 'BBB']
+    assert len(page.requests) == 1
+
+
+def test_failed_refresh_keeps_the_stored_list(page, tmp_path):
+    universe = TickerUniverse(str(tmp_path / 'universe.json'))
+    universe.get('sp500')
+
+    page.status_code = 503
+    assert universe.get('sp500', refresh=True) == ['AAA', 'BBB']
+
+    with pytest.raises(requests.HTTPError):
+        TickerUniverse(str(tmp_path / 'other.json')).get('sp500')
+
+
+def test_old_pickle_is_imported_once(page, tmp_path):
+    with open(UNIVERSES['sp500']['pickle'], 'wb') as f:
+        pickle.dump(['OLD1', 'OLD2'], f)
+
+    universe = TickerUniverse(str(tmp_path / 'universe.json'), max_age=10 ** 9)
+    assert universe.get('sp500') == ['OLD1', 'OLD2']
+    assert page.requests == []
+    assert universe.entries['sp500']['fetched_at'] == os.path.getmtime(UNIVERSES['sp500']['pickle'])
+
+    #A stale imported list has no ETag, so the first refresh is unconditional
+    universe.max_age = 0
+    assert universe.get('sp500') == ['AAA', 'BBB']
+    assert page.requests == [{}]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import make_bars
+from volume_profile import close_profile, VolumeProfile
+
+
+def test_close_profile_of_one_ticker(bars):
+    bars = bars.assign(Close=bars['Close'].round(-1))
+    profile = close_profile(bars)
+
+    assert len(profile) == len(bars)
+    first = profile.iloc[0]
+    same_close = bars[bars['Close'] == first['Close']]
+    assert first['sum_vol'] == same_close['Volume'].sum()
+    assert first['delvolchange'] == same_close['Deliverable Volume'].sum()
+    assert (profile['last_count'] == len(bars)).all()
+
+
+def test_close_profile_groups_stacked_tickers_separately():
+    a, b = make_bars(seed=1), make_bars(seed=2, periods=20)
+    a['Close'], b['Close'] = 100.0, 100.0
+    stacked = pd.concat({'A': a, 'B': b}, names=['Ticker'])
+
+    profile = close_profile(stacked)
+    assert list(profile.columns[:2]) == ['Ticker', 'Close']
+    for ticker, bars in (('A', a), ('B', b)):
+        rows = profile[profile['Ticker'] == ticker]
+        assert (rows['sum_vol'] == bars['Volume'].sum()).all()
+        assert (rows['last_count'] == len(bars)).all()
+        assert np.isnan(rows['pct_change'].iloc[0])
+
+
+def test_close_is_required_without_spread():
+    profile = VolumeProfile(tick_size=0.5, spread=False)
+    with pytest.raises(ValueError, match='close is required'):
+        profile.add([10.0], [11.0], [100.0])
+
+    profile.add([10.0], [11.0], [100.0], close=[10.7])
+    assert profile.totals.sum() == 100.0
+
+
+def test_mismatched_lengths_are_rejected():
+    with pytest.raises(ValueError, match='same length'):
+        VolumeProfile(tick_size=0.5).add([10.0, 10.5], [11.0], [100.0, 50.0])
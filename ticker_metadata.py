@@ -0,0 +1,220 @@
+"""
+Persistent ticker metadata: long name, exchange, currency and sector.
+
+Chart rendering only needs the long name, but getting it from yfinance
+(Ticker.info) is a slow request of its own. The store keeps the metadata
+in a small JSON file shared by all app workers and refreshes an entry
+only when it is older than the TTL (30 days by default). Lookups never
+block: a missing or stale entry is filled in the background and the
+caller falls back to the ticker itself. A failed lookup is not retried
+for FAILURE_TTL (10 minutes), so a bad symbol does not send a request on
+every get.
+
+Every save re-reads the file under a lock and merges it (the newer
+record of a ticker wins), so workers do not drop each other's entries.
+
+The NSE index constituent CSVs (nse_index_lists.py) already carry the
+company name and industry, so the store can be preloaded from them.
+"""
+
+
+#Importing Modules
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import pandas as pd
+
+from nse_index_lists import ticker_list as nse_index_urls
+from stock_downloader import download_tickers
+
+
+METADATA_PATH = 'ticker_metadata.json'
+METADATA_TTL = 30 * 24 * 60 * 60
+FAILURE_TTL = 10 * 60
+
+FIELDS = {
+        'longName' : 'long_name',
+        'exchange' : 'exchange',
+        'currency' : 'currency',
+        'sector' : 'sector',
+}
+
+
+#===================================================================
+#   Fetching from yfinance
+#===================================================================
+
+def fetch_metadata(ticker):
+    import yfinance as yf
+
+    info = yf.Ticker(ticker).info or {}
+    record = {name: info.get(field) for field, name in FIELDS.items()}
+    record['long_name'] = record['long_name'] or info.get('shortName') or ticker
+    return record
+
+
+#===================================================================
+#   The store
+#===================================================================
+
+def merge_records(records, other):
+    """Add other's records to records where they are newer."""
+    for ticker, record in other.items():
+        current = records.get(ticker)
+        if current is None or record.get('updated', 0) > current.get('updated', 0):
+            records[ticker] = record
+    return records
+
+
+class TickerMetadataStore:
+
+    def __init__(self, path=METADATA_PATH, ttl=METADATA_TTL, fetch=fetch_metadata, max_workers=4,
+                 failure_ttl=FAILURE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.fetch = fetch
+        self.records = {}
+        self.failures = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._pending = set()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._reload()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                return json.load(f), os.fstat(f.fileno()).st_mtime
+        except (OSError, ValueError):
+            return {}, None
+
+    def _reload(self):
+        #Pick up entries written by other workers
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+        records, mtime = self._read()
+        with self._lock:
+            merge_records(self.records, records)
+            self._mtime = mtime
+
+    @contextmanager
+    def _file_lock(self):
+        #Threads of this process, then the other workers
+        with self._save_lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.path + '.lock', 'a') as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _save(self):
+        with self._file_lock():
+            on_disk, _ = self._read()
+            with self._lock:
+                records = merge_records(on_disk, self.records)
+                self.records = dict(records)
+            tmp_path = '{}.{}.tmp'.format(self.path, os.getpid())
+            with open(tmp_path, 'w') as f:
+                json.dump(records, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.path.getmtime(self.path)
+
+    def _fresh(self, record):
+        return record is not None and time.time() - record.get('updated', 0) < self.ttl
+
+    def put(self, ticker, record, save=True):
+        record = dict(record, updated=time.time())
+        with self._lock:
+            self.records[ticker.upper()] = record
+            self.failures.pop(ticker.upper(), None)
+        if save:
+            self._save()
+
+    def _failed_recently(self, ticker):
+        failed_at = self.failures.get(ticker)
+        return failed_at is not None and time.time() - failed_at < self.failure_ttl
+
+    def get(self, ticker):
+        """Cached record (possibly stale) or None; refreshes in the background."""
+        self._reload()
+        ticker = ticker.upper()
+        with self._lock:
+            record = self.records.get(ticker)
+            schedule = (not self._fresh(record) and ticker not in self._pending
+                        and not self._failed_recently(ticker))
+            if schedule:
+                self._pending.add(ticker)
+        if schedule:
+            self._pool.submit(self._refresh_pending, ticker)
+        return record
+
+    def long_name(self, ticker):
+        record = self.get(ticker)
+        return (record.get('long_name') or ticker) if record else ticker
+
+    def _refresh_pending(self, ticker):
+        try:
+            self.refresh(ticker)
+        except Exception as e:
+            with self._lock:
+                self.failures[ticker] = time.time()
+            print ('{}: Metadata refresh failed ({}).'.format(ticker, e))
+        finally:
+            with self._lock:
+                self._pending.discard(ticker)
+
+    def refresh(self, ticker):
+        """Fetch and store one ticker now (blocking)."""
+        self.put(ticker, self.fetch(ticker))
+
+    def refresh_many(self, tickers, max_workers=8, stale_only=True):
+        """Bulk fill, e.g. for a watchlist; only stale entries by default."""
+        if stale_only:
+            tickers = [t for t in tickers if not self._fresh(self.records.get(t.upper()))]
+        summary = download_tickers(tickers, self.fetch, source='yahoo', max_workers=max_workers,
+                                   on_result=lambda t, record: self.put(t, record, save=False))
+        with self._lock:
+            for ticker in summary.failed:
+                self.failures[ticker.upper()] = time.time()
+        self._save()
+        return summary
+
+    def preload_nse_constituents(self, urls=nse_index_urls):
+        """Fill the store from the NSE index constituent CSVs."""
+        loaded = 0
+        for key, url in urls.items():
+            try:
+                df = pd.read_csv(url)
+            except Exception as e:
+                print ('{}: Could not read constituents ({}).'.format(key, e))
+                continue
+
+            for symbol, name, industry in zip(df['Symbol'], df['Company Name'], df['Industry']):
+                ticker = '{}.NS'.format(symbol).upper()
+                if self._fresh(self.records.get(ticker)):
+                    continue
+                self.put(ticker, {'long_name': name, 'exchange': 'NSI', 'currency': 'INR',
+                                  'sector': industry}, save=False)
+                loaded += 1
+
+        self._save()
+        return loaded
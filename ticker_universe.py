@@ -0,0 +1,211 @@
+"""
+Ticker universes (S&P 500, Nifty 50) kept in a local registry.
+
+The constituent lists used to be scraped from Wikipedia every time
+stock_get_data.py or normalization_nifty_data.py was run. The registry
+keeps every list in one small JSON file with the time it was fetched and
+the ETag / Last-Modified headers of the page. A list is fetched again only
+when it is older than max_age (7 days by default) or a refresh is asked
+for, and the request is conditional: an unchanged page answers 304 and
+is not parsed at all.
+
+    tickers = get_tickers('sp500')                  #local file, no request
+    tickers = get_tickers('nifty50', refresh=True)  #conditional request
+
+    python ticker_universe.py --refresh             #refresh every list
+
+If a refresh fails, the stored list is kept (a warning is printed). The
+old sp500tickers.pickle / niftytickers.pickle files are imported the
+first time a list is missing from the registry.
+"""
+
+
+#Importing Modules
+#requests and bs4 are only imported when a page is actually fetched
+import argparse
+import json
+import os
+import pickle
+import threading
+import time
+
+
+UNIVERSE_PATH = 'ticker_universe.json'
+UNIVERSE_MAX_AGE = 7 * 24 * 60 * 60
+
+
+#===================================================================
+#   Parsing the Wikipedia tables
+#===================================================================
+
+def constituents_table(html):
+    import bs4 as bs
+
+    soup = bs.BeautifulSoup(html, 'lxml')
+    return soup.find('table', {'class': 'wikitable sortable'})
+
+
+def parse_sp500(html):
+    tickers = []
+    for row in constituents_table(html).findAll('tr')[1:]:
+        ticker = row.findAll('td')[0].text.replace('.', '-')
+        tickers.append(ticker[:-1])
+    return tickers
+
+
+def parse_nifty(html):
+    tickers = []
+    for row in constituents_table(html).findAll('tr')[1:]:
+        ticker = row.findAll('td')[1].text.replace('.', '-')
+        tickers.append(ticker[:-3] + ".NS")
+    return tickers
+
+
+UNIVERSES = {
+        'sp500' : {'url': 'http://en.wikipedia.org/wiki/List_of_S%26P_500_companies',
+                   'parse': parse_sp500,
+                   'pickle': 'sp500tickers.pickle'},
+        'nifty50' : {'url': 'http://en.wikipedia.org/wiki/NIFTY_50',
+                     'parse': parse_nifty,
+                     'pickle': 'niftytickers.pickle'},
+}
+
+
+#===================================================================
+#   Conditional fetch
+#===================================================================
+
+def fetch_page(url, etag=None, last_modified=None, timeout=30):
+    """(status, text, etag, last_modified); status 304 means unchanged."""
+    import requests
+
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+
+    resp = requests.get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304:
+        return 304, None, etag, last_modified
+    resp.raise_for_status()
+    return (resp.status_code, resp.text,
+            resp.headers.get('ETag'), resp.headers.get('Last-Modified'))
+
+
+#===================================================================
+#   The registry
+#===================================================================
+
+class TickerUniverse:
+
+    def __init__(self, path=UNIVERSE_PATH, max_age=UNIVERSE_MAX_AGE, fetch=fetch_page):
+        self.path = path
+        self.max_age = max_age
+        self.fetch = fetch
+        self.entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def _save(self):
+        tmp = '{}.{}.tmp'.format(self.path, os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(self.entries, f, separators=(',', ':'))
+        os.replace(tmp, self.path)
+
+    def _import_pickle(self, name):
+        #One-off import of the list saved by the old scraping functions
+        path = UNIVERSES[name]['pickle']
+        if name in self.entries or not os.path.exists(path):
+            return
+        with open(path, 'rb') as f:
+            tickers = pickle.load(f)
+        self.entries[name] = {'tickers': list(tickers), 'fetched_at': os.path.getmtime(path),
+                              'checked_at': os.path.getmtime(path),
+                              'etag': None, 'last_modified': None}
+
+    def age(self, name):
+        """Seconds since the list was last checked, or None if it is missing."""
+        entry = self.entries.get(name)
+        return None if entry is None else time.time() - entry['checked_at']
+
+    def is_stale(self, name):
+        age = self.age(name)
+        return age is None or age > self.max_age
+
+    def refresh(self, name, force=False):
+        """
+        Check the page of one universe; returns True if the list changed.
+
+        force=True skips the conditional headers and parses the page anyway.
+        """
+        universe = UNIVERSES[name]
+        with self._lock:
+            entry = self.entries.get(name, {})
+            etag = None if force else entry.get('etag')
+            last_modified = None if force else entry.get('last_modified')
+
+            status, html, etag, last_modified = self.fetch(universe['url'], etag, last_modified)
+            now = time.time()
+            if status == 304 and 'tickers' in entry:
+                entry['checked_at'] = now
+                changed = False
+            else:
+                tickers = universe['parse'](html)
+                changed = tickers != entry.get('tickers')
+                entry = {'tickers': tickers, 'fetched_at': now, 'checked_at': now,
+                         'etag': etag, 'last_modified': last_modified}
+            self.entries[name] = entry
+            self._save()
+        return changed
+
+    def get(self, name, refresh=False):
+        """The tickers of one universe, refreshed first if stale or asked to."""
+        if name not in UNIVERSES:
+            raise KeyError('Unknown universe {} (one of {})'.format(name, ', '.join(UNIVERSES)))
+
+        with self._lock:
+            self._import_pickle(name)
+
+        if refresh or self.is_stale(name):
+            try:
+                self.refresh(name)
+            except Exception as e:
+                if name not in self.entries:
+                    raise
+                print ('{}: refresh failed ({}), using the list from {}.'.format(
+                    name, e, time.strftime('%Y-%m-%d', time.localtime(self.entries[name]['fetched_at']))))
+        return list(self.entries[name]['tickers'])
+
+
+_default = None
+
+
+def get_universe():
+    global _default
+    if _default is None:
+        _default = TickerUniverse()
+    return _default
+
+
+def get_tickers(name, refresh=False):
+    return get_universe().get(name, refresh)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Show or refresh the stored ticker universes.')
+    parser.add_argument('names', nargs='*', default=list(UNIVERSES))
+    parser.add_argument('--refresh', action='store_true', help='conditional refresh of every list')
+    parser.add_argument('--force', action='store_true', help='fetch and parse even if unchanged')
+    args = parser.parse_args()
+
+    universe = get_universe()
+    for name in args.names:
+        if args.refresh or args.force:
+            changed = universe.refresh(name, force=args.force)
+            print ('{}: {}'.format(name, 'updated' if changed else 'unchanged'))
+        tickers = universe.get(name)
+        print ('{}: {} tickers, checked {:.1f} hours ago'.format(
+            name, len(tickers), universe.age(name) / 3600))
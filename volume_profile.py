@@ -0,0 +1,208 @@
+"""
+Volume profiles (volume traded at each price) for the app and the scripts.
+
+A profile is a weighted histogram over price bins, computed with
+np.searchsorted / np.bincount instead of pd.cut and a categorical groupby:
+
+    edges = price_edges(df['low'], df['high'], bins=50)         #or tick_size=0.05
+    totals = volume_profile(df['close'], df['volume'], edges)   #volume at the close
+    totals = spread_profile(df['low'], df['high'], df['volume'], edges)
+
+Bins are right-closed like pd.cut(..., include_lowest=True), so the
+close-based profile matches the old one bin for bin. spread_profile
+spreads each bar's volume evenly over its High-Low range instead.
+
+VolumeProfile keeps the totals on a tick-size grid and takes new bars as
+they arrive, growing the grid when the price leaves it.
+
+close_profile() is the per-Close table used by stock_dashboards.py.
+"""
+
+
+#Importing Modules
+import numpy as np
+import pandas as pd
+
+
+#Rows x bins handled at once by spread_profile, to bound the memory
+SPREAD_CHUNK = 1_000_000
+
+
+#===================================================================
+#   Bins
+#===================================================================
+
+def price_edges(low, high, bins=50, tick_size=None, pad=0.02):
+    """
+    Bin edges covering [min(low), max(high)].
+
+    With tick_size the edges sit on multiples of the tick (the pad is not
+    used); otherwise there are bins - 1 equal bins over the range padded
+    by pad on both sides, as np.linspace(low * 0.98, high * 1.02, bins).
+    """
+    low, high = np.nanmin(np.asarray(low, dtype=float)), np.nanmax(np.asarray(high, dtype=float))
+    if tick_size:
+        first, last = np.floor(low / tick_size), np.ceil(high / tick_size)
+        return np.arange(first, max(last, first + 1) + 1) * tick_size
+    return np.linspace(low * (1 - pad), high * (1 + pad), bins)
+
+
+def bin_index(prices, edges):
+    """Bin of every price for right-closed bins; -1 when outside the edges."""
+    prices = np.asarray(prices, dtype=float)
+    idx = np.searchsorted(edges, prices, side='left') - 1
+    idx[prices == edges[0]] = 0
+    idx[(prices < edges[0]) | (prices > edges[-1]) | np.isnan(prices)] = -1
+    return idx
+
+
+def mid_points(edges):
+    return (edges[:-1] + edges[1:]) / 2
+
+
+def bin_labels(edges):
+    return ['{:.2f} - {:.2f}'.format(left, right) for left, right in zip(edges[:-1], edges[1:])]
+
+
+#===================================================================
+#   Profiles
+#===================================================================
+
+def volume_profile(prices, volume, edges):
+    """Total volume per bin, each bar counted at one price (e.g. its close)."""
+    idx = bin_index(prices, edges)
+    inside = idx >= 0
+    return np.bincount(idx[inside], weights=np.asarray(volume, dtype=float)[inside],
+                       minlength=len(edges) - 1)
+
+
+def spread_profile(low, high, volume, edges):
+    """
+    Total volume per bin, each bar's volume spread evenly over High-Low.
+
+    A bar gets the share of its range that overlaps each bin; bars with
+    no range (High == Low) put all their volume in the bin of that price.
+    """
+    low = np.asarray(low, dtype=float)
+    high = np.asarray(high, dtype=float)
+    volume = np.asarray(volume, dtype=float)
+    totals = np.zeros(len(edges) - 1)
+
+    flat = high <= low
+    if flat.any():
+        totals += volume_profile(low[flat], volume[flat], edges)
+
+    low, high, volume = low[~flat], high[~flat], volume[~flat]
+    left, right = edges[:-1], edges[1:]
+    step = max(1, SPREAD_CHUNK // len(left))
+    for start in range(0, len(low), step):
+        lo, hi = low[start:start + step, None], high[start:start + step, None]
+        overlap = np.clip(np.minimum(hi, right) - np.maximum(lo, left), 0, None)
+        totals += (overlap / (hi - lo) * volume[start:start + step, None]).sum(axis=0)
+    return totals
+
+
+def profile_series(totals, edges):
+    """Totals as a Series indexed by the price intervals."""
+    return pd.Series(totals, index=pd.IntervalIndex.from_breaks(edges, closed='right'))
+
+
+#===================================================================
+#   Incremental profile on a tick grid
+#===================================================================
+
+class VolumeProfile:
+    """
+    Running volume profile on a fixed tick-size grid.
+
+        profile = VolumeProfile(tick_size=0.05)
+        profile.add(df['low'], df['high'], df['volume'], close=df['close'])
+        ...
+        profile.add(new_bars['low'], new_bars['high'], new_bars['volume'])
+
+    With spread=True the volume is spread over High-Low, otherwise it is
+    put at close, which add() then requires. The grid grows when a bar
+    trades outside it.
+    """
+
+    def __init__(self, tick_size, spread=True):
+        self.tick_size = tick_size
+        self.spread = spread
+        self.edges = None
+        self.totals = None
+
+    def _cover(self, low, high):
+        edges = price_edges(low, high, tick_size=self.tick_size)
+        if self.edges is None:
+            self.edges, self.totals = edges, np.zeros(len(edges) - 1)
+            return
+
+        ticks_below = int(round((self.edges[0] - edges[0]) / self.tick_size))
+        ticks_above = int(round((edges[-1] - self.edges[-1]) / self.tick_size))
+        if ticks_below > 0 or ticks_above > 0:
+            ticks_below, ticks_above = max(ticks_below, 0), max(ticks_above, 0)
+            first = int(round(self.edges[0] / self.tick_size)) - ticks_below
+            self.edges = np.arange(first, first + len(self.edges) + ticks_below + ticks_above) * self.tick_size
+            self.totals = np.pad(self.totals, (ticks_below, ticks_above))
+
+    def add(self, low, high, volume, close=None):
+        if not self.spread and close is None:
+            raise ValueError('close is required when spread=False (the volume is put at the close)')
+        low = np.asarray(low, dtype=float)
+        high = np.asarray(high, dtype=float)
+        lengths = {len(low), len(high), len(volume)} | ({len(close)} if close is not None else set())
+        if len(lengths) > 1:
+            raise ValueError('low, high, volume and close must have the same length, got {}'.format(
+                sorted(lengths)))
+        if len(low) == 0:
+            return self
+        self._cover(low, high)
+        if self.spread:
+            self.totals += spread_profile(low, high, volume, self.edges)
+        else:
+            self.totals += volume_profile(close, volume, self.edges)
+        return self
+
+    def series(self):
+        return profile_series(self.totals, self.edges)
+
+
+#===================================================================
+#   Per-Close table for the matplotlib dashboards
+#===================================================================
+
+def group_totals(keys, values):
+    """For every row, the sum of values over all rows with the same key."""
+    _, inverse = np.unique(np.asarray(keys), return_inverse=True)
+    inverse = inverse.ravel()
+    return np.bincount(inverse, weights=np.asarray(values, dtype=float))[inverse]
+
+
+def close_profile(df):
+    """
+    Delivered and total volume per closing price, one row per bar.
+
+    Columns: Close, Volume, Deliverable Volume, High, Low, delvolchange
+    (delivered volume of all bars closing at that price), sum_vol (their
+    volume), last_count (number of bars) and pct_change of Close.
+
+    A stacked (Ticker, Date) frame is profiled per ticker, with a Ticker
+    column in front.
+    """
+    profile = df[['Close', 'Volume', 'Deliverable Volume', 'High', 'Low']].reset_index(drop=True)
+    close = profile['Close'].to_numpy()
+    if 'Ticker' not in df.index.names:
+        return profile.assign(delvolchange=group_totals(close, profile['Deliverable Volume']),
+                              sum_vol=group_totals(close, profile['Volume']),
+                              last_count=profile['Close'].count(),
+                              pct_change=profile['Close'].pct_change())
+
+    tickers = df.index.get_level_values('Ticker').to_numpy()
+    keys, _ = pd.factorize(pd.MultiIndex.from_arrays([tickers, close]), use_na_sentinel=False)
+    by_ticker = profile['Close'].groupby(tickers, sort=False)
+    profile = profile.assign(delvolchange=group_totals(keys, profile['Deliverable Volume']),
+                             sum_vol=group_totals(keys, profile['Volume']),
+                             last_count=by_ticker.transform('count'),
+                             pct_change=by_ticker.pct_change())
+    profile.insert(0, 'Ticker', tickers)
+    return profile